@@ -2,146 +2,155 @@
 # -*- coding: utf-8 -*-
 
 import json
+import queue
+import sys
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
-from deep_translator import GoogleTranslator
+from banco_binario import BancoBinario
+from banco_preguicoso import BancoQuestoesPreguicoso, FixtureNaoAgrupado
+from banco_sqlite import BancoSQLite
+from cache_traducao import CacheTraducao
+from leitor_fixture import LeitorFixture, questao_para_estudo
+from nucleo_estudo import SessaoEstudo
+from pretraduzir_fixture import caminho_traduzido, carregar_traducoes_fixture
 
 class StudyApp:
-    def __init__(self, root):
+    def __init__(self, root, cache_size=128, prefetch_window=3, on_first_question=None, translator=None):
+        self.startup_began = time.perf_counter()
+        self.startup_times = {}
+        self.on_first_question = on_first_question
+        
         self.root = root
         self.root.title("Study Questions - HCIA Computing")
         self.root.geometry("1000x700")
         self.root.configure(bg='#f0f0f0')
         
-        # Variáveis
-        self.questions = []
-        self.current_question_index = 0
-        self.current_language = "english"  # ou "portuguese"
+        # Estado da sessão (questões, posição, idioma e tradução), independente do Tk
+        self.session = SessaoEstudo(tradutor=translator, cache_traducao=CacheTraducao())
+        self.cache_size = cache_size  # questões completas mantidas no cache LRU
+        self.prefetch_window = prefetch_window  # questões pré-carregadas antes/depois da atual
         self.selected_alternative = tk.StringVar()  # CORREÇÃO: Adicionar esta linha
-        self.translator = GoogleTranslator(source='auto', target='en')
-        
-        # Carregar questões
-        self.load_questions()
+        self.loading_queue = queue.Queue()
+        self.loading_failed = False
+        self.first_question_shown = False
         
-        # Criar interface
+        # Criar interface antes de carregar as questões, para a janela aparecer de imediato
         self.create_widgets()
-        self.show_question()
+        self.mark_startup("janela")
+        
+        # Carregar questões em segundo plano
+        threading.Thread(target=self.load_questions, daemon=True).start()
+        self.root.after(50, self.process_loading_events)
+    
+    def mark_startup(self, stage):
+        """Registra o tempo (em ms) decorrido desde o início da inicialização"""
+        self.startup_times[stage] = round((time.perf_counter() - self.startup_began) * 1000, 1)
     
     def load_questions(self):
-        """Carrega as questões do arquivo JSON"""
+        """Carrega as questões do banco SQLite, do banco binário ou, na ausência deles, do arquivo JSON
+        
+        Roda em uma thread de trabalho: o resultado e o progresso são enviados à
+        interface pela loading_queue e tratados em process_loading_events.
+        """
         try:
             json_path = "/home/yago/ICT-QUESTIONS/questoes_unificadas/questions_fixture_unificado.json"
+            sqlite_path = os.path.join(os.path.dirname(json_path), "questions_bank.sqlite3")
+            bank_path = os.path.join(os.path.dirname(json_path), "questions_bank.bin")
             
-            if not os.path.exists(json_path):
-                messagebox.showerror("Erro", f"Arquivo não encontrado: {json_path}")
-                return
-            
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if os.path.exists(sqlite_path):
+                # Banco SQLite: consultas indexadas por posição, id, level e track
+                self.loading_queue.put(('source', BancoSQLite(sqlite_path)))
+            elif os.path.exists(bank_path):
+                # Banco binário mapeado em memória: cada questão é decodificada ao ser exibida
+                self.loading_queue.put(('source', BancoBinario(bank_path)))
+            else:
+                if not os.path.exists(json_path):
+                    self.loading_queue.put(('error', f"Arquivo não encontrado: {json_path}"))
+                    return
+                
+                # Índice leve do fixture; questões completas montadas sob demanda.
+                # A fonte é publicada antes da indexação para que a primeira questão
+                # apareça assim que for lida.
+                bank = BancoQuestoesPreguicoso(
+                    json_path, tamanho_cache=self.cache_size, janela_prefetch=self.prefetch_window,
+                    indexar=False
+                )
+                self.loading_queue.put(('source', bank))
+                try:
+                    bank.indexar(
+                        ao_progredir=lambda done, total: self.loading_queue.put(('progress', done / total))
+                    )
+                except FixtureNaoAgrupado:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    
+                    # Extrair questões do formato Django fixture
+                    self.loading_queue.put(('source', self.extract_questions_from_fixture(data)))
             
-            # Extrair questões do formato Django fixture
-            self.questions = self.extract_questions_from_fixture(data)
+            # Fixture pré-traduzido: a troca de idioma não precisa acessar a rede
+            # (questões alteradas depois da pré-tradução ficam de fora e são traduzidas na hora)
+            translated_path = caminho_traduzido(json_path, 'pt')
+            if os.path.exists(translated_path):
+                self.loading_queue.put(('translations', carregar_traducoes_fixture(translated_path, json_path)))
             
-            if not self.questions:
-                messagebox.showerror("Erro", "Nenhuma questão encontrada no arquivo")
-                return
-                
-            messagebox.showinfo("Sucesso", f"Carregadas {len(self.questions)} questões")
+            self.loading_queue.put(('done', None))
             
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar questões: {str(e)}")
+            self.loading_queue.put(('error', f"Erro ao carregar questões: {str(e)}"))
     
-    def extract_questions_from_fixture(self, fixture_data):
-        """Extrai questões do formato Django fixture"""
-        questions_dict = {}
-        
-        # Primeiro, coletar todas as questões
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Question':
-                question_id = item['pk']
-                questions_dict[question_id] = {
-                    'id': question_id,
-                    'enunciado': item['fields']['text'],
-                    'alternativas': {},
-                    'item_correto': None,
-                    'explicacao': '',
-                    'fonte': '',
-                    'has_answer': item['fields']['has_answer'],
-                    'level': item['fields']['level'],
-                    'track': item['fields']['track']
-                }
-        
-        # Coletar alternativas
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative':
-                question_id = item['fields']['question']
-                alternativa_id = item['pk']
-                letra = self.get_alternative_letter(alternativa_id, fixture_data)
-                
-                if question_id in questions_dict:
-                    questions_dict[question_id]['alternativas'][letra] = {
-                        'texto': item['fields']['text'],
-                        'is_correct': item['fields']['is_correct']
-                    }
-                    
-                    # Marcar como correta
-                    if item['fields']['is_correct']:
-                        questions_dict[question_id]['item_correto'] = letra
-        
-        # Coletar fontes e explicações
-        for item in fixture_data:
-            if item['model'] == 'yourapp.CorrectAnswersSources':
-                alternativa_id = item['fields']['alternative']
-                fonte = item['fields']['source']
-                
-                # Encontrar a questão correspondente
-                for questao in questions_dict.values():
-                    if self.is_alternative_in_question(alternativa_id, questao['id'], fixture_data):
-                        questao['fonte'] = fonte
-                        # Se a fonte indica resposta do Copilot, usar como explicação
-                        if "Copilot" in fonte:
-                            questao['explicacao'] = fonte
-                        break
-        
-        return list(questions_dict.values())
+    def process_loading_events(self):
+        """Trata, na thread da interface, os eventos enviados pela thread de carregamento"""
+        try:
+            while True:
+                kind, value = self.loading_queue.get_nowait()
+                if kind == 'source':
+                    self.session.questoes = value
+                    self.create_filter_widgets()
+                elif kind == 'translations':
+                    self.session.traducoes_previas = value
+                elif kind == 'progress':
+                    self.progress_bar['value'] = value * 100
+                elif kind == 'error':
+                    self.session.carregamento_concluido = True
+                    self.loading_failed = True
+                    self.status_label.config(text="Falha ao carregar questões")
+                    messagebox.showerror("Erro", value)
+                elif kind == 'done':
+                    self.session.carregamento_concluido = True
+        except queue.Empty:
+            pass
+        
+        if not self.first_question_shown and len(self.session.questoes) > 0:
+            self.first_question_shown = True
+            self.show_question()
+            self.mark_startup("primeira_questao")
+            if self.on_first_question:
+                self.on_first_question(self)
+        
+        if self.session.carregamento_concluido:
+            self.finish_loading()
+        else:
+            if self.first_question_shown:
+                self.update_question_info()
+            self.root.after(50, self.process_loading_events)
     
-    def get_alternative_letter(self, alternativa_id, fixture_data):
-        """Obtém a letra da alternativa baseado na ordem"""
-        # Encontrar questão
-        questao_id = None
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative' and item['pk'] == alternativa_id:
-                questao_id = item['fields']['question']
-                break
-        
-        if not questao_id:
-            return 'A'
-        
-        # Coletar todas as alternativas da questão
-        alternativas = []
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative' and item['fields']['question'] == questao_id:
-                alternativas.append((item['pk'], item['fields']['text']))
-        
-        alternativas.sort(key=lambda x: x[0])
-        
-        # Mapear para letras
-        letras = ['A', 'B', 'C', 'D', 'E']
-        for i, (alt_id, texto) in enumerate(alternativas):
-            if alt_id == alternativa_id:
-                return letras[i] if i < len(letras) else 'A'
-        
-        return 'A'
+    def finish_loading(self):
+        """Conclui o carregamento: esconde a barra de progresso e registra os tempos"""
+        self.progress_bar.grid_remove()
+        if self.session.questoes:
+            self.mark_startup("carregamento_completo")
+            self.status_label.config(text=f"Carregadas {len(self.session.questoes)} questões")
+            self.update_question_info()
+        elif not self.loading_failed:
+            self.status_label.config(text="Nenhuma questão encontrada no arquivo")
+            messagebox.showerror("Erro", "Nenhuma questão encontrada no arquivo")
     
-    def is_alternative_in_question(self, alternativa_id, questao_id, fixture_data):
-        """Verifica se uma alternativa pertence a uma questão"""
-        for item in fixture_data:
-            if (item['model'] == 'yourapp.Alternative' and 
-                item['pk'] == alternativa_id and 
-                item['fields']['question'] == questao_id):
-                return True
-        return False
+    def extract_questions_from_fixture(self, fixture_data):
+        """Extrai questões do formato Django fixture"""
+        return [questao_para_estudo(q) for q in LeitorFixture(fixture_data).extrair_questoes()]
     
     def create_widgets(self):
         """Cria os elementos da interface"""
@@ -179,11 +188,23 @@ class StudyApp:
         
         self.question_info = ttk.Label(
             info_frame, 
-            text="Questão 1/150 | HCIA | Computing",
+            text="Carregando questões...",
             font=('Arial', 10)
         )
         self.question_info.grid(row=0, column=0)
         
+        # Progresso do carregamento em segundo plano
+        status_frame = ttk.Frame(controls_frame)
+        status_frame.grid(row=0, column=3, padx=(20, 0))
+        
+        self.status_label = ttk.Label(status_frame, text="Carregando questões...", font=('Arial', 9))
+        self.status_label.grid(row=0, column=0, padx=(0, 5))
+        
+        self.progress_bar = ttk.Progressbar(status_frame, mode='determinate', length=150, maximum=100)
+        self.progress_bar.grid(row=0, column=1)
+        
+        self.controls_frame = controls_frame
+        
         # Área da questão
         question_frame = ttk.LabelFrame(main_frame, text="QUESTÃO", padding="10")
         question_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
@@ -262,142 +283,151 @@ class StudyApp:
         # Configurar expansão
         main_frame.rowconfigure(4, weight=1)
     
-    def show_question(self):
-        """Exibe a questão atual"""
-        if not self.questions:
+    def create_filter_widgets(self):
+        """Cria os filtros e o salto por id quando a fonte de questões os suporta (banco SQLite)"""
+        if not hasattr(self.session.questoes, 'filtrar') or hasattr(self, 'jump_entry'):
             return
         
-        question = self.questions[self.current_question_index]
+        filter_frame = ttk.Frame(self.controls_frame)
+        filter_frame.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        self.level_filter = tk.StringVar(value="Todos")
+        self.track_filter = tk.StringVar(value="Todos")
         
-        # Atualizar informações
-        self.question_info.config(
-            text=f"Questão {self.current_question_index + 1}/{len(self.questions)} | {question['level']} | {question['track']}"
+        ttk.Label(filter_frame, text="Level:").grid(row=0, column=0, padx=(0, 5))
+        level_box = ttk.Combobox(
+            filter_frame, textvariable=self.level_filter, state="readonly", width=12,
+            values=["Todos"] + self.session.questoes.valores_distintos('level')
         )
+        level_box.grid(row=0, column=1, padx=(0, 10))
+        level_box.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
         
-        # Exibir enunciado
-        self.question_text.config(state=tk.NORMAL)
-        self.question_text.delete(1.0, tk.END)
-        self.question_text.insert(1.0, question['enunciado'])
-        self.question_text.config(state=tk.DISABLED)
-        
-        # Exibir alternativas
-        for i, letra in enumerate(['A', 'B', 'C', 'D', 'E']):
-            text_widget = self.alternative_widgets[i]
-            text_widget.config(state=tk.NORMAL)
-            text_widget.delete(1.0, tk.END)
-            
-            if letra in question['alternativas']:
-                text_widget.insert(1.0, question['alternativas'][letra]['texto'])
-                text_widget.config(state=tk.DISABLED)
-            else:
-                text_widget.insert(1.0, "")
-                text_widget.config(state=tk.DISABLED)
+        ttk.Label(filter_frame, text="Track:").grid(row=0, column=2, padx=(0, 5))
+        track_box = ttk.Combobox(
+            filter_frame, textvariable=self.track_filter, state="readonly", width=14,
+            values=["Todos"] + self.session.questoes.valores_distintos('track')
+        )
+        track_box.grid(row=0, column=3, padx=(0, 20))
+        track_box.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        
+        ttk.Label(filter_frame, text="Ir para ID:").grid(row=0, column=4, padx=(0, 5))
+        self.jump_entry = ttk.Entry(filter_frame, width=8)
+        self.jump_entry.grid(row=0, column=5, padx=(0, 5))
+        self.jump_entry.bind("<Return>", lambda e: self.go_to_question_id())
+        ttk.Button(filter_frame, text="Ir", command=self.go_to_question_id).grid(row=0, column=6)
+    
+    def set_text(self, widget, text):
+        """Substitui o conteúdo de um widget de texto somente leitura"""
+        widget.config(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+        widget.config(state=tk.DISABLED)
+    
+    def show_question(self):
+        """Exibe a questão atual"""
+        if not self.session.questoes:
+            return
+        
+        screen = self.session.tela_questao()
+        self.question_info.config(text=screen['info'])
+        self.set_text(self.question_text, screen['enunciado'])
+        for text_widget, text in zip(self.alternative_widgets, screen['alternativas']):
+            self.set_text(text_widget, text)
         
         # Limpar área de resposta
-        self.answer_text.config(state=tk.NORMAL)
-        self.answer_text.delete(1.0, tk.END)
-        self.answer_text.config(state=tk.DISABLED)
+        self.set_text(self.answer_text, "")
+        
+        # Pré-carregar as questões vizinhas quando a interface estiver ociosa
+        self.root.after_idle(self.session.pre_carregar)
+    
+    def update_question_info(self):
+        """Atualiza o rótulo de posição, level e track da questão atual"""
+        if not self.session.questoes:
+            return
+        self.question_info.config(text=self.session.texto_info())
     
     def show_answer(self):
         """Mostra a resposta correta e explicação"""
-        if not self.questions:
-            return
-        
-        question = self.questions[self.current_question_index]
-        
-        if not question['has_answer']:
-            self.answer_text.config(state=tk.NORMAL)
-            self.answer_text.delete(1.0, tk.END)
-            self.answer_text.insert(1.0, "Esta questão não possui gabarito definido.")
-            self.answer_text.config(state=tk.DISABLED)
+        if not self.session.questoes:
             return
-        
-        resposta_texto = f"RESPOSTA CORRETA: {question['item_correto']}\n\n"
-        
-        if question['explicacao']:
-            resposta_texto += f"EXPLICAÇÃO:\n{question['explicacao']}\n\n"
-        
-        if question['fonte']:
-            resposta_texto += f"FONTE: {question['fonte']}"
-        
-        self.answer_text.config(state=tk.NORMAL)
-        self.answer_text.delete(1.0, tk.END)
-        self.answer_text.insert(1.0, resposta_texto)
-        self.answer_text.config(state=tk.DISABLED)
+        self.set_text(self.answer_text, self.session.texto_resposta())
     
     def next_question(self):
         """Vai para a próxima questão"""
-        if self.current_question_index < len(self.questions) - 1:
-            self.current_question_index += 1
+        if self.session.proxima():
             self.show_question()
     
     def previous_question(self):
         """Volta para a questão anterior"""
-        if self.current_question_index > 0:
-            self.current_question_index -= 1
+        if self.session.anterior():
             self.show_question()
     
+    def apply_filter(self):
+        """Aplica os filtros de level e track selecionados"""
+        level = self.level_filter.get()
+        track = self.track_filter.get()
+        self.session.filtrar(
+            level if level != "Todos" else None,
+            track if track != "Todos" else None
+        )
+        self.show_question()
+        if not self.session.questoes:
+            self.question_info.config(text="Nenhuma questão para o filtro selecionado")
+    
+    def go_to_question_id(self):
+        """Vai diretamente para a questão com o id informado"""
+        try:
+            question_id = int(self.jump_entry.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Informe um id numérico")
+            return
+        
+        if not self.session.ir_para_id(question_id):
+            messagebox.showerror("Erro", f"Questão {question_id} não encontrada no filtro atual")
+            return
+        
+        self.show_question()
+    
     def toggle_language(self):
         """Alterna entre inglês e português"""
-        if self.current_language == "english":
-            self.current_language = "portuguese"
+        if self.session.alternar_idioma() == "portuguese":
             self.language_btn.config(text="English")
             self.translate_to_portuguese()
         else:
-            self.current_language = "english"
             self.language_btn.config(text="Português")
             self.show_question()  # Volta ao original
     
     def translate_to_portuguese(self):
         """Traduz a questão atual para português"""
-        if not self.questions:
+        if not self.session.questoes:
             return
         
-        question = self.questions[self.current_question_index]
-        
         try:
-            # Configurar tradutor para português
-            self.translator.target = 'pt'
-            
-            # Traduzir enunciado
-            translated_question = self.translator.translate(question['enunciado'])
-            self.question_text.config(state=tk.NORMAL)
-            self.question_text.delete(1.0, tk.END)
-            self.question_text.insert(1.0, translated_question)
-            self.question_text.config(state=tk.DISABLED)
-            
-            # Traduzir alternativas
-            for i, letra in enumerate(['A', 'B', 'C', 'D', 'E']):
-                if letra in question['alternativas']:
-                    translated_alt = self.translator.translate(question['alternativas'][letra]['texto'])
-                    text_widget = self.alternative_widgets[i]
-                    text_widget.config(state=tk.NORMAL)
-                    text_widget.delete(1.0, tk.END)
-                    text_widget.insert(1.0, translated_alt)
-                    text_widget.config(state=tk.DISABLED)
-            
-            # Traduzir explicação se existir
-            if question['explicacao']:
-                translated_explanation = self.translator.translate(question['explicacao'])
-                self.answer_text.config(state=tk.NORMAL)
-                self.answer_text.delete(1.0, tk.END)
-                
-                resposta_texto = f"RESPOSTA CORRETA: {question['item_correto']}\n\n"
-                resposta_texto += f"EXPLICAÇÃO:\n{translated_explanation}\n\n"
-                
-                if question['fonte']:
-                    resposta_texto += f"FONTE: {question['fonte']}"
-                
-                self.answer_text.insert(1.0, resposta_texto)
-                self.answer_text.config(state=tk.DISABLED)
-                
+            screen = self.session.tela_traduzida()
         except Exception as e:
             messagebox.showerror("Erro de Tradução", f"Erro ao traduzir: {str(e)}")
-        finally:
-            # Restaurar tradutor para inglês
-            self.translator.target = 'en'
+            return
+        
+        self.set_text(self.question_text, screen['enunciado'])
+        for text_widget, text in zip(self.alternative_widgets, screen['alternativas']):
+            self.set_text(text_widget, text)
+        if screen['resposta'] is not None:
+            self.set_text(self.answer_text, screen['resposta'])
 
 def main():
+    # --medir-inicializacao: imprime os tempos de inicialização em JSON e encerra
+    # assim que a primeira questão é exibida (útil para detectar regressões)
+    if "--medir-inicializacao" in sys.argv:
+        def report_and_exit(app):
+            app.root.update_idletasks()
+            print(json.dumps(app.startup_times))
+            app.root.after(0, app.root.destroy)
+        
+        root = tk.Tk()
+        app = StudyApp(root, on_first_question=report_and_exit)
+        root.mainloop()
+        return
+    
     root = tk.Tk()
     app = StudyApp(root)
     root.mainloop()
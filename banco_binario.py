@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import mmap
+import os
+import struct
+from leitor_fixture import LETRAS_ALTERNATIVAS, explicacao_da_fonte
+
+# Layout do arquivo (little-endian):
+#   cabeçalho | tabela de questões | tabela de alternativas | tabela de strings internadas |
+#   heap de enunciados | heap de alternativas | heap de explicações | heap de strings internadas
+MAGICO = b'ICTQBANK'
+VERSAO = 1
+CABECALHO = struct.Struct('<8sHHIIIQQQQQQQ')
+# id, enunciado (off, len), explicação (off, len), has_answer, item correto, nº de alternativas,
+# primeira alternativa, level, track, fonte (índices na tabela de strings internadas)
+REGISTRO_QUESTAO = struct.Struct('<IIIIIBBBxIIII')
+# texto (off, len), índice da letra, is_correct
+REGISTRO_ALTERNATIVA = struct.Struct('<IIBB2x')
+REGISTRO_INTERNADA = struct.Struct('<II')
+SEM_VALOR = 0xFFFFFFFF
+SEM_LETRA = 0xFF
+
+
+class EscritorBancoBinario:
+    """Gera o banco binário compacto a partir das questões no formato do StudyApp"""
+
+    def __init__(self):
+        self.registros_questoes = bytearray()
+        self.registros_alternativas = bytearray()
+        self.heap_enunciados = bytearray()
+        self.heap_alternativas = bytearray()
+        self.heap_explicacoes = bytearray()
+        self.strings_internadas = {}
+        self.total_questoes = 0
+        self.total_alternativas = 0
+
+    def _adicionar_heap(self, heap, texto):
+        dados = (texto or '').encode('utf-8')
+        offset = len(heap)
+        heap += dados
+        return offset, len(dados)
+
+    def _internar(self, texto):
+        """Armazena strings repetidas (fontes, level, track) uma única vez"""
+        if texto is None:
+            return SEM_VALOR
+        if texto not in self.strings_internadas:
+            self.strings_internadas[texto] = len(self.strings_internadas)
+        return self.strings_internadas[texto]
+
+    def adicionar_questao(self, questao):
+        """Adiciona uma questão (formato de questao_para_estudo) ao banco"""
+        enunciado_off, enunciado_len = self._adicionar_heap(self.heap_enunciados, questao['enunciado'])
+        explicacao = questao.get('explicacao', explicacao_da_fonte(questao.get('fonte')))
+        explicacao_off, explicacao_len = self._adicionar_heap(self.heap_explicacoes, explicacao)
+
+        primeira_alternativa = self.total_alternativas
+        for letra, alternativa in questao['alternativas'].items():
+            texto_off, texto_len = self._adicionar_heap(self.heap_alternativas, alternativa['texto'])
+            self.registros_alternativas += REGISTRO_ALTERNATIVA.pack(
+                texto_off, texto_len, LETRAS_ALTERNATIVAS.index(letra), bool(alternativa['is_correct'])
+            )
+            self.total_alternativas += 1
+
+        item_correto = questao.get('item_correto')
+        self.registros_questoes += REGISTRO_QUESTAO.pack(
+            questao['id'],
+            enunciado_off, enunciado_len,
+            explicacao_off, explicacao_len,
+            bool(questao['has_answer']),
+            LETRAS_ALTERNATIVAS.index(item_correto) if item_correto else SEM_LETRA,
+            len(questao['alternativas']),
+            primeira_alternativa,
+            self._internar(questao.get('level')),
+            self._internar(questao.get('track')),
+            self._internar(questao.get('fonte') or None)
+        )
+        self.total_questoes += 1
+
+    def salvar(self, caminho_arquivo):
+        """Grava o banco em disco (arquivo temporário + rename)"""
+        tabela_internadas = bytearray()
+        heap_internadas = bytearray()
+        for texto in self.strings_internadas:
+            offset, tamanho = self._adicionar_heap(heap_internadas, texto)
+            tabela_internadas += REGISTRO_INTERNADA.pack(offset, tamanho)
+
+        secoes = [
+            self.registros_questoes, self.registros_alternativas, tabela_internadas,
+            self.heap_enunciados, self.heap_alternativas, self.heap_explicacoes, heap_internadas
+        ]
+        offsets = []
+        posicao = CABECALHO.size
+        for secao in secoes:
+            offsets.append(posicao)
+            posicao += len(secao)
+
+        cabecalho = CABECALHO.pack(
+            MAGICO, VERSAO, 0,
+            self.total_questoes, self.total_alternativas, len(self.strings_internadas),
+            *offsets
+        )
+
+        caminho_temporario = caminho_arquivo + '.tmp'
+        with open(caminho_temporario, 'wb') as f:
+            f.write(cabecalho)
+            for secao in secoes:
+                f.write(secao)
+        os.replace(caminho_temporario, caminho_arquivo)
+        return caminho_arquivo
+
+
+class BancoBinario:
+    """Acesso somente leitura ao banco binário via mmap, decodificando cada questão sob demanda"""
+
+    def __init__(self, caminho_arquivo):
+        self.caminho_arquivo = caminho_arquivo
+        self._arquivo = open(caminho_arquivo, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magico, versao, _, self.total_questoes, self.total_alternativas, self.total_internadas,
+         self._off_questoes, self._off_alternativas, self._off_internadas,
+         self._off_enunciados, self._off_heap_alternativas, self._off_explicacoes,
+         self._off_heap_internadas) = CABECALHO.unpack_from(self._mapa, 0)
+
+        if magico != MAGICO or versao != VERSAO:
+            self.fechar()
+            raise ValueError(f"Arquivo não é um banco de questões válido: {caminho_arquivo}")
+
+        self._internadas = {}
+
+    def __len__(self):
+        return self.total_questoes
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self.total_questoes
+        if not 0 <= indice < self.total_questoes:
+            raise IndexError("índice de questão fora do intervalo")
+        return self.decodificar_questao(indice)
+
+    def __iter__(self):
+        for indice in range(self.total_questoes):
+            yield self.decodificar_questao(indice)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self):
+        """Libera o mapeamento e o arquivo"""
+        self._mapa.close()
+        self._arquivo.close()
+
+    def _ler_texto(self, base, offset, tamanho):
+        inicio = base + offset
+        return self._mapa[inicio:inicio + tamanho].decode('utf-8')
+
+    def _string_internada(self, indice):
+        if indice == SEM_VALOR:
+            return None
+        if indice not in self._internadas:
+            offset, tamanho = REGISTRO_INTERNADA.unpack_from(
+                self._mapa, self._off_internadas + indice * REGISTRO_INTERNADA.size
+            )
+            self._internadas[indice] = self._ler_texto(self._off_heap_internadas, offset, tamanho)
+        return self._internadas[indice]
+
+    def _registro(self, indice):
+        return REGISTRO_QUESTAO.unpack_from(self._mapa, self._off_questoes + indice * REGISTRO_QUESTAO.size)
+
+    def metadados(self, indice):
+        """Retorna id, level e track sem decodificar os textos da questão"""
+        registro = self._registro(indice)
+        return {
+            'id': registro[0],
+            'level': self._string_internada(registro[9]),
+            'track': self._string_internada(registro[10])
+        }
+
+    def decodificar_questao(self, indice):
+        """Decodifica a questão no formato usado pelo StudyApp"""
+        (questao_id, enunciado_off, enunciado_len, explicacao_off, explicacao_len,
+         has_answer, item_correto, total_alternativas, primeira_alternativa,
+         level, track, fonte) = self._registro(indice)
+
+        alternativas = {}
+        for i in range(primeira_alternativa, primeira_alternativa + total_alternativas):
+            texto_off, texto_len, letra, is_correct = REGISTRO_ALTERNATIVA.unpack_from(
+                self._mapa, self._off_alternativas + i * REGISTRO_ALTERNATIVA.size
+            )
+            alternativas[LETRAS_ALTERNATIVAS[letra]] = {
+                'texto': self._ler_texto(self._off_heap_alternativas, texto_off, texto_len),
+                'is_correct': bool(is_correct)
+            }
+
+        return {
+            'id': questao_id,
+            'enunciado': self._ler_texto(self._off_enunciados, enunciado_off, enunciado_len),
+            'alternativas': alternativas,
+            'item_correto': LETRAS_ALTERNATIVAS[item_correto] if item_correto != SEM_LETRA else None,
+            'explicacao': self._ler_texto(self._off_explicacoes, explicacao_off, explicacao_len),
+            'fonte': self._string_internada(fonte) or '',
+            'has_answer': bool(has_answer),
+            'level': self._string_internada(level),
+            'track': self._string_internada(track)
+        }
+
+
+def salvar_banco_binario(questoes, caminho_arquivo):
+    """Grava uma lista de questões (formato do StudyApp) no banco binário"""
+    escritor = EscritorBancoBinario()
+    for questao in questoes:
+        escritor.adicionar_questao(questao)
+    return escritor.salvar(caminho_arquivo)
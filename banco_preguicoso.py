@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+from fixture_streaming import iterar_objetos_com_posicoes
+from leitor_fixture import FixtureNaoAgrupado, LeitorFixture, questao_para_estudo
+
+
+class CacheLRU:
+    """Cache com capacidade fixa que descarta o item usado há mais tempo"""
+
+    def __init__(self, capacidade=128):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def __contains__(self, chave):
+        return chave in self.itens
+
+    def __len__(self):
+        return len(self.itens)
+
+    def obter(self, chave):
+        """Retorna o item (marcando-o como recente) ou None"""
+        if chave in self.itens:
+            self.itens.move_to_end(chave)
+            self.acertos += 1
+            return self.itens[chave]
+        self.faltas += 1
+        return None
+
+    def guardar(self, chave, valor):
+        """Armazena um item, descartando o menos recente se necessário"""
+        self.itens[chave] = valor
+        self.itens.move_to_end(chave)
+        while len(self.itens) > self.capacidade:
+            self.itens.popitem(last=False)
+
+
+class BancoQuestoesPreguicoso:
+    """Fonte de questões do StudyApp que lê o fixture JSON sob demanda
+
+    Na abertura o fixture é percorrido uma vez para montar um índice leve
+    (id, level, track e intervalo de bytes de cada questão). Os registros
+    completos são montados apenas para a posição atual e a janela de
+    pré-carregamento, e mantidos em um cache LRU.
+
+    Requer que cada Question seja seguida por suas Alternatives e
+    CorrectAnswersSources, como fazem os conversores deste projeto.
+    """
+
+    def __init__(self, caminho_fixture, tamanho_cache=128, janela_prefetch=3, indexar=True):
+        self.caminho_fixture = caminho_fixture
+        self.janela_prefetch = janela_prefetch
+        # O cache precisa comportar ao menos a janela inteira ao redor da questão atual
+        self.cache = CacheLRU(max(tamanho_cache, 2 * janela_prefetch + 1))
+
+        self.ids = array('q')
+        self.inicios = array('q')
+        self.fins = array('q')
+        self.levels = array('H')
+        self.tracks = array('H')
+        self.valores_internados = []
+        self._indices_internados = {}
+        self.indexacao_concluida = False
+
+        self._arquivo = open(caminho_fixture, 'rb')
+        if indexar:
+            self.indexar()
+
+    def _internar(self, valor):
+        if valor not in self._indices_internados:
+            self._indices_internados[valor] = len(self.valores_internados)
+            self.valores_internados.append(valor)
+        return self._indices_internados[valor]
+
+    def indexar(self, ao_progredir=None):
+        """Percorre o fixture uma vez registrando o intervalo de bytes de cada questão
+
+        Pode rodar em uma thread separada: enquanto a indexação avança, as
+        questões já completas ficam disponíveis. ao_progredir(bytes_lidos,
+        bytes_totais) é chamado a cada ponto percentual.
+        """
+        questao_atual = None
+        alternativas_atuais = set()
+        bytes_totais = os.path.getsize(self.caminho_fixture) or 1
+        proximo_aviso = 0
+
+        for inicio, fim, item in iterar_objetos_com_posicoes(self.caminho_fixture):
+            modelo = item['model']
+
+            if ao_progredir and fim >= proximo_aviso:
+                ao_progredir(fim, bytes_totais)
+                proximo_aviso = fim + bytes_totais // 100
+
+            if modelo == 'yourapp.Question':
+                questao_atual = item['pk']
+                alternativas_atuais = set()
+                campos = item['fields']
+                self.ids.append(questao_atual)
+                self.inicios.append(inicio)
+                self.fins.append(fim)
+                self.levels.append(self._internar(campos.get('level')))
+                self.tracks.append(self._internar(campos.get('track')))
+                continue
+
+            if modelo == 'yourapp.Alternative':
+                pertence = item['fields']['question'] == questao_atual
+                alternativas_atuais.add(item['pk'])
+            elif modelo == 'yourapp.CorrectAnswersSources':
+                pertence = item['fields']['alternative'] in alternativas_atuais
+            else:
+                continue
+
+            if not pertence:
+                raise FixtureNaoAgrupado(
+                    f"Objeto {modelo} {item['pk']} fora do bloco da sua questão em {self.caminho_fixture}"
+                )
+            self.fins[-1] = fim
+
+        self.indexacao_concluida = True
+        if ao_progredir:
+            ao_progredir(bytes_totais, bytes_totais)
+
+    def __len__(self):
+        # Durante a indexação a última questão ainda pode receber alternativas
+        if self.indexacao_concluida:
+            return len(self.ids)
+        return max(0, len(self.ids) - 1)
+
+    def __getitem__(self, indice):
+        total = len(self)
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise IndexError("índice de questão fora do intervalo")
+
+        questao = self.cache.obter(indice)
+        if questao is None:
+            questao = self.montar_questao(indice)
+            self.cache.guardar(indice, questao)
+        return questao
+
+    def fechar(self):
+        """Fecha o arquivo do fixture"""
+        self._arquivo.close()
+
+    def metadados(self, indice):
+        """Retorna id, level e track direto do índice, sem ler o fixture"""
+        return {
+            'id': self.ids[indice],
+            'level': self.valores_internados[self.levels[indice]],
+            'track': self.valores_internados[self.tracks[indice]]
+        }
+
+    def montar_questao(self, indice):
+        """Lê do disco apenas o trecho da questão e monta o registro completo"""
+        self._arquivo.seek(self.inicios[indice])
+        trecho = self._arquivo.read(self.fins[indice] - self.inicios[indice]).decode('utf-8')
+        objetos = json.loads('[' + trecho + ']')
+        return questao_para_estudo(LeitorFixture(objetos).extrair_questoes()[0])
+
+    def pre_carregar(self, indice):
+        """Garante no cache as questões da janela ao redor da posição atual"""
+        inicio = max(0, indice - self.janela_prefetch)
+        fim = min(len(self), indice + self.janela_prefetch + 1)
+        for vizinho in range(inicio, fim):
+            if vizinho not in self.cache:
+                self.cache.guardar(vizinho, self.montar_questao(vizinho))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+from array import array
+from bisect import bisect_left
+from leitor_fixture import LETRAS_ALTERNATIVAS, explicacao_da_fonte
+
+ESQUEMA = """
+CREATE TABLE question (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    level TEXT,
+    track TEXT,
+    has_answer INTEGER NOT NULL,
+    has_multiple_answers INTEGER NOT NULL DEFAULT 0,
+    approved_at TEXT,
+    last_update TEXT
+);
+CREATE TABLE alternative (
+    id INTEGER PRIMARY KEY,
+    question_id INTEGER NOT NULL REFERENCES question(id),
+    text TEXT NOT NULL,
+    is_correct INTEGER NOT NULL
+);
+CREATE TABLE correct_answer_source (
+    id INTEGER PRIMARY KEY,
+    alternative_id INTEGER NOT NULL REFERENCES alternative(id),
+    source TEXT
+);
+"""
+
+INDICES = """
+CREATE UNIQUE INDEX idx_question_position ON question(position);
+CREATE INDEX idx_question_level_track ON question(level, track, position);
+CREATE INDEX idx_question_track ON question(track, position);
+CREATE INDEX idx_alternative_question ON alternative(question_id, id);
+CREATE INDEX idx_source_alternative ON correct_answer_source(alternative_id);
+"""
+
+
+def salvar_banco_sqlite(fixture_data, caminho_banco):
+    """Grava os objetos de um fixture Django em um banco SQLite indexado"""
+    caminho_temporario = caminho_banco + '.tmp'
+    if os.path.exists(caminho_temporario):
+        os.remove(caminho_temporario)
+
+    conexao = sqlite3.connect(caminho_temporario)
+    try:
+        conexao.executescript(ESQUEMA)
+        questoes, alternativas, fontes = [], [], []
+
+        for item in fixture_data:
+            campos = item['fields']
+            if item['model'] == 'yourapp.Question':
+                questoes.append((
+                    item['pk'], len(questoes), campos['text'], campos.get('level'), campos.get('track'),
+                    campos['has_answer'], campos.get('has_multiple_answers', False),
+                    campos.get('approved_at'), campos.get('last_update')
+                ))
+            elif item['model'] == 'yourapp.Alternative':
+                alternativas.append((item['pk'], campos['question'], campos['text'], campos['is_correct']))
+            elif item['model'] == 'yourapp.CorrectAnswersSources':
+                fontes.append((item['pk'], campos['alternative'], campos['source']))
+
+        with conexao:
+            conexao.executemany("INSERT INTO question VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", questoes)
+            conexao.executemany("INSERT INTO alternative VALUES (?, ?, ?, ?)", alternativas)
+            conexao.executemany("INSERT INTO correct_answer_source VALUES (?, ?, ?)", fontes)
+        # Índices criados após a carga para não penalizar as inserções
+        conexao.executescript(INDICES)
+        conexao.execute("ANALYZE")
+    finally:
+        conexao.close()
+
+    os.replace(caminho_temporario, caminho_banco)
+    return caminho_banco
+
+
+class BancoSQLite:
+    """Fonte de questões do StudyApp apoiada em SQLite, consultada sob demanda
+
+    Na abertura apenas as posições das questões do filtro atual são lidas; cada
+    questão é montada por consultas indexadas quando acessada.
+    """
+
+    def __init__(self, caminho_banco, level=None, track=None):
+        self.caminho_banco = caminho_banco
+        # check_same_thread=False permite abrir o banco fora da thread da interface
+        self.conexao = sqlite3.connect(
+            f"file:{caminho_banco}?mode=ro", uri=True, check_same_thread=False
+        )
+        self.filtrar(level, track)
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self.posicoes)
+        if not 0 <= indice < len(self.posicoes):
+            raise IndexError("índice de questão fora do intervalo")
+        return self.montar_questao(self.posicoes[indice])
+
+    def __iter__(self):
+        for indice in range(len(self.posicoes)):
+            yield self[indice]
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+    def filtrar(self, level=None, track=None):
+        """Restringe as questões visíveis a um level e/ou track"""
+        condicoes, parametros = [], []
+        if level:
+            condicoes.append("level = ?")
+            parametros.append(level)
+        if track:
+            condicoes.append("track = ?")
+            parametros.append(track)
+
+        consulta = "SELECT position FROM question"
+        if condicoes:
+            consulta += " WHERE " + " AND ".join(condicoes)
+        consulta += " ORDER BY position"
+
+        self.level, self.track = level, track
+        self.posicoes = array('q', (linha[0] for linha in self.conexao.execute(consulta, parametros)))
+        return len(self.posicoes)
+
+    def valores_distintos(self, coluna):
+        """Lista os valores distintos de level ou track"""
+        if coluna not in ('level', 'track'):
+            raise ValueError(f"Coluna não suportada: {coluna}")
+        consulta = f"SELECT DISTINCT {coluna} FROM question WHERE {coluna} IS NOT NULL ORDER BY {coluna}"
+        return [linha[0] for linha in self.conexao.execute(consulta)]
+
+    def indice_por_id(self, questao_id):
+        """Retorna o índice da questão no filtro atual, ou None se ela não estiver visível"""
+        linha = self.conexao.execute("SELECT position FROM question WHERE id = ?", (questao_id,)).fetchone()
+        if linha is None:
+            return None
+        indice = bisect_left(self.posicoes, linha[0])
+        if indice < len(self.posicoes) and self.posicoes[indice] == linha[0]:
+            return indice
+        return None
+
+    def montar_questao(self, posicao):
+        """Monta a questão no formato usado pelo StudyApp"""
+        questao_id, texto, level, track, has_answer = self.conexao.execute(
+            "SELECT id, text, level, track, has_answer FROM question WHERE position = ?", (posicao,)
+        ).fetchone()
+
+        alternativas = {}
+        item_correto = None
+        linhas = self.conexao.execute(
+            "SELECT text, is_correct FROM alternative WHERE question_id = ? ORDER BY id", (questao_id,)
+        )
+        for i, (texto_alt, is_correct) in enumerate(linhas):
+            letra = LETRAS_ALTERNATIVAS[i] if i < len(LETRAS_ALTERNATIVAS) else 'A'
+            alternativas[letra] = {'texto': texto_alt, 'is_correct': bool(is_correct)}
+            if is_correct:
+                item_correto = letra
+
+        linha_fonte = self.conexao.execute(
+            """SELECT s.source FROM correct_answer_source s
+               JOIN alternative a ON a.id = s.alternative_id
+               WHERE a.question_id = ? ORDER BY s.id DESC LIMIT 1""",
+            (questao_id,)
+        ).fetchone()
+        fonte = (linha_fonte[0] if linha_fonte else None) or ''
+
+        return {
+            'id': questao_id,
+            'enunciado': texto,
+            'alternativas': alternativas,
+            'item_correto': item_correto,
+            'explicacao': explicacao_da_fonte(fonte),
+            'fonte': fonte,
+            'has_answer': bool(has_answer),
+            'level': level,
+            'track': track
+        }
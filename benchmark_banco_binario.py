@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from banco_binario import BancoBinario, salvar_banco_binario
+from benchmark_leitor_fixture import CAMINHO_FIXTURE_REAL, gerar_fixture_sintetico
+from leitor_fixture import LeitorFixture, questao_para_estudo
+
+
+def rss_atual_kb():
+    """RSS atual do processo (Linux); nos demais sistemas usa o pico informado por getrusage"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def medir_abertura(caminho_banco):
+    """Abre o banco, decodifica a primeira questão e imprime tempo (ms) e RSS (KB)"""
+    inicio = time.perf_counter()
+    banco = BancoBinario(caminho_banco)
+    banco[0]
+    tempo = time.perf_counter() - inicio
+    rss_kb = rss_atual_kb()
+    print(json.dumps({'tempo_ms': tempo * 1000, 'rss_kb': rss_kb, 'questoes': len(banco)}))
+
+
+def main():
+    """Mostra que abertura e RSS do StudyApp não crescem com o tamanho do banco binário"""
+    if len(sys.argv) == 3 and sys.argv[1] == '--abrir':
+        medir_abertura(sys.argv[2])
+        return
+
+    print("⏱️ BENCHMARK DO BANCO BINÁRIO (mmap)")
+    print("=" * 50)
+
+    cenarios = []
+    if os.path.exists(CAMINHO_FIXTURE_REAL):
+        with open(CAMINHO_FIXTURE_REAL, 'r', encoding='utf-8') as f:
+            cenarios.append(("fixture unificado", json.load(f)))
+    for total in [10000, 100000, 300000]:
+        cenarios.append((f"sintético {total}", gerar_fixture_sintetico(total)))
+
+    print(f"{'Cenário':<22}{'Questões':>10}{'Arquivo (KB)':>14}{'Abertura (ms)':>15}{'RSS (KB)':>10}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, fixture_data in cenarios:
+            caminho_banco = os.path.join(pasta, "questions_bank.bin")
+            questoes = [questao_para_estudo(q) for q in LeitorFixture(fixture_data).extrair_questoes()]
+            salvar_banco_binario(questoes, caminho_banco)
+            del questoes
+
+            # Processo separado para que o RSS reflita apenas a abertura do banco
+            saida = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--abrir', caminho_banco],
+                capture_output=True, text=True, check=True
+            ).stdout
+            medida = json.loads(saida)
+            tamanho_kb = os.path.getsize(caminho_banco) / 1024
+            print(f"{nome:<22}{medida['questoes']:>10}{tamanho_kb:>14.0f}"
+                  f"{medida['tempo_ms']:>15.2f}{medida['rss_kb']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import tempfile
+import time
+from banco_preguicoso import BancoQuestoesPreguicoso
+from benchmark_leitor_fixture import CAMINHO_FIXTURE_REAL, gerar_fixture_sintetico
+
+ORCAMENTO_QUADRO_MS = 1000 / 60
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def medir_navegacao(caminho_fixture, passos=2000, tamanho_cache=128, janela_prefetch=3):
+    """Mede a latência de next_question (com prefetch ocioso) e de saltos aleatórios"""
+    inicio = time.perf_counter()
+    banco = BancoQuestoesPreguicoso(caminho_fixture, tamanho_cache, janela_prefetch)
+    tempo_indice = time.perf_counter() - inicio
+
+    # Navegação sequencial: o prefetch roda "no ocioso", fora do tempo medido
+    latencias_seq = []
+    for indice in range(min(passos, len(banco))):
+        inicio = time.perf_counter()
+        banco[indice]
+        latencias_seq.append((time.perf_counter() - inicio) * 1000)
+        banco.pre_carregar(indice)
+
+    # Saltos aleatórios: sempre fora do cache
+    aleatorio = random.Random(7)
+    latencias_salto = []
+    for _ in range(min(passos, len(banco))):
+        indice = aleatorio.randrange(len(banco))
+        inicio = time.perf_counter()
+        banco[indice]
+        latencias_salto.append((time.perf_counter() - inicio) * 1000)
+
+    banco.fechar()
+    return len(banco), tempo_indice, latencias_seq, latencias_salto
+
+
+def conferir_fim_de_linha_crlf(pasta, total=500):
+    """Confere que um fixture com \\r\\n e texto não-ASCII monta as mesmas questões que o original com \\n"""
+    fixture_data = gerar_fixture_sintetico(total)
+    for item in fixture_data:
+        if item['model'] == 'yourapp.Question':
+            item['fields']['text'] += " — ação, coração, “aspas” ✓"
+    questoes = {}
+    for nome, fim_de_linha in [("lf", "\n"), ("crlf", "\r\n")]:
+        caminho = os.path.join(pasta, f"fim_de_linha_{nome}.json")
+        with open(caminho, 'w', encoding='utf-8', newline=fim_de_linha) as f:
+            json.dump(fixture_data, f, ensure_ascii=False, indent=2)
+        banco = BancoQuestoesPreguicoso(caminho)
+        questoes[nome] = [banco[indice] for indice in range(len(banco))]
+        banco.fechar()
+    if questoes["lf"] != questoes["crlf"]:
+        raise AssertionError("o fixture com \\r\\n montou questões diferentes do fixture com \\n")
+    print(f"✅ Fixture com \\r\\n e texto não-ASCII: {len(questoes['crlf'])} questões idênticas às do fixture com \\n\n")
+
+
+def main():
+    """Latência de navegação do StudyApp com carregamento preguiçoso do fixture JSON"""
+    print("⏱️ BENCHMARK DO CARREGAMENTO PREGUIÇOSO")
+    print("=" * 50)
+    print(f"Orçamento de quadro: {ORCAMENTO_QUADRO_MS:.1f} ms\n")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        conferir_fim_de_linha_crlf(pasta)
+        cenarios = []
+        if os.path.exists(CAMINHO_FIXTURE_REAL):
+            cenarios.append(("fixture unificado", CAMINHO_FIXTURE_REAL))
+        for total in [10000, 100000]:
+            caminho = os.path.join(pasta, f"sintetico_{total}.json")
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump(gerar_fixture_sintetico(total), f, ensure_ascii=False, indent=2)
+            cenarios.append((f"sintético {total}", caminho))
+
+        print(f"{'Cenário':<20}{'Questões':>10}{'Índice (s)':>12}"
+              f"{'Próx. p50':>11}{'Próx. p99':>11}{'Salto p50':>11}{'Salto p99':>11}  (ms)")
+        for nome, caminho in cenarios:
+            total, tempo_indice, seq, salto = medir_navegacao(caminho)
+            print(f"{nome:<20}{total:>10}{tempo_indice:>12.2f}"
+                  f"{percentil(seq, 0.5):>11.3f}{percentil(seq, 0.99):>11.3f}"
+                  f"{percentil(salto, 0.5):>11.3f}{percentil(salto, 0.99):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
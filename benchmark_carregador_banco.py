@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from benchmark_leitor_fixture import CAMINHO_FIXTURE_REAL, gerar_fixture_sintetico
+from carregador_banco import MODELOS, CarregadorBanco, coluna, criar_esquema_sqlite
+
+
+def carregar_objeto_a_objeto(conexao, fixture_data):
+    """Carga como a do loaddata: cada objeto é salvo sozinho (UPDATE e, se não havia linha, INSERT)"""
+    for objeto in fixture_data:
+        tabela, campos = MODELOS[objeto['model']]
+        colunas = [coluna(campo) for campo in campos]
+        valores = [objeto['fields'].get(campo) for campo in campos]
+        cursor = conexao.execute(
+            f"UPDATE {tabela} SET {', '.join(f'{c} = ?' for c in colunas)} WHERE id = ?", valores + [objeto['pk']]
+        )
+        if cursor.rowcount == 0:
+            conexao.execute(
+                f"INSERT INTO {tabela} (id, {', '.join(colunas)}) VALUES ({', '.join(['?'] * (len(colunas) + 1))})",
+                [objeto['pk']] + valores
+            )
+    conexao.commit()
+
+
+def medir(pasta, fixture_data, carga):
+    """Tempo (s) de uma carga em um banco novo e o total de linhas gravadas"""
+    caminho = os.path.join(pasta, f"destino_{time.perf_counter_ns()}.sqlite3")
+    conexao = sqlite3.connect(caminho)
+    conexao.execute("PRAGMA foreign_keys = ON")
+    criar_esquema_sqlite(conexao)
+    inicio = time.perf_counter()
+    carga(conexao, fixture_data)
+    tempo = time.perf_counter() - inicio
+    linhas = sum(conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0] for tabela, _ in MODELOS.values())
+    conexao.close()
+    os.remove(caminho)
+    return tempo, linhas
+
+
+def main():
+    """Vazão da carga em lotes em relação à gravação objeto a objeto"""
+    print("⏱️ BENCHMARK DO CARREGADOR DE BANCO (SQLite)")
+    print("=" * 50)
+
+    cenarios = []
+    if os.path.exists(CAMINHO_FIXTURE_REAL):
+        with open(CAMINHO_FIXTURE_REAL, 'r', encoding='utf-8') as f:
+            cenarios.append(("fixture unificado", json.load(f)))
+    for total in [10000, 100000]:
+        cenarios.append((f"sintético {total}", gerar_fixture_sintetico(total)))
+
+    cargas = [("objeto a objeto", carregar_objeto_a_objeto)]
+    for tamanho_lote in [1, 100, 500]:
+        cargas.append((f"lote de {tamanho_lote}",
+                       lambda conexao, dados, t=tamanho_lote: CarregadorBanco(conexao, t).carregar(dados)))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, fixture_data in cenarios:
+            print(f"\n📊 {nome} ({len(fixture_data)} objetos)")
+            print(f"   {'Carga':<18}{'Tempo (s)':>11}{'Objetos/s':>12}{'Linhas':>10}{'Ganho':>8}")
+            referencia = None
+            for nome_carga, carga in cargas:
+                tempo, linhas = medir(pasta, fixture_data, carga)
+                referencia = referencia or tempo
+                print(f"   {nome_carga:<18}{tempo:>11.3f}{len(fixture_data) / tempo:>12.0f}{linhas:>10}"
+                      f"{referencia / tempo:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+import time
+from deduplicacao_lsh import IndiceDuplicatas, jaccard, normalizar_texto, shingles
+
+SILABAS = "ka ne ro ti lu sa me po di fa gu le mi no ra se to vu be ci da fe go hi ja ko li ma nu pe".split()
+
+
+def gerar_vocabulario(total=3000, semente=5):
+    """Vocabulário técnico fictício, para que enunciados distintos compartilhem poucos trechos"""
+    aleatorio = random.Random(semente)
+    return sorted({
+        ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4)))
+        for _ in range(total)
+    })
+
+
+VOCABULARIO = gerar_vocabulario()
+MODELOS = [
+    "Which of the following statements about {} are true?",
+    "In openEuler, which command can be used to {}?",
+    "The administrator needs to configure {}. Which option is correct?",
+    "What happens when {}?",
+]
+
+
+def gerar_questoes(total, fracao_duplicatas=0.1, semente=11):
+    """Questões sintéticas com quase duplicatas injetadas (renumeração, pontuação e ruído de OCR)
+
+    Retorna (questoes, pares) onde pares são os índices (original, duplicata).
+    """
+    aleatorio = random.Random(semente)
+    questoes, pares = [], []
+    for numero in range(1, total + 1):
+        if questoes and aleatorio.random() < fracao_duplicatas:
+            original = aleatorio.randrange(len(questoes))
+            texto = questoes[original]['enunciado'].split('. ', 1)[-1]
+            texto = f"{aleatorio.randint(1, 99)}. {texto.replace(',', '').replace('?', ' ?')}"
+            posicao = aleatorio.randrange(len(texto))
+            texto = texto[:posicao] + aleatorio.choice("lI1O0") + texto[posicao + 1:]
+            alternativas = questoes[original]['alternativas']
+            pares.append((original, len(questoes)))
+        else:
+            assunto = ' '.join(aleatorio.choice(VOCABULARIO) for _ in range(aleatorio.randint(8, 14)))
+            texto = f"{numero}. " + aleatorio.choice(MODELOS).format(assunto)
+            alternativas = {
+                letra: {'texto': ' '.join(aleatorio.choice(VOCABULARIO) for _ in range(3))}
+                for letra in "ABCD"
+            }
+        questoes.append({'id': numero, 'enunciado': texto, 'alternativas': alternativas})
+    return questoes, pares
+
+
+def medir_lsh(questoes, pares):
+    indice = IndiceDuplicatas()
+    destino = []
+    inicio = time.perf_counter()
+    for questao in questoes:
+        posicao, _ = indice.procurar_ou_adicionar(questao)
+        destino.append(posicao)
+    tempo = time.perf_counter() - inicio
+    encontrados = sum(1 for original, duplicata in pares if destino[duplicata] == destino[original])
+    mantidas = len(indice)
+    return tempo, indice.comparacoes, encontrados, mantidas
+
+
+def medir_pares(questoes, limite=1500):
+    """Tempo da comparação par a par em uma amostra, extrapolado para todas as questões"""
+    amostra = [shingles(normalizar_texto(q['enunciado'])) for q in questoes[:limite]]
+    inicio = time.perf_counter()
+    for i in range(len(amostra)):
+        for j in range(i):
+            jaccard(amostra[i], amostra[j])
+    por_par = (time.perf_counter() - inicio) / (len(amostra) * (len(amostra) - 1) / 2)
+    return por_par * len(questoes) * (len(questoes) - 1) / 2
+
+
+def main():
+    """Custo da detecção de quase duplicatas com LSH em relação à comparação par a par"""
+    print("⏱️ BENCHMARK DA DEDUPLICAÇÃO (MinHash/LSH)")
+    print("=" * 50)
+    print(f"{'Questões':>10}{'LSH (s)':>10}{'Comparações':>14}{'Pares (s, est.)':>17}"
+          f"{'Duplicatas':>12}{'Encontradas':>13}{'Mantidas':>10}")
+    for total in [1000, 10000, 50000]:
+        questoes, pares = gerar_questoes(total)
+        tempo, comparacoes, encontrados, mantidas = medir_lsh(questoes, pares)
+        estimado = medir_pares(questoes)
+        print(f"{total:>10}{tempo:>10.2f}{comparacoes:>14}{estimado:>17.1f}"
+              f"{len(pares):>12}{encontrados:>13}{mantidas:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from drivers_interface import DriverSimulado, carregar_respostas
+from extraction import ExtratorTextoComCopilot
+
+PASTA_RESPOSTAS_REAIS = os.path.join("questoes_processadas_copilot", "respostas_intermediarias")
+RESPOSTA_SINTETICA = """ENUNCIADO: Qual componente executa as instruções de um programa?
+
+ITENS:
+A) Memória RAM
+B) CPU
+C) Disco rígido
+D) Monitor
+
+ITEM CORRETO: B
+
+EXPLICAÇÃO: A CPU busca, decodifica e executa as instruções."""
+
+
+def executar(respostas, total_imagens, **opcoes):
+    """Roda o pipeline de imagens com o Copilot simulado; retorna o driver, as questões, as tentativas refeitas e o tempo real (s)"""
+    driver = DriverSimulado(respostas, **opcoes)
+    extrator = ExtratorTextoComCopilot(driver)
+    imagens = [{'nome': f'questao_{i:03d}.png', 'numero': i} for i in range(1, total_imagens + 1)]
+    with tempfile.TemporaryDirectory() as pasta:
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            questoes = extrator.processar_imagens_restantes(imagens, pasta)
+        tempo_real = time.perf_counter() - inicio
+        refeitas = sum(registro['tentativas'] - 1 for registro in extrator.diario.registros.values())
+        extrator.fechar_diario()
+    return driver, questoes, refeitas, tempo_real
+
+
+def main():
+    """Vazão e falhas do pipeline de imagens com o Copilot simulado: python benchmark_drivers_interface.py [imagens]"""
+    total_imagens = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    respostas = carregar_respostas(PASTA_RESPOSTAS_REAIS) if os.path.isdir(PASTA_RESPOSTAS_REAIS) else []
+    origem = "respostas reais gravadas" if respostas else "resposta sintética"
+    respostas = respostas or [RESPOSTA_SINTETICA]
+
+    print("⏱️ BENCHMARK DO PIPELINE DE IMAGENS COM O COPILOT SIMULADO")
+    print("=" * 50)
+    print(f"Imagens: {total_imagens} | {origem} ({len(respostas)}) | latência do Copilot: 8-30 s\n")
+
+    cenarios = [
+        ("esperas fixas", dict(tela_observavel=False)),
+        ("esperas por eventos", dict()),
+        ("eventos + falhas", dict(taxa_falha_copia=0.1, taxa_resposta_vazia=0.05)),
+        ("início tardio + pausa", dict(atraso_inicio=35.0, pausa=(0.5, 6.0))),
+    ]
+    print(f"   {'Cenário':<22}{'Simulado (s)':>14}{'s/imagem':>10}{'Completas':>11}{'Truncadas':>11}"
+          f"{'Perdidas':>10}{'Vazias':>8}{'Refeitas':>10}{'Real (s)':>10}")
+    for nome, opcoes in cenarios:
+        driver, questoes, refeitas, tempo_real = executar(respostas, total_imagens, semente=42, **opcoes)
+        completas = sum(1 for q in questoes if q.get('enunciado') and len(q.get('itens', {})) >= 2)
+        print(f"   {nome:<22}{driver.agora():>14.0f}{driver.agora() / total_imagens:>10.1f}{completas:>11}"
+              f"{driver.respostas_truncadas():>11}{driver.falhas['copia_perdida']:>10}"
+              f"{driver.falhas['resposta_vazia']:>8}{refeitas:>10}{tempo_real:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
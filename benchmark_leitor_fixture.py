@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import time
+from leitor_fixture import LeitorFixture
+
+CAMINHO_FIXTURE_REAL = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "questoes_unificadas", "questions_fixture_unificado.json"
+)
+
+
+def gerar_fixture_sintetico(total_questoes, semente=42):
+    """Gera um fixture Django sintético com 4 ou 5 alternativas por questão"""
+    aleatorio = random.Random(semente)
+    fixture_data = []
+    alternative_pk = 1
+    correct_source_pk = 1
+
+    for question_pk in range(1, total_questoes + 1):
+        fixture_data.append({
+            "model": "yourapp.Question",
+            "pk": question_pk,
+            "fields": {
+                "text": f"{question_pk}. Synthetic question {aleatorio.random()}",
+                "level": "HCIA",
+                "has_answer": True,
+                "track": "Computing",
+                "approved_at": None
+            }
+        })
+
+        total_alternativas = aleatorio.choice([4, 5])
+        correta = aleatorio.randrange(total_alternativas)
+        for i in range(total_alternativas):
+            fixture_data.append({
+                "model": "yourapp.Alternative",
+                "pk": alternative_pk,
+                "fields": {"question": question_pk, "text": f"Option {i}", "is_correct": i == correta}
+            })
+            if i == correta:
+                fixture_data.append({
+                    "model": "yourapp.CorrectAnswersSources",
+                    "pk": correct_source_pk,
+                    "fields": {"alternative": alternative_pk, "source": "Documento oficial"}
+                })
+                correct_source_pk += 1
+            alternative_pk += 1
+
+    return fixture_data
+
+
+def medir(fixture_data, repeticoes=3):
+    """Retorna o melhor tempo (em segundos) de indexação + extração"""
+    melhor = float('inf')
+    questoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        questoes = LeitorFixture(fixture_data).extrair_questoes()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, len(questoes)
+
+
+def main():
+    """Mede o leitor do fixture de 695 questões até 100 mil questões sintéticas"""
+    print("⏱️ BENCHMARK DO LEITOR DE FIXTURE")
+    print("=" * 50)
+
+    cenarios = []
+    if os.path.exists(CAMINHO_FIXTURE_REAL):
+        with open(CAMINHO_FIXTURE_REAL, 'r', encoding='utf-8') as f:
+            cenarios.append(("fixture unificado", json.load(f)))
+
+    for total in [1000, 10000, 100000]:
+        cenarios.append((f"sintético {total}", gerar_fixture_sintetico(total)))
+
+    print(f"{'Cenário':<22}{'Objetos':>10}{'Questões':>10}{'Tempo (ms)':>12}{'µs/questão':>12}")
+    for nome, fixture_data in cenarios:
+        tempo, total_questoes = medir(fixture_data)
+        por_questao = tempo / total_questoes * 1e6 if total_questoes else 0
+        print(f"{nome:<22}{len(fixture_data):>10}{total_questoes:>10}{tempo * 1000:>12.1f}{por_questao:>12.2f}")
+
+    print("\n📈 Escala linear: o custo por questão deve permanecer aproximadamente constante")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import tempfile
+import time
+from banco_preguicoso import BancoQuestoesPreguicoso
+from benchmark_banco_preguicoso import ORCAMENTO_QUADRO_MS, percentil
+from benchmark_leitor_fixture import CAMINHO_FIXTURE_REAL, gerar_fixture_sintetico
+from cache_traducao import CacheTraducao
+from nucleo_estudo import SessaoEstudo
+from tradutores import TradutorLocal
+
+
+def cronometrar(latencias, acao, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    latencias.setdefault(acao, []).append((time.perf_counter() - inicio) * 1000)
+
+
+def medir_sessao(caminho_fixture, pasta_cache, passos=1000):
+    """Executa headless as ações do StudyApp e retorna as latências (ms) de cada uma"""
+    banco = BancoQuestoesPreguicoso(caminho_fixture)
+    cache = CacheTraducao(os.path.join(pasta_cache, "traducoes.sqlite3"))
+    sessao = SessaoEstudo(banco, tradutor=TradutorLocal(), cache_traducao=cache)
+    sessao.carregamento_concluido = True
+    latencias = {}
+
+    passos = min(passos, len(banco) - 1)
+    cronometrar(latencias, "show_question", sessao.tela_questao)
+    for _ in range(passos):
+        # next_question + show_question; o prefetch roda no ocioso, fora do tempo medido
+        cronometrar(latencias, "next_question", lambda: (sessao.proxima(), sessao.tela_questao()))
+        sessao.pre_carregar()
+        cronometrar(latencias, "show_answer", sessao.texto_resposta)
+
+    # Tradução: a primeira troca de idioma passa pelo tradutor, a segunda vem do cache
+    aleatorio = random.Random(7)
+    for _ in range(min(passos, 200)):
+        sessao.indice = aleatorio.randrange(len(banco))
+        sessao.tela_questao()
+        cronometrar(latencias, "toggle_language (tradutor)", lambda: (sessao.alternar_idioma(), sessao.tela_traduzida()))
+        cronometrar(latencias, "toggle_language (volta)", lambda: (sessao.alternar_idioma(), sessao.tela_questao()))
+        cronometrar(latencias, "toggle_language (cache)", lambda: (sessao.alternar_idioma(), sessao.tela_traduzida()))
+        sessao.alternar_idioma()
+
+    cache.fechar()
+    banco.fechar()
+    return len(banco), latencias
+
+
+def main():
+    """Latência por ação do núcleo do StudyApp, sem display"""
+    print("⏱️ BENCHMARK DO NÚCLEO DO STUDYAPP (headless)")
+    print("=" * 50)
+    print(f"Orçamento de quadro: {ORCAMENTO_QUADRO_MS:.1f} ms\n")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        cenarios = []
+        if os.path.exists(CAMINHO_FIXTURE_REAL):
+            cenarios.append(("fixture unificado", CAMINHO_FIXTURE_REAL))
+        caminho = os.path.join(pasta, "sintetico_100000.json")
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(gerar_fixture_sintetico(100000), f, ensure_ascii=False, indent=2)
+        cenarios.append(("sintético 100000", caminho))
+
+        for nome, caminho in cenarios:
+            pasta_cache = tempfile.mkdtemp(dir=pasta)
+            total, latencias = medir_sessao(caminho, pasta_cache)
+            print(f"📊 {nome} ({total} questões)")
+            print(f"   {'Ação':<30}{'Amostras':>10}{'p50 (ms)':>11}{'p99 (ms)':>11}{'Máx. (ms)':>11}")
+            for acao, valores in latencias.items():
+                marcador = "✅" if percentil(valores, 0.99) <= ORCAMENTO_QUADRO_MS else "⚠️"
+                print(f"   {acao:<30}{len(valores):>10}{percentil(valores, 0.5):>11.3f}"
+                      f"{percentil(valores, 0.99):>11.3f}{max(valores):>11.3f} {marcador}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import time
+from leitor_fixture import extrair_questoes_do_fixture, questao_para_estudo
+from benchmark_leitor_fixture import CAMINHO_FIXTURE_REAL, gerar_fixture_sintetico
+from tradutores import TradutorLocal
+
+LETRAS = ['A', 'B', 'C', 'D', 'E']
+
+
+def segmentos_da_questao(questao):
+    """Enunciado, alternativas e explicação na ordem usada por translate_to_portuguese"""
+    segmentos = [questao['enunciado']]
+    segmentos += [questao['alternativas'][letra]['texto'] for letra in LETRAS if letra in questao['alternativas']]
+    if questao['explicacao']:
+        segmentos.append(questao['explicacao'])
+    return segmentos
+
+
+def medir(questoes, tradutor, em_lote):
+    """Traduz todas as questões, um segmento por requisição ou um lote por questão"""
+    tradutor.requisicoes = 0
+    inicio = time.perf_counter()
+    for questao in questoes:
+        segmentos = segmentos_da_questao(questao)
+        if em_lote:
+            traducoes = tradutor.traduzir_lote(segmentos, 'pt')
+        else:
+            traducoes = [tradutor.traduzir(segmento, 'pt') for segmento in segmentos]
+        assert len(traducoes) == len(segmentos)
+    return time.perf_counter() - inicio, tradutor.requisicoes
+
+
+def main():
+    """Compara tradução segmento a segmento e em lote por questão com o tradutor local"""
+    latencia_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 80.0
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    if os.path.exists(CAMINHO_FIXTURE_REAL):
+        with open(CAMINHO_FIXTURE_REAL, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        origem = "fixture unificado"
+    else:
+        fixture = gerar_fixture_sintetico(total)
+        origem = "fixture sintético"
+    questoes = [questao_para_estudo(q) for q in extrair_questoes_do_fixture(fixture)[:total]]
+
+    print("⏱️ BENCHMARK DE TRADUÇÃO EM LOTE")
+    print("=" * 50)
+    print(f"Questões: {len(questoes)} ({origem}) | latência simulada: {latencia_ms:.0f} ms/requisição\n")
+
+    tradutor = TradutorLocal(latencia_requisicao=latencia_ms / 1000)
+    tempo_seq, req_seq = medir(questoes, tradutor, em_lote=False)
+    tempo_lote, req_lote = medir(questoes, tradutor, em_lote=True)
+
+    print(f"{'Modo':<22}{'Requisições':>13}{'Req./questão':>14}{'Total (s)':>11}{'Por questão (ms)':>18}")
+    for nome, tempo, requisicoes in [("segmento a segmento", tempo_seq, req_seq), ("lote por questão", tempo_lote, req_lote)]:
+        print(f"{nome:<22}{requisicoes:>13}{requisicoes / len(questoes):>14.2f}"
+              f"{tempo:>11.2f}{tempo / len(questoes) * 1000:>18.1f}")
+    print(f"\n📈 Redução de requisições: {req_seq / req_lote:.1f}x | tempo: {tempo_seq / tempo_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unificar_questoes import UnificadorQuestoes
+
+FIXTURE_COPILOT = os.path.join("questoes_processadas_copilot", "questions_fixture.json")
+FIXTURE_DOCX = os.path.join("questoes_processadas_docx", "questions_fixture.json")
+
+
+def copiar_questao(origem, destino, questao_pk, prefixo):
+    """Anexa ao fixture destino uma cópia da questão questao_pk do fixture origem (com alternativas e fontes)
+
+    O enunciado recebe prefixo e os pks da cópia continuam depois dos maiores do destino.
+    """
+    with open(origem, 'r', encoding='utf-8') as f:
+        objetos_origem = json.load(f)
+    with open(destino, 'r', encoding='utf-8') as f:
+        objetos_destino = json.load(f)
+    proximo = {}
+    for objeto in objetos_destino:
+        proximo[objeto['model']] = max(proximo.get(objeto['model'], 0), objeto['pk'])
+
+    novos_pks = {}
+
+    def novo_pk(modelo, pk):
+        if (modelo, pk) not in novos_pks:
+            proximo[modelo] = proximo.get(modelo, 0) + 1
+            novos_pks[(modelo, pk)] = proximo[modelo]
+        return novos_pks[(modelo, pk)]
+
+    alternativas = set()
+    for objeto in objetos_origem:
+        campos = dict(objeto['fields'])
+        modelo = objeto['model']
+        if modelo == 'yourapp.Question' and objeto['pk'] == questao_pk:
+            campos['text'] = prefixo + campos['text']
+        elif modelo == 'yourapp.Alternative' and campos['question'] == questao_pk:
+            alternativas.add(objeto['pk'])
+            campos['question'] = novo_pk('yourapp.Question', questao_pk)
+        elif modelo == 'yourapp.CorrectAnswersSources' and campos['alternative'] in alternativas:
+            campos['alternative'] = novo_pk('yourapp.Alternative', campos['alternative'])
+        else:
+            continue
+        objetos_destino.append({"model": modelo, "pk": novo_pk(modelo, objeto['pk']), "fields": campos})
+
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(objetos_destino, f, ensure_ascii=False, indent=2)
+
+
+def unificar(arquivos, pasta_saida, incremental):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        UnificadorQuestoes().unificar_arquivos(arquivos, pasta_saida, incremental=incremental)
+    return time.perf_counter() - inicio
+
+
+def ler_saidas(pasta_saida):
+    """Fixture unificado (sem last_update, que registra o instante da execução) e banco binário"""
+    with open(os.path.join(pasta_saida, "questions_fixture_unificado.json"), 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    for objeto in fixture:
+        objeto['fields'].pop('last_update', None)
+    with open(os.path.join(pasta_saida, "questions_bank.bin"), 'rb') as f:
+        return fixture, f.read()
+
+
+def comparar_cenario(pasta, nome, alterar):
+    """Unifica, aplica alterar(copilot, docx) às fontes e confere que a unificação incremental
+    produz as mesmas saídas que a reconstrução completa a partir do mesmo estado inicial"""
+    fontes = os.path.join(pasta, nome)
+    os.makedirs(fontes)
+    copilot, docx = os.path.join(fontes, "copilot.json"), os.path.join(fontes, "docx.json")
+    shutil.copy(FIXTURE_COPILOT, copilot)
+    shutil.copy(FIXTURE_DOCX, docx)
+
+    incremental = os.path.join(fontes, "incremental")
+    unificar([copilot, docx], incremental, incremental=True)
+    completa = os.path.join(fontes, "completa")
+    shutil.copytree(incremental, completa)
+
+    alterar(copilot, docx)
+    tempo_incremental = unificar([copilot, docx], incremental, incremental=True)
+    tempo_completo = unificar([copilot, docx], completa, incremental=False)
+    iguais = ler_saidas(incremental) == ler_saidas(completa)
+    print(f"   {nome:<38}{tempo_incremental:>17.2f}{tempo_completo:>14.2f}   {'✅ iguais' if iguais else '❌ DIFERENTES'}")
+    return iguais
+
+
+def main():
+    """Confere a unificação incremental contra a reconstrução completa: python benchmark_unificacao_incremental.py"""
+    if not (os.path.exists(FIXTURE_COPILOT) and os.path.exists(FIXTURE_DOCX)):
+        print(f"❌ Fixtures de origem não encontrados: {FIXTURE_COPILOT}, {FIXTURE_DOCX}")
+        sys.exit(2)
+
+    print("⏱️ UNIFICAÇÃO INCREMENTAL x RECONSTRUÇÃO COMPLETA")
+    print("=" * 50)
+    cenarios = [
+        # Questões novas são anexadas ao fim: só no último arquivo a ordem coincide com a da reconstrução
+        ("questão nova no último arquivo", lambda copilot, docx: copiar_questao(
+            docx, docx, 11, "Synthetic unique prefix about routing tables and OSPF areas: ")),
+        # Mesma precedência: vale a cópia do arquivo anterior (copilot), que chega depois no modo incremental
+        ("duplicata no arquivo anterior", lambda copilot, docx: copiar_questao(docx, copilot, 11, "99. ")),
+        ("duplicata no mesmo arquivo", lambda copilot, docx: copiar_questao(docx, docx, 11, "99. ")),
+    ]
+    print(f"   {'Cenário':<38}{'Incremental (s)':>17}{'Completa (s)':>14}")
+    with tempfile.TemporaryDirectory() as pasta:
+        resultados = [comparar_cenario(pasta, nome, alterar) for nome, alterar in cenarios]
+    sys.exit(0 if all(resultados) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+CAMINHO_PADRAO = os.path.join(os.path.expanduser("~"), ".cache", "ict-questions", "traducoes.sqlite3")
+TAMANHO_MAXIMO_PADRAO = 50 * 1024 * 1024
+
+
+class CacheTraducao:
+    """Cache persistente de traduções, compartilhado entre sessões
+
+    Cada entrada é identificada pelo hash SHA-256 do idioma de destino e do
+    texto original. Quando o total armazenado passa de tamanho_maximo bytes,
+    as entradas acessadas há mais tempo são descartadas.
+    """
+
+    def __init__(self, caminho_banco=CAMINHO_PADRAO, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.caminho_banco = caminho_banco
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.faltas = 0
+        self.remocoes = 0
+
+        if os.path.dirname(caminho_banco):
+            os.makedirs(os.path.dirname(caminho_banco), exist_ok=True)
+        self.conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+        with self.conexao:
+            self.conexao.execute("""
+                CREATE TABLE IF NOT EXISTS traducao (
+                    chave TEXT PRIMARY KEY,
+                    alvo TEXT NOT NULL,
+                    traducao TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                )
+            """)
+            self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_traducao_acesso ON traducao(ultimo_acesso)")
+            self.conexao.execute("""
+                CREATE TABLE IF NOT EXISTS contador (
+                    nome TEXT PRIMARY KEY,
+                    valor INTEGER NOT NULL
+                )
+            """)
+        # Estimativa do total armazenado; o valor exato só é recalculado ao atingir o limite
+        self._tamanho_estimado = self._tamanho_total()
+
+    @staticmethod
+    def chave(texto, alvo):
+        """Hash do idioma de destino e do texto original"""
+        return hashlib.sha256(f"{alvo}\0{texto}".encode('utf-8')).hexdigest()
+
+    def _incrementar(self, nome, quantidade=1):
+        self.conexao.execute(
+            "INSERT INTO contador (nome, valor) VALUES (?, ?) "
+            "ON CONFLICT(nome) DO UPDATE SET valor = valor + excluded.valor",
+            (nome, quantidade)
+        )
+
+    def obter(self, texto, alvo):
+        """Retorna a tradução armazenada ou None"""
+        chave = self.chave(texto, alvo)
+        linha = self.conexao.execute("SELECT traducao FROM traducao WHERE chave = ?", (chave,)).fetchone()
+
+        with self.conexao:
+            if linha is None:
+                self.faltas += 1
+                self._incrementar('faltas')
+                return None
+
+            self.acertos += 1
+            self._incrementar('acertos')
+            self.conexao.execute("UPDATE traducao SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave))
+        return linha[0]
+
+    def guardar(self, texto, alvo, traducao):
+        """Armazena uma tradução, descartando as menos usadas se o limite for excedido"""
+        with self.conexao:
+            self._inserir(texto, alvo, traducao)
+
+    def _inserir(self, texto, alvo, traducao):
+        tamanho = len(texto.encode('utf-8')) + len(traducao.encode('utf-8'))
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO traducao (chave, alvo, traducao, tamanho, ultimo_acesso) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.chave(texto, alvo), alvo, traducao, tamanho, time.time())
+        )
+        self._tamanho_estimado += tamanho
+        if self._tamanho_estimado > self.tamanho_maximo:
+            self._descartar_excedente()
+
+    def _tamanho_total(self):
+        return self.conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM traducao").fetchone()[0]
+
+    def _descartar_excedente(self):
+        total = self._tamanho_total()
+        self._tamanho_estimado = total
+        if total <= self.tamanho_maximo:
+            return
+
+        # Descartar até 90% do limite para não repetir a limpeza a cada inserção
+        alvo_total = self.tamanho_maximo * 0.9
+        removidas = []
+        for chave, tamanho in self.conexao.execute("SELECT chave, tamanho FROM traducao ORDER BY ultimo_acesso"):
+            if total <= alvo_total:
+                break
+            removidas.append((chave,))
+            total -= tamanho
+
+        self.conexao.executemany("DELETE FROM traducao WHERE chave = ?", removidas)
+        self._tamanho_estimado = total
+        self.remocoes += len(removidas)
+        self._incrementar('remocoes', len(removidas))
+
+    def traduzir(self, texto, alvo, traduzir_sem_cache):
+        """Retorna a tradução do cache ou a obtém com traduzir_sem_cache(texto) e a armazena"""
+        traducao = self.obter(texto, alvo)
+        if traducao is None:
+            traducao = traduzir_sem_cache(texto)
+            if traducao is not None:
+                self.guardar(texto, alvo, traducao)
+        return traducao
+
+    def traduzir_lote(self, textos, alvo, traduzir_lote_sem_cache):
+        """Traduz uma lista de textos, enviando a traduzir_lote_sem_cache apenas os ausentes do cache
+
+        Consultas e gravações do lote são feitas em uma única transação cada.
+        """
+        chaves = [self.chave(texto, alvo) for texto in textos]
+        encontradas = {}
+        for inicio in range(0, len(chaves), 500):
+            parte = chaves[inicio:inicio + 500]
+            encontradas.update(self.conexao.execute(
+                f"SELECT chave, traducao FROM traducao WHERE chave IN ({','.join('?' * len(parte))})", parte
+            ))
+        traducoes = [encontradas.get(chave) for chave in chaves]
+        pendentes = [i for i, traducao in enumerate(traducoes) if traducao is None]
+
+        with self.conexao:
+            acertos = len(traducoes) - len(pendentes)
+            self.acertos += acertos
+            self.faltas += len(pendentes)
+            if acertos:
+                self._incrementar('acertos', acertos)
+                agora = time.time()
+                self.conexao.executemany(
+                    "UPDATE traducao SET ultimo_acesso = ? WHERE chave = ?",
+                    [(agora, chave) for chave in set(encontradas)]
+                )
+            if pendentes:
+                self._incrementar('faltas', len(pendentes))
+
+        if pendentes:
+            novas = traduzir_lote_sem_cache([textos[i] for i in pendentes])
+            with self.conexao:
+                for i, traducao in zip(pendentes, novas):
+                    traducoes[i] = traducao
+                    if traducao is not None:
+                        self._inserir(textos[i], alvo, traducao)
+
+        return traducoes
+
+    def estatisticas(self):
+        """Contadores da sessão atual e acumulados entre sessões"""
+        entradas, tamanho = self.conexao.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM traducao"
+        ).fetchone()
+        acumulados = dict(self.conexao.execute("SELECT nome, valor FROM contador"))
+        return {
+            'sessao': {'acertos': self.acertos, 'faltas': self.faltas, 'remocoes': self.remocoes},
+            'acumulado': {
+                'acertos': acumulados.get('acertos', 0),
+                'faltas': acumulados.get('faltas', 0),
+                'remocoes': acumulados.get('remocoes', 0)
+            },
+            'entradas': entradas,
+            'tamanho_bytes': tamanho,
+            'tamanho_maximo_bytes': self.tamanho_maximo
+        }
+
+    def fechar(self):
+        """Fecha a conexão com o banco do cache"""
+        self.conexao.close()
+
+
+def main():
+    """Exibe os contadores do cache de traduções"""
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CAMINHO_PADRAO
+    if not os.path.exists(caminho):
+        print(f"❌ Cache não encontrado: {caminho}")
+        return
+    cache = CacheTraducao(caminho)
+    print(json.dumps(cache.estatisticas(), indent=2, ensure_ascii=False))
+    cache.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import sqlite3
+import time
+from collections import Counter
+from fixture_streaming import iterar_objetos_fixture
+
+# Modelo do fixture -> tabela do Django e campos na ordem das colunas
+MODELOS = {
+    'yourapp.Question': ('yourapp_question', [
+        'submitted_by', 'reviewed_by', 'text', 'level', 'has_answer', 'has_multiple_answers', 'track', 'weight',
+        'approved_at', 'last_update'
+    ]),
+    'yourapp.Alternative': ('yourapp_alternative', ['question', 'text', 'is_correct']),
+    'yourapp.CorrectAnswersSources': ('yourapp_correctanswerssources', ['alternative', 'source']),
+}
+# Chaves estrangeiras resolvidas pelo carregador (campo -> modelo referenciado)
+CHAVES_ESTRANGEIRAS = {
+    'yourapp.Alternative': {'question': 'yourapp.Question'},
+    'yourapp.CorrectAnswersSources': {'alternative': 'yourapp.Alternative'},
+}
+# Chaves estrangeiras para tabelas fora do fixture (usuários), gravadas como estão
+CHAVES_EXTERNAS = {'submitted_by', 'reviewed_by'}
+# Limite de parâmetros por comando do SQLite (SQLITE_MAX_VARIABLE_NUMBER desde a 3.32)
+LIMITE_PARAMETROS_SQLITE = 32766
+
+ESQUEMA_DJANGO_SQLITE = """
+CREATE TABLE IF NOT EXISTS yourapp_question (
+    id INTEGER PRIMARY KEY,
+    submitted_by_id INTEGER,
+    reviewed_by_id INTEGER,
+    text TEXT NOT NULL,
+    level TEXT,
+    has_answer INTEGER NOT NULL,
+    has_multiple_answers INTEGER,
+    track TEXT,
+    weight TEXT,
+    approved_at TEXT,
+    last_update TEXT
+);
+CREATE TABLE IF NOT EXISTS yourapp_alternative (
+    id INTEGER PRIMARY KEY,
+    question_id INTEGER NOT NULL REFERENCES yourapp_question(id) DEFERRABLE INITIALLY DEFERRED,
+    text TEXT NOT NULL,
+    is_correct INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS yourapp_correctanswerssources (
+    id INTEGER PRIMARY KEY,
+    alternative_id INTEGER NOT NULL REFERENCES yourapp_alternative(id) DEFERRABLE INITIALLY DEFERRED,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS yourapp_alternative_question_id ON yourapp_alternative(question_id);
+CREATE INDEX IF NOT EXISTS yourapp_correctanswerssources_alternative_id ON yourapp_correctanswerssources(alternative_id);
+"""
+
+
+def coluna(campo):
+    """Nome da coluna de um campo no Django (chaves estrangeiras ganham o sufixo _id)"""
+    if campo in CHAVES_EXTERNAS or any(campo in fks for fks in CHAVES_ESTRANGEIRAS.values()):
+        return campo + "_id"
+    return campo
+
+
+def criar_esquema_sqlite(conexao):
+    """Cria, se ainda não existirem, as tabelas dos modelos com o esquema que o Django gera no SQLite"""
+    conexao.executescript(ESQUEMA_DJANGO_SQLITE)
+
+
+class CarregadorBanco:
+    """Carrega um fixture direto nas tabelas do Django, em lotes, sem passar pelo loaddata
+
+    Os objetos são acumulados por tabela e gravados com INSERTs de várias
+    linhas (tamanho_lote linhas por comando), todos em uma única transação.
+    Antes de gravar o lote de uma tabela, os lotes das tabelas que ela
+    referencia são gravados, de modo que as chaves estrangeiras sempre
+    apontam para linhas existentes. As chaves estrangeiras são resolvidas por
+    mapas em memória (pk do fixture -> id no banco); objetos cujo pai não
+    está no fixture são contados como órfãos e não são gravados.
+
+    Com manter_pks=True (padrão) os ids no banco são os pks do fixture, que
+    são estáveis entre execuções, e linhas já existentes são atualizadas
+    (upsert). Com manter_pks=False os ids são atribuídos a partir do maior id
+    de cada tabela, para anexar o fixture a um banco que já tem outras questões.
+    """
+
+    def __init__(self, conexao, tamanho_lote=500, manter_pks=True, marcador='?',
+                 limite_parametros=LIMITE_PARAMETROS_SQLITE):
+        self.conexao = conexao
+        self.manter_pks = manter_pks
+        self.marcador = marcador
+        # Um lote nunca passa do limite de parâmetros por comando do banco
+        self.tamanhos_lote = {
+            modelo: max(1, min(tamanho_lote, limite_parametros // (len(campos) + 1)))
+            for modelo, (_, campos) in MODELOS.items()
+        }
+        self.mapas = {modelo: {} for modelo in MODELOS}
+        self.lotes = {modelo: [] for modelo in MODELOS}
+        self.proximos_ids = {}
+        self.gravadas = Counter()
+        self.orfaos = Counter()
+        self.ignorados = Counter()
+        self.comandos = 0
+
+    def sql_insercao(self, modelo, linhas):
+        tabela, campos = MODELOS[modelo]
+        colunas = ['id'] + [coluna(campo) for campo in campos]
+        linha = "(" + ", ".join([self.marcador] * len(colunas)) + ")"
+        sql = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES " + ", ".join([linha] * linhas)
+        if self.manter_pks:
+            sql += " ON CONFLICT(id) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in colunas[1:])
+        return sql
+
+    def iniciar_ids(self):
+        """Com manter_pks=False, os novos ids começam depois do maior id de cada tabela"""
+        for modelo, (tabela, _) in MODELOS.items():
+            maior = self.conexao.execute(f"SELECT MAX(id) FROM {tabela}").fetchone()[0]
+            self.proximos_ids[modelo] = (maior or 0) + 1
+
+    def adicionar(self, objeto):
+        """Acumula um objeto do fixture no lote da sua tabela"""
+        modelo = objeto['model']
+        if modelo not in MODELOS:
+            self.ignorados[modelo] += 1
+            return
+        campos = objeto['fields']
+        valores = []
+        for campo in MODELOS[modelo][1]:
+            valor = campos.get(campo)
+            referenciado = CHAVES_ESTRANGEIRAS.get(modelo, {}).get(campo)
+            if referenciado is not None:
+                valor = self.mapas[referenciado].get(valor)
+                if valor is None:
+                    self.orfaos[modelo] += 1
+                    return
+            valores.append(valor)
+
+        if self.manter_pks:
+            novo_id = objeto['pk']
+        else:
+            novo_id = self.proximos_ids[modelo]
+            self.proximos_ids[modelo] += 1
+        self.mapas[modelo][objeto['pk']] = novo_id
+
+        lote = self.lotes[modelo]
+        lote.append((novo_id, *valores))
+        if len(lote) >= self.tamanhos_lote[modelo]:
+            self.gravar_lote(modelo)
+
+    def gravar_lote(self, modelo):
+        # Pais primeiro: questões antes das alternativas, alternativas antes das fontes
+        for referenciado in CHAVES_ESTRANGEIRAS.get(modelo, {}).values():
+            self.gravar_lote(referenciado)
+        lote = self.lotes[modelo]
+        if not lote:
+            return
+        self.conexao.execute(self.sql_insercao(modelo, len(lote)), [valor for linha in lote for valor in linha])
+        self.comandos += 1
+        self.gravadas[modelo] += len(lote)
+        self.lotes[modelo] = []
+
+    def carregar(self, objetos):
+        """Grava todos os objetos em uma única transação; desfaz tudo se algo falhar"""
+        try:
+            if not self.manter_pks:
+                self.iniciar_ids()
+            for objeto in objetos:
+                self.adicionar(objeto)
+            for modelo in MODELOS:
+                self.gravar_lote(modelo)
+            self.conexao.commit()
+        except Exception:
+            self.conexao.rollback()
+            raise
+        return self.gravadas
+
+
+def carregar_fixture(caminho_fixture, caminho_banco, tamanho_lote=500, manter_pks=True):
+    """Carrega um fixture em um banco SQLite com as tabelas do Django (criadas se não existirem)"""
+    conexao = sqlite3.connect(caminho_banco)
+    try:
+        conexao.execute("PRAGMA foreign_keys = ON")
+        criar_esquema_sqlite(conexao)
+        carregador = CarregadorBanco(conexao, tamanho_lote, manter_pks)
+        inicio = time.perf_counter()
+        carregador.carregar(iterar_objetos_fixture(caminho_fixture))
+        tempo = time.perf_counter() - inicio
+    finally:
+        conexao.close()
+
+    total = sum(carregador.gravadas.values())
+    print(f"💾 {total} objetos carregados em {caminho_banco} em {tempo:.2f} s "
+          f"({total / tempo if tempo else 0:.0f} objetos/s, {carregador.comandos} comandos)")
+    for modelo in MODELOS:
+        print(f"   - {modelo}: {carregador.gravadas[modelo]}")
+    if carregador.orfaos:
+        print(f"   ⚠️ Órfãos não carregados: {dict(carregador.orfaos)}")
+    return carregador
+
+
+def main():
+    """Carrega o fixture unificado direto no banco: python carregador_banco.py fixture.json banco.sqlite3"""
+    parser = argparse.ArgumentParser(description="Carrega um fixture nas tabelas do Django com inserções em lote")
+    parser.add_argument("fixture")
+    parser.add_argument("banco", help="banco SQLite de destino")
+    parser.add_argument("--lote", type=int, default=500, help="linhas por INSERT")
+    parser.add_argument("--novos-ids", action="store_true",
+                        help="atribui ids a partir do maior id de cada tabela em vez de usar os pks do fixture")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fixture):
+        print(f"❌ Arquivo não encontrado: {args.fixture}")
+        return
+    carregar_fixture(args.fixture, args.banco, args.lote, manter_pks=not args.novos_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import glob
+import hashlib
+import os
+
+# Lado do dHash: 32 -> 1024 bits. As imagens são telas de questões com o mesmo layout,
+# e com o dHash usual de 8 (64 bits) questões diferentes do banco ficam a 1-2 bits
+# uma da outra; com 32, a 9 bits ou mais.
+TAMANHO_HASH = 32
+# Distância de Hamming máxima (em bits) entre duas imagens consideradas a mesma
+DISTANCIA_MAXIMA = 4
+# Diferença relativa máxima entre larguras (e entre alturas) de duas imagens iguais
+TOLERANCIA_DIMENSOES = 0.02
+
+
+def hash_conteudo_imagem(caminho):
+    """SHA-256 dos bytes do arquivo (imagens idênticas byte a byte)"""
+    with open(caminho, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def dhash(caminho, tamanho=TAMANHO_HASH):
+    """dHash da imagem (inteiro de tamanho*tamanho bits) e as dimensões originais
+
+    A imagem vai para tons de cinza e é reduzida a (tamanho+1) x tamanho; cada
+    bit diz se um pixel é mais claro que o vizinho da direita.
+    """
+    from PIL import Image, ImageOps
+    with Image.open(caminho) as imagem:
+        dimensoes = imagem.size
+        pequena = ImageOps.grayscale(imagem).resize((tamanho + 1, tamanho), Image.LANCZOS)
+    pixels = list(pequena.getdata())
+    valor = 0
+    for linha in range(tamanho):
+        inicio = linha * (tamanho + 1)
+        for coluna in range(tamanho):
+            valor = (valor << 1) | (pixels[inicio + coluna + 1] > pixels[inicio + coluna])
+    return valor, dimensoes
+
+
+def distancia_hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def dimensoes_compativeis(a, b, tolerancia=TOLERANCIA_DIMENSOES):
+    return all(abs(x - y) <= tolerancia * max(x, y) for x, y in zip(a, b))
+
+
+class IndiceImagens:
+    """Encontra imagens repetidas ou quase idênticas (dHash) em tempo aproximadamente linear
+
+    Imagens idênticas byte a byte são reconhecidas pelo SHA-256, sem Pillow.
+    Para as demais, o dHash é dividido em distancia_maxima + 1 bandas: duas
+    imagens a até distancia_maxima bits diferem em no máximo distancia_maxima
+    bandas, então coincidem em ao menos uma, e só as imagens que coincidem em
+    alguma banda são comparadas bit a bit. Dimensões muito diferentes nunca
+    são a mesma imagem. Se o Pillow não estiver instalado, só as cópias exatas
+    são encontradas.
+    """
+
+    def __init__(self, distancia_maxima=DISTANCIA_MAXIMA, tamanho_hash=TAMANHO_HASH):
+        self.distancia_maxima = distancia_maxima
+        self.tamanho_hash = tamanho_hash
+        total_bits = tamanho_hash * tamanho_hash
+        bandas = distancia_maxima + 1
+        limites = [total_bits * banda // bandas for banda in range(bandas + 1)]
+        self.bandas = [(limites[i], limites[i + 1] - limites[i]) for i in range(bandas)]
+        self.tabelas = [{} for _ in self.bandas]
+        self.exatos = {}
+        # (número, dHash, dimensões) das imagens indexadas por dHash
+        self.imagens = []
+        self.perceptual = True
+        self.comparacoes = 0
+
+    def _chaves(self, valor):
+        return [(valor >> deslocamento) & ((1 << bits) - 1) for deslocamento, bits in self.bandas]
+
+    def _dhash(self, caminho):
+        if not self.perceptual:
+            return None
+        try:
+            return dhash(caminho, self.tamanho_hash)
+        except ImportError:
+            print("⚠️ Pillow não instalado; apenas imagens idênticas byte a byte serão agrupadas")
+            self.perceptual = False
+        except Exception as e:
+            print(f"  ⚠️ dHash indisponível para {os.path.basename(caminho)}: {e}")
+        return None
+
+    def procurar_ou_adicionar(self, caminho, numero):
+        """(número da imagem original, distância) se a imagem repete uma já indexada; senão indexa e retorna (None, None)"""
+        conteudo = hash_conteudo_imagem(caminho)
+        if conteudo in self.exatos:
+            return self.exatos[conteudo], 0
+        self.exatos[conteudo] = numero
+
+        resultado = self._dhash(caminho)
+        if resultado is None:
+            return None, None
+        valor, dimensoes = resultado
+        chaves = self._chaves(valor)
+
+        melhor, melhor_distancia = None, None
+        vistas = set()
+        for tabela, chave in zip(self.tabelas, chaves):
+            for entrada in tabela.get(chave, ()):
+                if entrada in vistas:
+                    continue
+                vistas.add(entrada)
+                self.comparacoes += 1
+                outro_numero, outro_valor, outras_dimensoes = self.imagens[entrada]
+                if not dimensoes_compativeis(dimensoes, outras_dimensoes):
+                    continue
+                distancia = distancia_hamming(valor, outro_valor)
+                if distancia <= self.distancia_maxima and (melhor is None or distancia < melhor_distancia):
+                    melhor, melhor_distancia = outro_numero, distancia
+        if melhor is not None:
+            # Repetições apontam sempre para a primeira imagem, que é a única processada
+            self.exatos[conteudo] = melhor
+            return melhor, melhor_distancia
+
+        entrada = len(self.imagens)
+        self.imagens.append((numero, valor, dimensoes))
+        for tabela, chave in zip(self.tabelas, chaves):
+            tabela.setdefault(chave, []).append(entrada)
+        return None, None
+
+
+def agrupar_imagens(imagens, indice=None):
+    """Mapa número da imagem repetida -> (número da original, distância) para a lista de imagens extraídas"""
+    indice = indice or IndiceImagens()
+    duplicatas = {}
+    for imagem_info in imagens:
+        original, distancia = indice.procurar_ou_adicionar(imagem_info['caminho'], imagem_info['numero'])
+        if original is not None:
+            duplicatas[imagem_info['numero']] = (original, distancia)
+    return duplicatas
+
+
+def main():
+    """Lista as imagens repetidas de uma pasta: python deduplicacao_imagens.py pasta_imagens [--distancia 4]"""
+    parser = argparse.ArgumentParser(description="Agrupa imagens de questões repetidas ou quase idênticas")
+    parser.add_argument("pasta")
+    parser.add_argument("--distancia", type=int, default=DISTANCIA_MAXIMA,
+                        help="distância de Hamming máxima do dHash")
+    args = parser.parse_args()
+
+    caminhos = sorted(glob.glob(os.path.join(args.pasta, "questao_*.*")))
+    imagens = [{'caminho': caminho, 'numero': numero} for numero, caminho in enumerate(caminhos, 1)]
+    indice = IndiceImagens(args.distancia)
+    duplicatas = agrupar_imagens(imagens, indice)
+    for numero, (original, distancia) in sorted(duplicatas.items()):
+        print(f"  🔁 {os.path.basename(caminhos[numero - 1])} -> {os.path.basename(caminhos[original - 1])} "
+              f"(distância {distancia})")
+    print(f"📊 {len(duplicatas)} de {len(imagens)} imagens repetem outra ({indice.comparacoes} comparações)")
+
+
+if __name__ == "__main__":
+    main()
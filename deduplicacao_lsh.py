@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import unicodedata
+import zlib
+from array import array
+
+# "21. ", "58) ", "Questão 7 - ", "Q12: " no início do enunciado
+PREFIXO_NUMERACAO = re.compile(r'^(?:quest(?:ao|ion)|q)?\s*\d+\s*[.)\-:]+\s*')
+NAO_ALFANUMERICO = re.compile(r'[^\w\s]')
+VALOR_VAZIO = 0xFFFFFFFF
+
+# Palavras que invertem o sentido de um enunciado: questões que diferem nelas não são duplicatas
+PALAVRAS_CRITICAS = frozenset([
+    'not', 'no', 'true', 'false', 'correct', 'incorrect', 'except', 'never', 'always', 'only',
+    'nao', 'verdadeira', 'verdadeiras', 'verdadeiro', 'falsa', 'falsas', 'falso', 'correta', 'corretas',
+    'correto', 'incorreta', 'incorretas', 'incorreto', 'exceto', 'nunca', 'sempre', 'apenas'
+])
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sem acentos, sem numeração inicial, sem pontuação e com espaços simples"""
+    texto = texto or ''
+    if not texto.isascii():
+        texto = unicodedata.normalize('NFKD', texto)
+        texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = texto.lower().strip()
+    texto = PREFIXO_NUMERACAO.sub('', texto)
+    texto = NAO_ALFANUMERICO.sub(' ', texto)
+    return ' '.join(texto.split())
+
+
+def shingles(texto_normalizado, tamanho=5):
+    """Hashes (CRC32) ordenados dos trechos de tamanho caracteres do texto normalizado"""
+    dados = texto_normalizado.encode('utf-8')
+    if len(dados) <= tamanho:
+        return array('I', [zlib.crc32(dados)] if dados else [])
+    return array('I', sorted({zlib.crc32(dados[i:i + tamanho]) for i in range(len(dados) - tamanho + 1)}))
+
+
+def marcadores(texto_normalizado):
+    """Palavras críticas e números do texto normalizado"""
+    return frozenset(
+        palavra for palavra in texto_normalizado.split()
+        if palavra in PALAVRAS_CRITICAS or palavra.isdigit()
+    )
+
+
+def jaccard(a, b):
+    """Similaridade de Jaccard entre dois conjuntos de shingles (a pode ser um set já montado)"""
+    if not a and not b:
+        return 1.0
+    a = a if isinstance(a, (set, frozenset)) else set(a)
+    intersecao = len(a.intersection(b))
+    return intersecao / (len(a) + len(b) - intersecao)
+
+
+def assinatura_minhash(hashes, num_permutacoes):
+    """Assinatura MinHash de permutação única com densificação por rotação
+
+    Cada shingle é distribuído em um dos num_permutacoes compartimentos pelo
+    seu hash, e cada compartimento guarda o menor valor recebido; assim a
+    assinatura custa uma passada sobre os shingles, em vez de uma por
+    permutação. Compartimentos vazios copiam o próximo preenchido (com um
+    deslocamento pela distância), o que mantém a estimativa de Jaccard.
+    """
+    assinatura = [VALOR_VAZIO] * num_permutacoes
+    for h in hashes:
+        compartimento, valor = h % num_permutacoes, h // num_permutacoes
+        if valor < assinatura[compartimento]:
+            assinatura[compartimento] = valor
+
+    if len(hashes) < num_permutacoes:
+        preenchidos = [i for i, valor in enumerate(assinatura) if valor != VALOR_VAZIO]
+        if preenchidos:
+            densificada = list(assinatura)
+            for i in range(num_permutacoes):
+                if assinatura[i] == VALOR_VAZIO:
+                    distancia = 1
+                    while assinatura[(i + distancia) % num_permutacoes] == VALOR_VAZIO:
+                        distancia += 1
+                    densificada[i] = assinatura[(i + distancia) % num_permutacoes] + distancia * (VALOR_VAZIO + 1)
+            assinatura = densificada
+    return assinatura
+
+
+class IndiceDuplicatas:
+    """Índice LSH para encontrar questões quase duplicadas em tempo aproximadamente linear
+
+    Os enunciados são normalizados (numeração, acentos, pontuação e espaços)
+    e quebrados em shingles de caracteres. A assinatura MinHash é dividida em
+    bandas; questões que coincidem em alguma banda são candidatas e só então
+    comparadas pelo Jaccard exato dos enunciados. As variantes descartadas
+    também são indexadas, apontando para a questão mantida, para que
+    duplicatas de uma variante sejam reconhecidas. Uma candidata é duplicata se
+    a similaridade dos enunciados atinge limiar_enunciado, a das alternativas
+    atinge limiar_alternativas e os enunciados têm as mesmas palavras críticas
+    e números (o que separa questões que só compartilham um preâmbulo longo,
+    um enunciado genérico ou que diferem por uma negação).
+    """
+
+    def __init__(self, limiar_enunciado=0.85, limiar_alternativas=0.5, num_permutacoes=128, bandas=16,
+                 tamanho_shingle=5):
+        if num_permutacoes % bandas:
+            raise ValueError("num_permutacoes deve ser múltiplo de bandas")
+        self.limiar_enunciado = limiar_enunciado
+        self.limiar_alternativas = limiar_alternativas
+        self.num_permutacoes = num_permutacoes
+        self.bandas = bandas
+        self.linhas = num_permutacoes // bandas
+        self.tamanho_shingle = tamanho_shingle
+
+        self.tabelas = [{} for _ in range(bandas)]
+        self.exatos = {}
+        self.shingles_enunciados = []
+        self.shingles_alternativas = []
+        self.marcadores = []
+        self.representantes = []
+        self.total_mantidas = 0
+        self.comparacoes = 0
+
+    def __len__(self):
+        return self.total_mantidas
+
+    def impressao(self, questao):
+        """Texto normalizado, shingles do enunciado e das alternativas e palavras críticas"""
+        enunciado = normalizar_texto(questao['enunciado'])
+        alternativas = ' '.join(sorted(
+            normalizar_texto(alternativa['texto']) for alternativa in questao['alternativas'].values()
+        ))
+        return (
+            enunciado + '\0' + alternativas,
+            shingles(enunciado, self.tamanho_shingle),
+            shingles(alternativas, self.tamanho_shingle),
+            marcadores(enunciado)
+        )
+
+    def _chaves_bandas(self, hashes):
+        assinatura = assinatura_minhash(hashes, self.num_permutacoes)
+        return [
+            hash(tuple(assinatura[banda * self.linhas:(banda + 1) * self.linhas]))
+            for banda in range(self.bandas)
+        ]
+
+    def _indexar(self, texto, enunciado, alternativas, criticas, chaves, representante):
+        entrada = len(self.representantes)
+        self.shingles_enunciados.append(enunciado)
+        self.shingles_alternativas.append(alternativas)
+        self.marcadores.append(criticas)
+        self.representantes.append(representante)
+        self.exatos[texto] = representante
+        for tabela, chave in zip(self.tabelas, chaves):
+            tabela.setdefault(chave, []).append(entrada)
+
+    def procurar_ou_adicionar(self, questao):
+        """Procura uma duplicata da questão; se não houver, indexa a questão
+
+        Retorna (posicao, similaridade): a posição da questão mantida e a
+        similaridade dos enunciados quando é uma duplicata, ou a posição recém
+        atribuída e None quando a questão é nova. As posições são atribuídas
+        em sequência (0, 1, 2...) às questões mantidas.
+        """
+        texto, enunciado, alternativas, criticas = self.impressao(questao)
+
+        if texto in self.exatos:
+            return self.exatos[texto], 1.0
+
+        chaves = self._chaves_bandas(enunciado) if enunciado else []
+        consulta = set(enunciado)
+        melhor, melhor_similaridade = None, 0.0
+        vistas = set()
+        for tabela, chave in zip(self.tabelas, chaves):
+            for entrada in tabela.get(chave, ()):
+                if entrada in vistas:
+                    continue
+                vistas.add(entrada)
+                self.comparacoes += 1
+
+                if criticas != self.marcadores[entrada]:
+                    continue
+                outro = self.shingles_enunciados[entrada]
+                # Jaccard nunca passa da razão entre os tamanhos dos conjuntos
+                if min(len(consulta), len(outro)) < self.limiar_enunciado * max(len(consulta), len(outro)):
+                    continue
+                similaridade = jaccard(consulta, outro)
+                if similaridade < self.limiar_enunciado or similaridade <= melhor_similaridade:
+                    continue
+                outras = self.shingles_alternativas[entrada]
+                if alternativas and outras and jaccard(alternativas, outras) < self.limiar_alternativas:
+                    continue
+                melhor, melhor_similaridade = entrada, similaridade
+
+        if melhor is not None:
+            representante = self.representantes[melhor]
+            self._indexar(texto, enunciado, alternativas, criticas, chaves, representante)
+            return representante, melhor_similaridade
+
+        posicao = self.total_mantidas
+        self.total_mantidas += 1
+        self._indexar(texto, enunciado, alternativas, criticas, chaves, posicao)
+        return posicao, None
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+NOME_DIARIO = "CHECKPOINT.jsonl"
+
+
+def hash_resposta(texto):
+    return hashlib.sha256((texto or "").encode('utf-8')).hexdigest()
+
+
+class DiarioCheckpoint:
+    """Diário de checkpoint só de acréscimo (JSONL): uma linha por resultado de imagem
+
+    Cada linha guarda o número da imagem, o status, a origem da transcrição,
+    o hash da resposta bruta e a questão já interpretada, de modo que retomar
+    o processamento é uma única leitura sequencial, sem reinterpretar as
+    respostas. Um novo registro do mesmo número substitui o anterior; o campo
+    tentativas conta as tentativas seguidas sem 'ok' daquela imagem.
+
+    Cada registro é gravado com um único write() seguido de flush; o fsync é
+    feito em lotes (a cada lote_fsync registros ou intervalo_fsync segundos, e
+    ao fechar), de modo que uma queda do sistema perde no máximo o último
+    lote. Uma linha sem o \\n final é a marca de uma gravação interrompida: ao
+    abrir o diário ela é descartada e o arquivo é truncado no último registro
+    completo. Linhas completas ilegíveis são ignoradas.
+    """
+
+    def __init__(self, caminho, lote_fsync=8, intervalo_fsync=2.0):
+        self.caminho = caminho
+        self.lote_fsync = lote_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self.registros = {}
+        self.linhas = 0
+        self.ignoradas = 0
+        self.truncado = 0
+        self.pendentes = 0
+        self.ultimo_fsync = time.monotonic()
+        existia = os.path.exists(caminho)
+        if existia:
+            self.carregar()
+        self.existia = existia
+        self.arquivo = open(caminho, 'ab')
+
+    def carregar(self):
+        """Lê o diário em uma passada e trunca uma última linha incompleta"""
+        fim_valido = 0
+        with open(self.caminho, 'rb') as f:
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                fim_valido += len(linha)
+                try:
+                    registro = json.loads(linha)
+                    self.registros[registro['numero']] = registro
+                    self.linhas += 1
+                except (ValueError, KeyError, TypeError):
+                    self.ignoradas += 1
+            f.seek(0, os.SEEK_END)
+            tamanho = f.tell()
+        if tamanho > fim_valido:
+            self.truncado = tamanho - fim_valido
+            with open(self.caminho, 'r+b') as f:
+                f.truncate(fim_valido)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreamento):
+        self.fechar()
+        return False
+
+    def registrar(self, numero, status, texto_resposta, questao=None, origem=""):
+        anterior = self.registros.get(numero)
+        tentativas = anterior.get('tentativas', 1) + 1 if anterior and anterior['status'] != 'ok' else 1
+        registro = {
+            'numero': numero,
+            'status': status,
+            'tentativas': tentativas,
+            'origem': origem,
+            'hash_resposta': hash_resposta(texto_resposta),
+            'registrado_em': datetime.now().isoformat(timespec='seconds'),
+            'questao': questao
+        }
+        linha = json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + "\n"
+        self.arquivo.write(linha.encode('utf-8'))
+        self.arquivo.flush()
+        self.registros[numero] = registro
+        self.linhas += 1
+        self.pendentes += 1
+        if self.pendentes >= self.lote_fsync or time.monotonic() - self.ultimo_fsync >= self.intervalo_fsync:
+            self.sincronizar()
+        return registro
+
+    def sincronizar(self):
+        if self.pendentes:
+            os.fsync(self.arquivo.fileno())
+            self.pendentes = 0
+        self.ultimo_fsync = time.monotonic()
+
+    def fechar(self):
+        if not self.arquivo.closed:
+            self.sincronizar()
+            self.arquivo.close()
+
+    def numeros(self, status='ok'):
+        """Números das imagens cujo último registro tem o status, em ordem"""
+        return sorted(numero for numero, registro in self.registros.items() if registro['status'] == status)
+
+    def questoes(self, status='ok'):
+        """Questões interpretadas dos registros com o status, na ordem das imagens"""
+        return [
+            self.registros[numero]['questao'] for numero in self.numeros(status)
+            if self.registros[numero]['questao']
+        ]
+
+    def compactar(self):
+        """Reescreve o diário com apenas o último registro de cada imagem (troca atômica)"""
+        self.fechar()
+        caminho_temporario = self.caminho + ".tmp"
+        with open(caminho_temporario, 'wb') as f:
+            for numero in sorted(self.registros):
+                linha = json.dumps(self.registros[numero], ensure_ascii=False, separators=(',', ':')) + "\n"
+                f.write(linha.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(caminho_temporario, self.caminho)
+        self.linhas = len(self.registros)
+        self.arquivo = open(self.caminho, 'ab')
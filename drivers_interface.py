@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+import random
+import time
+from collections import Counter
+from espera_eventos import EsperaEventos, capturar_regiao_pyautogui
+
+# Regiões (x, y, largura, altura) observadas pelas esperas por eventos
+REGIOES_PADRAO = {
+    'janela': (2900, 340, 950, 600),
+    'resposta': (3100, 440, 720, 480)
+}
+
+
+class DriverInterface:
+    """Interface dos backends que operam a janela do Copilot
+
+    Os backends implementam as primitivas (_clicar, _digitar, _atalho,
+    copiar_para_area_transferencia, ler_area_transferencia e capturar); as
+    operações usadas pelos extratores (clicar, colar, copiar_resposta,
+    limpar_chat...) são montadas aqui sobre elas e sobre as esperas por eventos.
+    Os alvos dos cliques são nomes de self.coordenadas ('enviar_mensagem',
+    'copiar_resposta'...), o que permite a um simulador saber o que cada clique faz.
+    acoes conta as operações feitas, para benchmarks.
+    """
+
+    def __init__(self, coordenadas=None, regioes=None, relogio=time.monotonic, dormir=time.sleep):
+        self.coordenadas = dict(coordenadas or {})
+        self.regioes = dict(regioes or REGIOES_PADRAO)
+        self.espera = EsperaEventos(self.capturar, self.ler_area_transferencia, relogio=relogio, dormir=dormir)
+        self.acoes = Counter()
+
+    def usar_coordenadas(self, coordenadas):
+        self.coordenadas.update(coordenadas)
+
+    def verificar(self):
+        """True se o backend pode ser usado neste ambiente"""
+        return True
+
+    def _clicar(self, alvo, coordenada, duplo_clique=False):
+        raise NotImplementedError
+
+    def _digitar(self, texto):
+        raise NotImplementedError
+
+    def _atalho(self, *teclas):
+        raise NotImplementedError
+
+    def copiar_para_area_transferencia(self, texto):
+        raise NotImplementedError
+
+    def ler_area_transferencia(self):
+        raise NotImplementedError
+
+    def capturar(self, regiao):
+        raise NotImplementedError
+
+    def dormir(self, segundos):
+        self.espera.dormir(segundos)
+
+    def agora(self):
+        return self.espera.relogio()
+
+    def clicar(self, alvo, descricao="", duplo_clique=False, espera=1, estabilidade=0.3, timeout=10):
+        """Clica no alvo e espera a janela reagir e parar de mudar (espera s fixos se a tela não puder ser observada)"""
+        coordenada = self.coordenadas[alvo]
+        print(f"  🖱️ Clicando em {descricao or alvo}: {coordenada}")
+        self.acoes['clique'] += 1
+        referencia = self.espera.observar(self.regioes['janela'])
+        self._clicar(alvo, coordenada, duplo_clique)
+        self.espera.aguardar_reacao(
+            self.regioes['janela'], espera, estabilidade=estabilidade, timeout=timeout,
+            descricao=descricao or alvo, referencia=referencia
+        )
+
+    def digitar(self, texto, descricao=""):
+        """Digita texto no campo atual"""
+        print(f"  ⌨️ Digitando {descricao}: {texto}")
+        self.acoes['digitacao'] += 1
+        self._digitar(texto)
+        self.espera.aguardar_reacao(self.regioes['janela'], 1, descricao=descricao)
+
+    def colar(self, texto, descricao=""):
+        """Copia texto para a área de transferência e cola no campo atual"""
+        print(f"  📋 Colando {descricao} ({len(texto)} caracteres)")
+        self.acoes['colagem'] += 1
+        self.copiar_para_area_transferencia(texto)
+        referencia = self.espera.observar(self.regioes['janela'])
+        self._atalho('ctrl', 'v')
+        self.espera.aguardar_reacao(self.regioes['janela'], 1, descricao=descricao, referencia=referencia)
+
+    def aguardar_resposta(self, timeout, fallback):
+        """Espera a resposta começar e parar de mudar na tela; False se ainda mudava no timeout"""
+        self.acoes['resposta'] += 1
+        return self.espera.aguardar_resposta(self.regioes['resposta'], timeout=timeout, fallback=fallback)
+
+    def copiar_resposta(self, alvo='copiar_resposta', timeout=10, fallback=2, confirmacao=5.0, limite_confirmacao=120):
+        """Clica em copiar e devolve o texto copiado, ou None se ele não pôde ser confirmado
+
+        Uma resposta que pausou no meio da geração parece pronta na tela. Por
+        isso a cópia é refeita depois de confirmacao segundos e só é aceita
+        quando duas cópias seguidas, não vazias, são iguais; uma cópia de
+        conferência vazia é refeita. Sem confirmação em limite_confirmacao s,
+        ou se a área de transferência não mudou, retorna None e a imagem volta
+        para a fila. confirmacao=0 aceita a primeira cópia.
+        """
+        try:
+            anterior = self.ler_area_transferencia()
+        except Exception:
+            anterior = None
+        self.clicar(alvo, "Copiar resposta")
+        texto = self.espera.aguardar_area_transferencia(anterior, timeout=timeout, fallback=fallback)
+        if texto == anterior:
+            print("  ⚠️ A área de transferência não mudou; a resposta não foi copiada")
+            self.acoes['copia_sem_mudanca'] += 1
+            return None
+
+        inicio = self.agora()
+        confirmada = not confirmacao
+        while not confirmada and self.agora() - inicio < limite_confirmacao:
+            self.dormir(confirmacao)
+            # Esvaziar antes de copiar de novo, para a nova cópia ser notada mesmo se for igual
+            self.copiar_para_area_transferencia("")
+            self.clicar(alvo, "Conferir resposta copiada")
+            conferencia = self.espera.aguardar_area_transferencia("", timeout=timeout, fallback=fallback)
+            if not conferencia:
+                print("  ⚠️ A cópia de conferência não chegou; copiando de novo")
+                self.acoes['conferencia_vazia'] += 1
+            elif conferencia == texto:
+                confirmada = True
+            else:
+                print(f"  ⚠️ A resposta ainda estava sendo escrita ({len(texto)} -> {len(conferencia)} caracteres); "
+                      f"conferindo de novo")
+                self.acoes['copia_refeita'] += 1
+                texto = conferencia
+
+        if not confirmada:
+            print(f"  ⚠️ A resposta não se confirmou em {limite_confirmacao} s; a imagem volta para a fila")
+            self.acoes['copia_nao_confirmada'] += 1
+            return None
+        return texto
+
+    def copiar_tudo(self):
+        """Seleciona tudo e copia (método alternativo se copiar_resposta falhar)"""
+        self._atalho('ctrl', 'a')
+        self.dormir(1)
+        self._atalho('ctrl', 'c')
+        self.dormir(1)
+        return self.ler_area_transferencia()
+
+    def limpar_chat(self):
+        """Exclui a conversa atual para a próxima começar vazia"""
+        self.acoes['limpeza'] += 1
+        self.clicar('icone_chat', "Ícone do chat", espera=2)
+        self.clicar('excluir_chat', "Excluir chat", espera=2)
+        self.clicar('confirmar_exclusao', "Confirmar exclusão", espera=3)
+
+
+class DriverPyAutoGUI(DriverInterface):
+    """Backend real: mouse, teclado e tela via pyautogui e área de transferência via pyperclip
+
+    As bibliotecas só são importadas no primeiro uso, de modo que os
+    extratores podem ser importados (e simulados) sem uma área de trabalho.
+    """
+
+    def verificar(self):
+        try:
+            import pyautogui
+            import pyperclip
+            print("✅ PyAutoGUI e PyPerClip encontrados")
+            return True
+        except ImportError as e:
+            print(f"❌ Dependências não encontradas: {e}")
+            print("Instale com: pip install pyautogui pyperclip")
+            return False
+
+    def _clicar(self, alvo, coordenada, duplo_clique=False):
+        import pyautogui
+        x, y = coordenada
+        pyautogui.moveTo(x, y, duration=0.5)
+        time.sleep(0.5)
+        if duplo_clique:
+            pyautogui.doubleClick()
+        else:
+            pyautogui.click()
+
+    def _digitar(self, texto):
+        import pyautogui
+        pyautogui.write(texto, interval=0.05)
+
+    def _atalho(self, *teclas):
+        import pyautogui
+        pyautogui.hotkey(*teclas)
+
+    def copiar_para_area_transferencia(self, texto):
+        import pyperclip
+        pyperclip.copy(texto)
+        time.sleep(0.5)
+
+    def ler_area_transferencia(self):
+        import pyperclip
+        return pyperclip.paste()
+
+    def capturar(self, regiao):
+        return capturar_regiao_pyautogui(regiao)
+
+
+def carregar_respostas(pasta_respostas):
+    """Textos das respostas salvas em respostas_intermediarias/resposta_questao_*.txt, sem o cabeçalho"""
+    respostas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta_respostas, "resposta_questao_*.txt"))):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            texto = f.read()
+        _, separador, corpo = texto.partition("=" * 50 + "\n\n")
+        respostas.append(corpo if separador else texto)
+    return respostas
+
+
+class DriverSimulado(DriverInterface):
+    """Backend determinístico que simula o Copilot, para medir o pipeline sem área de trabalho
+
+    Roda em tempo simulado: dormir apenas avança o relógio, então uma
+    execução de horas simuladas leva segundos. Cada mensagem enviada
+    ('enviar_mensagem') recebe a próxima resposta de respostas (em ciclo),
+    que começa a aparecer depois de 15% da latência e é "digitada" na tela
+    até o fim da latência, sorteada entre latencia[0] e latencia[1] segundos.
+    'copiar_resposta' copia o que estiver visível (uma cópia antecipada sai
+    truncada), 'confirmar_exclusao' limpa a conversa e qualquer outro clique
+    muda a tela. Com as taxas de falha, uma cópia pode não chegar à área de
+    transferência ou a resposta pode vir vazia. atraso_inicio soma segundos
+    antes do início da resposta e pausa=(fração, segundos) para a geração
+    naquele ponto do texto, como um Copilot lento. Com tela_observavel=False a
+    captura de tela falha, como em uma sessão sem acesso à tela, e as esperas
+    usam os tempos fixos. A mesma semente reproduz a mesma execução.
+    """
+
+    def __init__(self, respostas, latencia=(8.0, 30.0), taxa_falha_copia=0.0, taxa_resposta_vazia=0.0,
+                 latencia_acao=1.0, tela_observavel=True, semente=0, coordenadas=None,
+                 atraso_inicio=0.0, pausa=(0.0, 0.0)):
+        self.tempo = 0.0
+        super().__init__(coordenadas, relogio=lambda: self.tempo, dormir=self._avancar)
+        self.respostas = list(respostas) or [""]
+        self.latencia = latencia
+        self.taxa_falha_copia = taxa_falha_copia
+        self.taxa_resposta_vazia = taxa_resposta_vazia
+        self.latencia_acao = latencia_acao
+        self.tela_observavel = tela_observavel
+        self.atraso_inicio = atraso_inicio
+        self.pausa = pausa
+        self.aleatorio = random.Random(semente)
+        self.area_transferencia = ""
+        self.campo_prompt = ""
+        self.versao_tela = 0
+        self.mensagens = 0
+        # (texto, início da geração, fim da geração, início da pausa, duração da pausa) da resposta na tela
+        self.resposta_atual = None
+        self.falhas = Counter()
+        # Mensagem -> a última cópia da resposta dela saiu truncada
+        self.copias_truncadas = {}
+
+    def _avancar(self, segundos):
+        self.tempo += segundos
+
+    def respostas_truncadas(self):
+        """Quantas respostas ficaram com uma cópia truncada como última cópia"""
+        return sum(self.copias_truncadas.values())
+
+    def texto_visivel(self):
+        if self.resposta_atual is None:
+            return ""
+        texto, inicio, fim, inicio_pausa, duracao_pausa = self.resposta_atual
+        if self.tempo >= fim:
+            return texto
+        if self.tempo <= inicio:
+            return ""
+        decorrido = self.tempo - inicio
+        if decorrido > inicio_pausa:
+            decorrido = max(inicio_pausa, decorrido - duracao_pausa)
+        return texto[:int(len(texto) * decorrido / (fim - inicio - duracao_pausa))]
+
+    def _enviar(self):
+        texto = self.respostas[self.mensagens % len(self.respostas)]
+        self.mensagens += 1
+        if self.aleatorio.random() < self.taxa_resposta_vazia:
+            self.falhas['resposta_vazia'] += 1
+            texto = ""
+        latencia = self.aleatorio.uniform(*self.latencia)
+        inicio = self.tempo + 0.15 * latencia + self.atraso_inicio
+        fracao_pausa, duracao_pausa = self.pausa
+        self.resposta_atual = (
+            texto, inicio, inicio + 0.85 * latencia + duracao_pausa, fracao_pausa * 0.85 * latencia, duracao_pausa
+        )
+        self.campo_prompt = ""
+
+    def _clicar(self, alvo, coordenada, duplo_clique=False):
+        self._avancar(self.latencia_acao)
+        self.versao_tela += 1
+        if alvo == 'enviar_mensagem':
+            self._enviar()
+        elif alvo == 'copiar_resposta':
+            if self.aleatorio.random() < self.taxa_falha_copia:
+                self.falhas['copia_perdida'] += 1
+            else:
+                self.area_transferencia = self.texto_visivel()
+                if self.resposta_atual is not None:
+                    # Vale a última cópia de cada mensagem: uma cópia conferida substitui a anterior
+                    self.copias_truncadas[self.mensagens] = self.area_transferencia != self.resposta_atual[0]
+        elif alvo == 'confirmar_exclusao':
+            self.resposta_atual = None
+
+    def _digitar(self, texto):
+        self._avancar(0.05 * len(texto))
+        self.campo_prompt += texto
+        self.versao_tela += 1
+
+    def _atalho(self, *teclas):
+        if teclas == ('ctrl', 'v'):
+            self.campo_prompt += self.area_transferencia
+        elif teclas == ('ctrl', 'c'):
+            self.area_transferencia = self.texto_visivel()
+        self.versao_tela += 1
+
+    def copiar_para_area_transferencia(self, texto):
+        self.area_transferencia = texto
+
+    def ler_area_transferencia(self):
+        return self.area_transferencia
+
+    def capturar(self, regiao):
+        if not self.tela_observavel:
+            raise OSError("tela indisponível na simulação")
+        return (self.versao_tela, len(self.texto_visivel()))
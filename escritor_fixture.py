@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from estatisticas_fixture import EstatisticasFixture
+
+TAMANHO_BLOCO_COPIA = 1024 * 1024
+
+
+def serializar_objeto(objeto, compacto=False):
+    """Texto de um objeto como elemento do array do fixture
+
+    No modo normal reproduz json.dump(lista, indent=2): o objeto é indentado
+    com 2 espaços a mais. No modo compacto o objeto ocupa uma única linha.
+    """
+    if compacto:
+        return json.dumps(objeto, ensure_ascii=False, separators=(',', ':'))
+    return "  " + json.dumps(objeto, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+
+class EscritorFixture:
+    """Grava um fixture Django objeto a objeto, sem montar a lista em memória
+
+    Os objetos vão para um arquivo temporário ao lado do destino, que só
+    substitui o fixture (os.replace) em concluir(); se a gravação for
+    interrompida, o fixture anterior continua intacto. Cada objeto gravado
+    passa por self.estatisticas (EstatisticasFixture), de modo que contagens e
+    relatórios não exigem uma nova leitura do fixture. Com compacto=False a
+    saída é idêntica à de json.dump(objetos, f, ensure_ascii=False, indent=2);
+    com compacto=True cada objeto ocupa uma linha, sem indentação.
+
+        with EscritorFixture(caminho) as escritor:
+            for objeto in objetos:
+                escritor.escrever(objeto)
+    """
+
+    def __init__(self, caminho, compacto=False):
+        self.caminho = caminho
+        self.caminho_temporario = caminho + ".tmp"
+        self.compacto = compacto
+        self.estatisticas = EstatisticasFixture()
+        self.arquivo = open(self.caminho_temporario, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreamento):
+        if tipo is None:
+            self.concluir()
+        else:
+            self.descartar()
+        return False
+
+    def escrever(self, objeto):
+        self.arquivo.write(("[\n" if not self.total_objetos else ",\n") + serializar_objeto(objeto, self.compacto))
+        self.estatisticas.adicionar(objeto)
+
+    @property
+    def total_objetos(self):
+        return self.estatisticas.total_objetos
+
+    def escrever_todos(self, objetos):
+        for objeto in objetos:
+            self.escrever(objeto)
+        return self
+
+    def concluir(self):
+        """Fecha o array e troca o fixture anterior pelo novo"""
+        self.arquivo.write("\n]" if self.total_objetos else "[]")
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        self.arquivo.close()
+        os.replace(self.caminho_temporario, self.caminho)
+
+    def descartar(self):
+        self.arquivo.close()
+        if os.path.exists(self.caminho_temporario):
+            os.remove(self.caminho_temporario)
+
+
+def salvar_fixture(caminho, objetos, compacto=False):
+    """Grava um iterável de objetos como fixture; retorna o escritor, com as estatísticas do que foi gravado"""
+    with EscritorFixture(caminho, compacto) as escritor:
+        escritor.escrever_todos(objetos)
+    return escritor
+
+
+def anexar_ao_fixture(caminho, objetos, compacto=False):
+    """Anexa objetos ao fim de um fixture gravado pelo EscritorFixture, sem reserializar o restante do arquivo
+
+    O conteúdo atual é copiado em blocos, byte a byte, para um arquivo
+    temporário, que recebe os objetos novos e só então substitui o fixture
+    (os.replace), como em EscritorFixture.concluir(): se os objetos falharem
+    ou o processo for interrompido, o fixture anterior continua intacto.
+    Retorna o número de objetos anexados.
+    """
+    caminho_temporario = caminho + ".tmp"
+    with open(caminho, 'rb') as origem:
+        origem.seek(0, os.SEEK_END)
+        tamanho = origem.tell()
+        origem.seek(max(tamanho - 2, 0))
+        final = origem.read()
+        if final == b"[]":
+            separador = "[\n"
+        elif final == b"\n]":
+            separador = ",\n"
+        else:
+            raise ValueError(f"Fim inesperado em {caminho}")
+
+        origem.seek(0)
+        total = 0
+        try:
+            with open(caminho_temporario, 'wb') as destino:
+                restante = tamanho - 2
+                while restante > 0:
+                    bloco = origem.read(min(TAMANHO_BLOCO_COPIA, restante))
+                    destino.write(bloco)
+                    restante -= len(bloco)
+                for objeto in objetos:
+                    destino.write((separador + serializar_objeto(objeto, compacto)).encode('utf-8'))
+                    separador = ",\n"
+                    total += 1
+                destino.write(b"\n]" if total or final == b"\n]" else b"[]")
+                destino.flush()
+                os.fsync(destino.fileno())
+        except BaseException:
+            if os.path.exists(caminho_temporario):
+                os.remove(caminho_temporario)
+            raise
+    os.replace(caminho_temporario, caminho)
+    return total
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+# Intervalo entre duas observações da tela ou da área de transferência (s)
+INTERVALO_PADRAO = 0.25
+
+
+def capturar_regiao_pyautogui(regiao):
+    """Bytes de um screenshot da região (x, y, largura, altura), reduzido para comparar mais rápido"""
+    import pyautogui
+    imagem = pyautogui.screenshot(region=regiao)
+    return imagem.reduce(4).tobytes() if hasattr(imagem, 'reduce') else imagem.tobytes()
+
+
+def ler_area_transferencia_pyperclip():
+    import pyperclip
+    return pyperclip.paste()
+
+
+class EsperaEventos:
+    """Esperas guiadas pelo estado observado da tela e da área de transferência
+
+    Em vez de dormir um tempo fixo, cada espera observa algo a cada intervalo
+    e retorna assim que a condição é atendida: uma região da tela mudou, parou
+    de mudar ou a área de transferência recebeu um texto novo e estável. Toda
+    espera tem um timeout (maior que o antigo tempo fixo, para não truncar uma
+    resposta lenta) e um fallback: se a tela ou a área de transferência não
+    puderem ser lidas, dorme o tempo fixo de antes. capturar, ler_area_transferencia,
+    relogio e dormir podem ser trocados, o que permite simular a interface.
+    """
+
+    def __init__(self, capturar=None, ler_area_transferencia=None, intervalo=INTERVALO_PADRAO,
+                 relogio=time.monotonic, dormir=time.sleep):
+        self.capturar = capturar or capturar_regiao_pyautogui
+        self.ler_area_transferencia = ler_area_transferencia or ler_area_transferencia_pyperclip
+        self.intervalo = intervalo
+        self.relogio = relogio
+        self.dormir = dormir
+        self.captura_disponivel = True
+        # (descrição, segundos, resultado) de cada espera: 'ok', 'timeout' ou 'fallback'
+        self.historico = []
+
+    def observar(self, regiao):
+        """Captura a região; None se a tela não puder ser lida (a partir daí, só fallback)"""
+        if not self.captura_disponivel:
+            return None
+        try:
+            return self.capturar(regiao)
+        except Exception as e:
+            print(f"  ⚠️ Captura de tela indisponível ({e}); usando esperas fixas")
+            self.captura_disponivel = False
+            return None
+
+    def _registrar(self, descricao, inicio, resultado):
+        # Esperas internas (descricao=None) entram no histórico pela espera que as contém
+        decorrido = self.relogio() - inicio
+        if descricao is not None:
+            self.historico.append((descricao, decorrido, resultado))
+        return decorrido
+
+    def _fallback(self, descricao, inicio, fallback):
+        self.dormir(fallback)
+        self._registrar(descricao, inicio, 'fallback')
+        return False
+
+    def aguardar_mudanca(self, regiao, timeout, fallback, descricao="", referencia=None):
+        """Espera a região ficar diferente de referencia (ou da primeira captura); True se mudou"""
+        inicio = self.relogio()
+        if referencia is None:
+            referencia = self.observar(regiao)
+        if referencia is None:
+            return self._fallback(descricao, inicio, fallback)
+        while self.relogio() - inicio < timeout:
+            self.dormir(self.intervalo)
+            atual = self.observar(regiao)
+            if atual is None:
+                return self._fallback(descricao, inicio, fallback)
+            if atual != referencia:
+                self._registrar(descricao, inicio, 'ok')
+                return True
+        self._registrar(descricao, inicio, 'timeout')
+        return False
+
+    def aguardar_estabilidade(self, regiao, estabilidade, timeout, fallback, descricao=""):
+        """Espera a região passar estabilidade segundos sem mudar; True se estabilizou antes do timeout"""
+        inicio = self.relogio()
+        anterior = self.observar(regiao)
+        if anterior is None:
+            return self._fallback(descricao, inicio, fallback)
+        estavel_desde = self.relogio()
+        while self.relogio() - inicio < timeout:
+            self.dormir(self.intervalo)
+            atual = self.observar(regiao)
+            if atual is None:
+                return self._fallback(descricao, inicio, fallback)
+            agora = self.relogio()
+            if atual != anterior:
+                anterior, estavel_desde = atual, agora
+            elif agora - estavel_desde >= estabilidade:
+                self._registrar(descricao, inicio, 'ok')
+                return True
+        self._registrar(descricao, inicio, 'timeout')
+        return False
+
+    def aguardar_reacao(self, regiao, fallback, espera_mudanca=0.5, estabilidade=0.3, timeout=10,
+                        descricao="", referencia=None):
+        """Depois de um clique: espera a tela começar a reagir (até espera_mudanca s) e parar de mudar
+
+        referencia é uma captura feita antes do clique; sem ela, a primeira
+        captura serve de referência e uma reação muito rápida passa despercebida
+        (o que só faz a espera pela mudança durar espera_mudanca).
+        """
+        inicio = self.relogio()
+        if not self.captura_disponivel:
+            return self._fallback(descricao, inicio, fallback)
+        # Se a captura falhar no meio, a espera interna já dormiu o fallback
+        self.aguardar_mudanca(regiao, espera_mudanca, fallback, None, referencia)
+        restante = max(timeout - (self.relogio() - inicio), estabilidade)
+        estavel = self.captura_disponivel and self.aguardar_estabilidade(
+            regiao, estabilidade, restante, fallback, None
+        )
+        if not self.captura_disponivel:
+            self._registrar(descricao, inicio, 'fallback')
+            return False
+        self._registrar(descricao, inicio, 'ok' if estavel else 'timeout')
+        return estavel
+
+    def aguardar_resposta(self, regiao, timeout, fallback, estabilidade=3.0, descricao="resposta", referencia=None):
+        """Espera uma resposta gerada aos poucos: a região muda (a resposta começou) e fica estabilidade s parada
+
+        As duas esperas dividem o mesmo timeout: uma resposta que demora a
+        começar não é dada como pronta antes de aparecer. Retorna True se a
+        resposta terminou antes do timeout. Um timeout não interrompe nada: o
+        chamador copia o que já estiver na tela. Uma pausa da geração maior que
+        estabilidade ainda passa por pronta; quem copia deve conferir a cópia.
+        """
+        inicio = self.relogio()
+        if not self.captura_disponivel:
+            return self._fallback(descricao, inicio, fallback)
+        comecou = self.aguardar_mudanca(regiao, timeout, fallback, None, referencia)
+        restante = timeout - (self.relogio() - inicio)
+        pronta = comecou and restante > 0 and self.captura_disponivel and self.aguardar_estabilidade(
+            regiao, estabilidade, restante, fallback, None
+        )
+        if not self.captura_disponivel:
+            self._registrar(descricao, inicio, 'fallback')
+            return False
+        self._registrar(descricao, inicio, 'ok' if pronta else 'timeout')
+        if pronta:
+            print(f"  ⏱️ {descricao.capitalize()} pronta em {self.relogio() - inicio:.1f} s")
+        elif not comecou:
+            print(f"  ⚠️ {descricao.capitalize()} não apareceu em {timeout} s; seguindo com o que há na tela")
+        else:
+            print(f"  ⚠️ {descricao.capitalize()} ainda mudando após {timeout} s; seguindo com o que há na tela")
+        return pronta
+
+    def aguardar_area_transferencia(self, anterior, timeout, fallback, estabilidade=0.5, descricao="cópia"):
+        """Espera a área de transferência receber um texto diferente de anterior e parar de mudar
+
+        Retorna o texto lido (o anterior, se nada novo chegou até o timeout).
+        Se a área de transferência não puder ser lida, dorme fallback e tenta uma última
+        vez; se ainda falhar, retorna anterior.
+        """
+        inicio = self.relogio()
+        texto, estavel_desde = anterior, None
+        try:
+            while self.relogio() - inicio < timeout:
+                atual = self.ler_area_transferencia()
+                agora = self.relogio()
+                if atual != texto:
+                    texto, estavel_desde = atual, agora
+                elif estavel_desde is not None and agora - estavel_desde >= estabilidade:
+                    self._registrar(descricao, inicio, 'ok')
+                    return texto
+                self.dormir(self.intervalo)
+        except Exception as e:
+            print(f"  ⚠️ Área de transferência indisponível ({e}); aguardando {fallback} s")
+            self._fallback(descricao, inicio, fallback)
+            try:
+                return self.ler_area_transferencia()
+            except Exception as e:
+                print(f"  ⚠️ Área de transferência ainda indisponível ({e})")
+                return anterior
+        self._registrar(descricao, inicio, 'timeout' if estavel_desde is None else 'ok')
+        return texto
+
+    def resumo(self):
+        """Tempo total e quantidade de esperas por resultado"""
+        resultados = {}
+        for _, decorrido, resultado in self.historico:
+            total, tempo = resultados.get(resultado, (0, 0.0))
+            resultados[resultado] = (total + 1, tempo + decorrido)
+        return resultados
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from collections import Counter
+
+# Limites superiores (exclusivos) das faixas dos histogramas de tamanho de texto, em caracteres
+FAIXAS_TAMANHO = (50, 100, 200, 400, 800, 1600)
+
+
+def faixa_tamanho(tamanho):
+    """Rótulo da faixa do histograma em que um texto de tamanho caracteres cai ("100-199", "1600+")"""
+    inicio = 0
+    for limite in FAIXAS_TAMANHO:
+        if tamanho < limite:
+            return f"{inicio}-{limite - 1}"
+        inicio = limite
+    return f"{inicio}+"
+
+
+def histograma_ordenado(contagem):
+    """Faixas do histograma na ordem crescente, incluindo as vazias"""
+    rotulos = [faixa_tamanho(limite - 1) for limite in FAIXAS_TAMANHO] + [faixa_tamanho(FAIXAS_TAMANHO[-1])]
+    return {rotulo: contagem.get(rotulo, 0) for rotulo in rotulos}
+
+
+class EstatisticasFixture:
+    """Estatísticas de um fixture Django calculadas em uma única passada sobre os objetos
+
+    Cada objeto é entregue a adicionar() assim que é gravado ou lido; nada além
+    de alguns contadores por questão fica em memória. Calcula a contagem de
+    objetos por modelo, as alternativas e as corretas de cada questão, a fonte
+    da resposta de cada questão e os histogramas de tamanho dos enunciados e
+    das alternativas, usados nos relatórios TXT e no relatório JSON.
+    """
+
+    def __init__(self):
+        self.total_objetos = 0
+        self.contagem = Counter()
+        # pk da questão -> contadores, na ordem do fixture
+        self.questoes = {}
+        self.questao_por_alternativa = {}
+        self.tamanhos_enunciados = Counter()
+        self.tamanhos_alternativas = Counter()
+
+    def _questao(self, questao_id):
+        questao = self.questoes.get(questao_id)
+        if questao is None:
+            questao = self.questoes[questao_id] = {
+                'has_answer': False, 'tamanho': 0, 'alternativas': 0, 'corretas': 0,
+                'alternativa_correta': None, 'fonte': None
+            }
+        return questao
+
+    def adicionar(self, objeto):
+        modelo = objeto['model']
+        campos = objeto['fields']
+        self.total_objetos += 1
+        self.contagem[modelo] += 1
+
+        if modelo == 'yourapp.Question':
+            questao = self._questao(objeto['pk'])
+            questao['has_answer'] = campos['has_answer']
+            questao['tamanho'] = len(campos['text'])
+            self.tamanhos_enunciados[faixa_tamanho(questao['tamanho'])] += 1
+
+        elif modelo == 'yourapp.Alternative':
+            questao = self._questao(campos['question'])
+            self.questao_por_alternativa[objeto['pk']] = campos['question']
+            questao['alternativas'] += 1
+            if campos['is_correct']:
+                questao['corretas'] += 1
+                if questao['alternativa_correta'] is None:
+                    questao['alternativa_correta'] = objeto['pk']
+            self.tamanhos_alternativas[faixa_tamanho(len(campos['text']))] += 1
+
+        elif modelo == 'yourapp.CorrectAnswersSources':
+            questao_id = self.questao_por_alternativa.get(campos['alternative'])
+            if questao_id is not None:
+                self.questoes[questao_id]['fonte'] = campos['source']
+
+    def adicionar_todos(self, objetos):
+        for objeto in objetos:
+            self.adicionar(objeto)
+        return self
+
+    @property
+    def total_questoes(self):
+        return self.contagem['yourapp.Question']
+
+    @property
+    def total_alternativas(self):
+        return self.contagem['yourapp.Alternative']
+
+    @property
+    def total_fontes(self):
+        return self.contagem['yourapp.CorrectAnswersSources']
+
+    def com_gabarito(self):
+        return sum(1 for questao in self.questoes.values() if questao['has_answer'])
+
+    def distribuicao_fontes(self):
+        """Questões por fonte da resposta (None para as sem fonte), na ordem em que aparecem"""
+        return Counter(questao['fonte'] for questao in self.questoes.values())
+
+    def resumo(self):
+        """Estatísticas agregadas, serializáveis em JSON"""
+        alternativas_por_questao = Counter(questao['alternativas'] for questao in self.questoes.values())
+        com_gabarito = self.com_gabarito()
+        return {
+            'total_objetos': self.total_objetos,
+            'objetos_por_modelo': dict(self.contagem),
+            'questoes': self.total_questoes,
+            'com_gabarito': com_gabarito,
+            'sem_gabarito': self.total_questoes - com_gabarito,
+            'sem_alternativa_correta': sum(1 for q in self.questoes.values() if not q['corretas']),
+            'com_varias_corretas': sum(1 for q in self.questoes.values() if q['corretas'] > 1),
+            'alternativas_por_questao': {str(n): alternativas_por_questao[n] for n in sorted(alternativas_por_questao)},
+            'fontes': [{'fonte': fonte, 'questoes': total} for fonte, total in self.distribuicao_fontes().items()],
+            'tamanho_enunciados': histograma_ordenado(self.tamanhos_enunciados),
+            'tamanho_alternativas': histograma_ordenado(self.tamanhos_alternativas)
+        }
+
+    def escrever_histogramas(self, f):
+        """Escreve os histogramas de tamanho em um relatório TXT"""
+        for titulo, contagem in [("TAMANHO DOS ENUNCIADOS", self.tamanhos_enunciados),
+                                 ("TAMANHO DAS ALTERNATIVAS", self.tamanhos_alternativas)]:
+            f.write(f"\n{titulo} (caracteres):\n")
+            for faixa, total in histograma_ordenado(contagem).items():
+                f.write(f"  - {faixa}: {total}\n")
+
+    def salvar_json(self, caminho, **extras):
+        """Grava o resumo (e as questões, uma a uma) em um relatório JSON"""
+        relatorio = dict(self.resumo(), **extras)
+        relatorio['por_questao'] = [dict(pk=pk, **questao) for pk, questao in self.questoes.items()]
+        caminho_temporario = caminho + ".tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        os.replace(caminho_temporario, caminho)
+        return caminho
@@ -1,18 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import zipfile
 import os
 import re
-import json
-import time
-import pyautogui
-import pyperclip
 import glob
-from datetime import datetime
+from deduplicacao_imagens import agrupar_imagens
+from diario_checkpoint import NOME_DIARIO, DiarioCheckpoint
+from drivers_interface import DriverPyAutoGUI
+from escritor_fixture import salvar_fixture
+from fila_trabalho import FALHAS, STATUS_OK, FilaTrabalho, classificar_resultado
+from imagens_docx import ExtratorImagensDocx
+from ocr_local import OCRLocal
+from registro_chaves import RegistroChaves, registro_da_pasta
+
+ROTULOS_ORIGEM = {'ocr': "OCR local", 'copilot': "Copilot"}
 
 class ExtratorTextoComCopilot:
-    def __init__(self):
+    def __init__(self, driver=None, ocr=None):
         self.coordenadas = {
             'anexar_arquivo': (3215, 607),
             'adicionar_imagem': (3300, 658),
@@ -33,6 +37,16 @@ class ExtratorTextoComCopilot:
             'excluir_chat': (3172, 518),
             'confirmar_exclusao': (3358, 625)
         }
+        # Backend que opera a janela do Copilot (DriverSimulado para rodar sem área de trabalho)
+        self.driver = driver or DriverPyAutoGUI()
+        self.driver.usar_coordenadas(self.coordenadas)
+        # OCR local (OCRLocal); sem ele, ou abaixo do limiar de confiança, a imagem vai para o Copilot
+        self.ocr = ocr
+        self.origens = {'ocr': 0, 'copilot': 0, 'repetida': 0}
+        # Segundos gastos em cada imagem processada, para estimar o tempo poupado com as repetidas
+        self.tempos_imagens = {}
+        # Diário de checkpoint (CHECKPOINT.jsonl) da pasta de saída, aberto no primeiro uso
+        self.diario = None
         self.prompt_copilot = """Preciso que transcreva TODO o texto da imagem da questão de forma COMPLETA e organize EXATAMENTE neste formato:
 
 ENUNCIADO: [todo o texto do enunciado aqui]
@@ -51,141 +65,123 @@ EXPLICAÇÃO: [texto completo da explicação se houver na imagem]
 Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interprete, não explique, apenas transcreva. Se tiver questões que na verdade são Verdadeiro ou Falso, os itens da questão são esses."""
         
     def verificar_dependencias(self):
-        """Verifica se todas as dependências estão disponíveis"""
-        try:
-            import pyautogui
-            import pyperclip
-            print("✅ PyAutoGUI e PyPerClip encontrados")
-            return True
-        except ImportError as e:
-            print(f"❌ Dependências não encontradas: {e}")
-            print("Instale com: pip install pyautogui pyperclip")
-            return False
+        """Verifica se o backend de automação pode ser usado"""
+        return self.driver.verificar()
     
     def extrair_imagens_docx(self, arquivo_docx, pasta_destino):
-        """Extrai todas as imagens do documento DOCX"""
+        """Extrai as imagens do documento DOCX na ordem do documento, gravando só as que mudaram"""
         print(f"🖼️ Extraindo imagens de: {arquivo_docx}")
         
-        os.makedirs(pasta_destino, exist_ok=True)
-        imagens_extraidas = []
-        
+        extrator = ExtratorImagensDocx(pasta_destino)
         try:
-            with zipfile.ZipFile(arquivo_docx, 'r') as docx_zip:
-                arquivos = docx_zip.namelist()
-                imagens = [f for f in arquivos if f.startswith('word/media/') and os.path.basename(f)]
-                
-                print(f"📸 Encontradas {len(imagens)} imagens no documento")
-                
-                for i, caminho_imagem in enumerate(imagens, 1):
-                    try:
-                        dados_imagem = docx_zip.read(caminho_imagem)
-                        _, extensao = os.path.splitext(caminho_imagem)
-                        if not extensao:
-                            extensao = '.png'
-                        
-                        nome_arquivo = f'questao_{i:03d}{extensao}'
-                        caminho_completo = os.path.join(pasta_destino, nome_arquivo)
-                        
-                        with open(caminho_completo, 'wb') as f:
-                            f.write(dados_imagem)
-                        
-                        imagens_extraidas.append({
-                            'caminho': caminho_completo,
-                            'nome': nome_arquivo,
-                            'numero': i
-                        })
-                        print(f"  ✅ {nome_arquivo}")
-                        
-                    except Exception as e:
-                        print(f"  ⚠️ Erro na imagem {i}: {e}")
-                        
+            imagens_extraidas = extrator.extrair(arquivo_docx)
         except Exception as e:
             print(f"❌ Erro ao extrair imagens do DOCX: {e}")
-            
+            return []
+        
+        print(f"📸 {len(imagens_extraidas)} imagens no documento: {extrator.gravadas} gravadas "
+              f"({extrator.bytes_gravados / 1024 / 1024:.1f} MB), {extrator.puladas} já estavam atualizadas")
         return imagens_extraidas
     
-    def verificar_checkpoint(self, pasta_saida):
-        """Verifica quais questões já foram processadas e retorna o último ponto"""
+    def abrir_diario(self, pasta_saida):
+        """Diário de checkpoint da pasta; na primeira vez importa as respostas intermediárias já salvas"""
+        caminho = os.path.join(pasta_saida, NOME_DIARIO)
+        if self.diario is not None and self.diario.caminho == caminho:
+            return self.diario
+        if self.diario is not None:
+            self.diario.fechar()
+        os.makedirs(pasta_saida, exist_ok=True)
+        self.diario = DiarioCheckpoint(caminho)
+        if self.diario.truncado:
+            print(f"⚠️ Checkpoint: registro incompleto de uma execução interrompida descartado "
+                  f"({self.diario.truncado} bytes)")
+        if not self.diario.existia:
+            self.importar_respostas_intermediarias(pasta_saida)
+        return self.diario
+    
+    def importar_respostas_intermediarias(self, pasta_saida):
+        """Registra no diário as respostas TXT de execuções anteriores ao diário (uma única vez)"""
         pasta_intermediaria = os.path.join(pasta_saida, "respostas_intermediarias")
-        
-        if not os.path.exists(pasta_intermediaria):
-            return 0, []
-        
-        # Encontrar todos os arquivos de resposta
-        arquivos_resposta = glob.glob(os.path.join(pasta_intermediaria, "resposta_questao_*.txt"))
-        
-        # Extrair números das questões já processadas
-        numeros_processados = []
+        arquivos_resposta = sorted(glob.glob(os.path.join(pasta_intermediaria, "resposta_questao_*.txt")))
+        if not arquivos_resposta:
+            return
+        print(f"📥 Importando {len(arquivos_resposta)} respostas intermediárias para o diário de checkpoint...")
         for arquivo in arquivos_resposta:
-            try:
-                numero = int(re.search(r'resposta_questao_(\d+)\.txt', arquivo).group(1))
-                numeros_processados.append(numero)
-            except:
+            encontrado = re.search(r'resposta_questao_(\d+)\.txt', arquivo)
+            if not encontrado:
                 continue
+            numero = int(encontrado.group(1))
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                _, separador, texto_resposta = f.read().partition("=" * 50 + "\n\n")
+            questao = self.extrair_informacoes_resposta(texto_resposta, numero)
+            status = classificar_resultado(texto_resposta, questao)
+            self.diario.registrar(numero, status, texto_resposta, questao if status == STATUS_OK else None, 'importada')
+        self.diario.sincronizar()
+    
+    def invalidar_imagens_alteradas(self, pasta_saida, imagens):
+        """Registra como não transcritas as imagens regravadas, cujas transcrições podem ser de outra imagem"""
+        diario = self.abrir_diario(pasta_saida)
+        alteradas = [
+            imagem['numero'] for imagem in imagens
+            if imagem.get('alterada') and diario.registros.get(imagem['numero'], {}).get('status') == STATUS_OK
+        ]
+        for numero in alteradas:
+            diario.registrar(numero, 'imagem_alterada', "", None, 'docx')
+        diario.sincronizar()
+        if alteradas:
+            print(f"⚠️ {len(alteradas)} imagens mudaram desde a transcrição e serão refeitas: {alteradas}")
+        return alteradas
+    
+    def verificar_checkpoint(self, pasta_saida):
+        """Verifica quais questões já foram processadas e retorna seus números"""
+        diario = self.abrir_diario(pasta_saida)
+        numeros_processados = diario.numeros('ok')
+        falhas = sorted(numero for numero, registro in diario.registros.items() if registro['status'] != STATUS_OK)
         
         if numeros_processados:
-            ultimo_numero = max(numeros_processados)
             print(f"📌 Checkpoint encontrado: {len(numeros_processados)} questões já processadas")
-            print(f"📌 Última questão processada: {ultimo_numero}")
-            return ultimo_numero, numeros_processados
-        else:
-            return 0, []
+        if falhas:
+            print(f"📌 {len(falhas)} questões falharam em execuções anteriores e serão refeitas: {falhas}")
+        return numeros_processados
     
     def carregar_questoes_existentes(self, pasta_saida, numeros_processados):
-        """Carrega as questões já processadas a partir dos arquivos intermediários"""
+        """Carrega as questões já processadas do diário de checkpoint, já interpretadas"""
         if not numeros_processados:
             return []
         
-        pasta_intermediaria = os.path.join(pasta_saida, "respostas_intermediarias")
-        questões_existentes = []
-        
-        for numero in numeros_processados:
-            caminho_arquivo = os.path.join(pasta_intermediaria, f"resposta_questao_{numero:03d}.txt")
-            if os.path.exists(caminho_arquivo):
-                try:
-                    with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-                        texto_resposta = f.read()
-                    
-                    # Extrair informações da resposta
-                    questao = self.extrair_informacoes_resposta(texto_resposta, numero)
-                    if questao:
-                        questões_existentes.append(questao)
-                        print(f"  ✅ Questão {numero} carregada do checkpoint")
-                    
-                except Exception as e:
-                    print(f"  ⚠️ Erro ao carregar questão {numero}: {e}")
-        
+        registros = self.abrir_diario(pasta_saida).registros
+        questões_existentes = [
+            registros[numero]['questao'] for numero in numeros_processados
+            if numero in registros and registros[numero]['questao']
+        ]
+        print(f"  ✅ {len(questões_existentes)} questões carregadas do checkpoint")
         return questões_existentes
     
-    def clicar_coordenada(self, coordenada, descricao="", duplo_clique=False):
-        """Clica em uma coordenada específica na tela"""
-        print(f"  🖱️ Clicando em {descricao}: {coordenada}")
-        x, y = coordenada
-        
-        # Mover o mouse para a coordenada
-        pyautogui.moveTo(x, y, duration=0.5)
-        time.sleep(0.5)
-        
-        if duplo_clique:
-            pyautogui.doubleClick()
-        else:
-            pyautogui.click()
-        
-        time.sleep(1)
-    
-    def digitar_texto(self, texto, descricao=""):
-        """Digita texto no campo atual"""
-        print(f"  ⌨️ Digitando {descricao}: {texto}")
-        pyautogui.write(texto, interval=0.05)
-        time.sleep(1)
+    def fechar_diario(self):
+        """Sincroniza o diário em disco e o compacta se a maior parte das linhas já foi substituída"""
+        if self.diario is None:
+            return
+        if self.diario.linhas > 2 * len(self.diario.registros):
+            self.diario.compactar()
+        self.diario.fechar()
+        self.diario = None
     
-    def colar_texto(self, texto, descricao=""):
-        """Copia texto para a área de transferência e cola"""
-        print(f"  📋 Colando {descricao} ({len(texto)} caracteres)")
-        pyperclip.copy(texto)
-        time.sleep(0.5)
-        pyautogui.hotkey('ctrl', 'v')
-        time.sleep(1)
+    def registrar_resposta(self, texto, numero_questao, pasta_saida, origem):
+        """Classifica a resposta, salva em TXT, interpreta e registra no diário de checkpoint
+
+        texto None é uma cópia que não chegou à área de transferência. Retorna a
+        questão só se a resposta foi classificada como 'ok'; nos demais casos o
+        diário guarda o status da falha e a imagem volta para a fila.
+        """
+        questao = self.extrair_informacoes_resposta(texto, numero_questao) if texto else None
+        status = classificar_resultado(texto, questao)
+        if status in (STATUS_OK, 'ilegivel'):
+            self.salvar_resposta_intermediaria(texto, numero_questao, pasta_saida)
+        if status != STATUS_OK:
+            questao = None
+            print(f"  ⚠️ Questão {numero_questao} sem transcrição válida: {FALHAS[status]}")
+        self.abrir_diario(pasta_saida).registrar(numero_questao, status, texto, questao, origem)
+        return questao
     
     def salvar_resposta_intermediaria(self, texto, numero_questao, pasta_saida):
         """Salva a resposta do Copilot em um arquivo TXT intermediário"""
@@ -202,174 +198,160 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
         print(f"  💾 Resposta intermediária salva: {os.path.basename(caminho_txt)}")
         return caminho_txt
     
+    def processar_imagem_ocr(self, imagem_info, pasta_saida):
+        """Transcreve a imagem com o OCR local; None se não houver OCR ou a transcrição não for confiável"""
+        if self.ocr is None or 'caminho' not in imagem_info:
+            return None
+        print(f"\n🔎 OCR LOCAL DA IMAGEM {imagem_info['numero']}: {imagem_info['nome']}")
+        resultado = self.ocr.transcrever(imagem_info['caminho'])
+        if not resultado['aceito']:
+            print(f"  ↪️ Enviando ao Copilot: {resultado['motivo']}")
+            return None
+        print(f"  ✅ Transcrita localmente (confiança {resultado['confianca']:.0f})")
+        return self.registrar_resposta(resultado['texto'], imagem_info['numero'], pasta_saida, 'ocr')
+    
     def processar_imagem_copilot(self, imagem_info, pasta_saida):
         """Processa uma imagem usando o Copilot via automação de interface"""
         print(f"\n🔄 PROCESSANDO IMAGEM {imagem_info['numero']}: {imagem_info['nome']}")
         
         try:
             # 1. Clicar para anexar arquivo
-            self.clicar_coordenada(
-                self.coordenadas['anexar_arquivo'], 
+            self.driver.clicar(
+                'anexar_arquivo', 
                 "Anexar arquivo"
             )
             
             # 2. Clicar em "Adicionar imagem"
-            self.clicar_coordenada(
-                self.coordenadas['adicionar_imagem'], 
+            self.driver.clicar(
+                'adicionar_imagem', 
                 "Adicionar imagem"
             )
             
             # 3. Clicar na pasta pessoal
-            self.clicar_coordenada(
-                self.coordenadas['pasta_pessoal'], 
+            self.driver.clicar(
+                'pasta_pessoal', 
                 "Pasta pessoal"
             )
             
             # 4. Clicar para pesquisar pasta
-            self.clicar_coordenada(
-                self.coordenadas['pesquisar_pasta'], 
+            self.driver.clicar(
+                'pesquisar_pasta', 
                 "Pesquisar pasta"
             )
             
             # 5. Clicar para digitar
-            self.clicar_coordenada(
-                self.coordenadas['clicar_digitar'], 
+            self.driver.clicar(
+                'clicar_digitar', 
                 "Campo de digitação"
             )
             
             # 6. Digitar "Tutorbots"
-            self.digitar_texto("Tutorbots", "nome da pasta Tutorbots")
+            self.driver.digitar("Tutorbots", "nome da pasta Tutorbots")
             
             # 7. Clicar duas vezes na pasta Tutorbots
-            self.clicar_coordenada(
-                self.coordenadas['pasta_tutorbots'], 
+            self.driver.clicar(
+                'pasta_tutorbots', 
                 "Pasta Tutorbots", 
                 duplo_clique=True
             )
             
             # 8. Clicar duas vezes na pasta de imagens
-            self.clicar_coordenada(
-                self.coordenadas['pasta_imagens'], 
+            self.driver.clicar(
+                'pasta_imagens', 
                 "Pasta de imagens", 
                 duplo_clique=True
             )
             
             # 9. Clicar duas vezes na pasta de questões
-            self.clicar_coordenada(
-                self.coordenadas['pasta_questoes'], 
+            self.driver.clicar(
+                'pasta_questoes', 
                 "Pasta de questões", 
                 duplo_clique=True
             )
             
             # 10. Clicar no ícone de pesquisa
-            self.clicar_coordenada(
-                self.coordenadas['icone_pesquisa'], 
+            self.driver.clicar(
+                'icone_pesquisa', 
                 "Ícone de pesquisa"
             )
             
             # 11. Clicar na aba de pesquisar imagem
-            self.clicar_coordenada(
-                self.coordenadas['pesquisar_imagem'], 
+            self.driver.clicar(
+                'pesquisar_imagem', 
                 "Campo pesquisar imagem"
             )
             
             # 12. Digitar o nome da imagem
             nome_imagem = imagem_info['nome'].replace('.png', '').replace('.jpg', '')
-            self.digitar_texto(nome_imagem, f"nome da imagem {nome_imagem}")
+            self.driver.digitar(nome_imagem, f"nome da imagem {nome_imagem}")
             
             # 13. Clicar duas vezes na imagem para anexar
-            self.clicar_coordenada(
-                self.coordenadas['selecionar_imagem'], 
+            # Aguardar upload da imagem: a miniatura aparece e a janela para de mudar
+            self.driver.clicar(
+                'selecionar_imagem', 
                 "Selecionar imagem", 
-                duplo_clique=True
+                duplo_clique=True,
+                espera=4,
+                estabilidade=1,
+                timeout=30
             )
             
-            time.sleep(3)  # Aguardar upload da imagem
-            
             # 14. Clicar no campo de prompt
-            self.clicar_coordenada(
-                self.coordenadas['enviar_prompt'], 
+            self.driver.clicar(
+                'enviar_prompt', 
                 "Campo de prompt"
             )
             
             # 15. COLAR o prompt (em vez de digitar)
-            self.colar_texto(self.prompt_copilot, "prompt para transcrição")
+            self.driver.colar(self.prompt_copilot, "prompt para transcrição")
             
             # 16. Enviar mensagem (coordenada corrigida)
-            self.clicar_coordenada(
-                self.coordenadas['enviar_mensagem'], 
+            self.driver.clicar(
+                'enviar_mensagem', 
                 "Enviar mensagem"
             )
             
-            print("  ⏳ Aguardando resposta do Copilot (30 segundos)...")
-            time.sleep(15)  # Aguardar resposta
+            # Aguardar a resposta começar e parar de mudar na tela (até 120 s; 15 s fixos sem captura)
+            print("  ⏳ Aguardando resposta do Copilot (até 120 segundos)...")
+            self.driver.aguardar_resposta(timeout=120, fallback=15)
             
             # 17. Descer a resposta
-            self.clicar_coordenada(
-                self.coordenadas['descer_resposta'], 
-                "Descer resposta"
-            )
-            time.sleep(2)
-            
-            # 18. Copiar resposta
-            self.clicar_coordenada(
-                self.coordenadas['copiar_resposta'], 
-                "Copiar resposta"
+            self.driver.clicar(
+                'descer_resposta', 
+                "Descer resposta",
+                espera=3
             )
-            time.sleep(2)
             
-            # Obter texto da área de transferência usando pyperclip
+            # 18. Copiar resposta: o texto é lido assim que a cópia chega e para de mudar
             try:
-                texto_copiado = pyperclip.paste()
-                print(f"  ✅ Texto copiado ({len(texto_copiado)} caracteres)")
-                
-                # Salvar resposta intermediária
-                caminho_intermediario = self.salvar_resposta_intermediaria(
-                    texto_copiado, 
-                    imagem_info['numero'], 
-                    pasta_saida
-                )
-                
+                texto_copiado = self.driver.copiar_resposta()
+                if texto_copiado is not None:
+                    print(f"  ✅ Texto copiado ({len(texto_copiado)} caracteres)")
             except Exception as e:
                 print(f"  ❌ Erro ao acessar área de transferência: {e}")
                 # Tentar método alternativo
                 texto_copiado = self.tentar_copiar_texto_alternativo()
             
-            # 19. Limpar chat para próxima imagem
-            self.clicar_coordenada(
-                self.coordenadas['icone_chat'], 
-                "Ícone do chat"
-            )
-            time.sleep(1)
-            
-            self.clicar_coordenada(
-                self.coordenadas['excluir_chat'], 
-                "Excluir chat"
-            )
-            time.sleep(1)
+            # Salvar resposta intermediária e registrar no diário de checkpoint; None (ainda é
+            # o prompt), vazia ou sem alternativas fica registrada como falha para ser refeita
+            questao = self.registrar_resposta(texto_copiado, imagem_info['numero'], pasta_saida, 'copilot')
             
-            self.clicar_coordenada(
-                self.coordenadas['confirmar_exclusao'], 
-                "Confirmar exclusão"
-            )
-            time.sleep(2)
+            # 19. Limpar chat para próxima imagem
+            self.driver.limpar_chat()
             
-            return self.extrair_informacoes_resposta(texto_copiado, imagem_info['numero'])
+            return questao
             
         except Exception as e:
             print(f"❌ Erro ao processar imagem {imagem_info['nome']}: {e}")
+            self.abrir_diario(pasta_saida).registrar(imagem_info['numero'], 'erro', "", None, 'copilot')
             return None
     
     def tentar_copiar_texto_alternativo(self):
-        """Método alternativo para copiar texto se pyperclip falhar"""
+        """Método alternativo para copiar texto se a área de transferência falhar"""
         print("  🔄 Tentando método alternativo de cópia...")
         try:
             # Selecionar tudo e copiar
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(1)
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(1)
-            return pyperclip.paste()
+            return self.driver.copiar_tudo()
         except:
             return "Texto não pôde ser copiado"
     
@@ -449,156 +431,247 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
             print(f"  ❌ Erro ao extrair informações da resposta: {e}")
             return questao
     
-    def processar_imagens_restantes(self, imagens, pasta_saida, ultimo_numero_processado):
-        """Processa apenas as imagens que ainda não foram processadas"""
-        print(f"\n🚀 CONTINUANDO PROCESSAMENTO A PARTIR DA QUESTÃO {ultimo_numero_processado + 1}")
+    def detectar_imagens_duplicadas(self, imagens):
+        """Agrupa as imagens repetidas ou quase idênticas (dHash); mapa número -> (número da original, distância)"""
+        print("🔁 Procurando imagens repetidas...")
+        duplicatas = agrupar_imagens(imagens)
+        print(f"🔁 {len(duplicatas)} imagens repetem uma anterior e reaproveitarão a transcrição dela")
+        return duplicatas
+    
+    def reaproveitar_transcricao(self, imagem_info, original, pasta_saida):
+        """Usa a transcrição salva da imagem original para uma imagem repetida; None se a original não foi transcrita"""
+        registro = self.abrir_diario(pasta_saida).registros.get(original)
+        if registro is None or registro['status'] != STATUS_OK:
+            return None
+        caminho_original = os.path.join(
+            pasta_saida, "respostas_intermediarias", f"resposta_questao_{original:03d}.txt"
+        )
+        if not os.path.exists(caminho_original):
+            return None
+        with open(caminho_original, 'r', encoding='utf-8') as f:
+            _, separador, texto = f.read().partition("=" * 50 + "\n\n")
+        if not separador:
+            return None
+        print(f"\n🔁 IMAGEM {imagem_info['numero']} REPETE A {original}: reaproveitando a transcrição")
+        return self.registrar_resposta(texto, imagem_info['numero'], pasta_saida, f"repetida:{original}")
+    
+    def salvar_relatorio_duplicatas(self, duplicatas, reaproveitadas, falhas, imagens, pasta_saida):
+        """Lista as imagens repetidas desta execução e estima o tempo poupado
+
+        Só contam como reaproveitadas (e no tempo poupado) as imagens cuja
+        transcrição veio de fato da original nesta execução; as que não puderam
+        reaproveitá-la são listadas à parte.
+        """
+        nomes = {imagem['numero']: imagem['nome'] for imagem in imagens}
+        tempos_copilot = [tempo for origem, tempo in self.tempos_imagens.values() if origem == 'copilot']
+        # Sem medição nesta execução, vale o tempo típico de uma ida ao Copilot
+        tempo_medio = sum(tempos_copilot) / len(tempos_copilot) if tempos_copilot else 45.0
+        poupado = sum(
+            self.tempos_imagens.get(duplicatas[numero][0], ('copilot', tempo_medio))[1] for numero in reaproveitadas
+        )
+        
+        caminho_relatorio = os.path.join(pasta_saida, "RELATORIO_IMAGENS_DUPLICADAS.txt")
+        with open(caminho_relatorio, 'w', encoding='utf-8') as f:
+            f.write("RELATÓRIO DE IMAGENS REPETIDAS\n")
+            f.write("=" * 50 + "\n\n")
+            f.write(f"Imagens no documento: {len(imagens)}\n")
+            f.write(f"Imagens repetidas detectadas: {len(duplicatas)}\n")
+            f.write(f"Imagens repetidas (transcrição reaproveitada): {len(reaproveitadas)}\n")
+            f.write(f"Reaproveitamento falhou: {len(falhas)}\n")
+            f.write(f"Tempo poupado estimado: {poupado:.0f} s ({poupado / 60:.1f} min)\n\n")
+            f.write("Reaproveitadas:\n")
+            for numero in sorted(reaproveitadas):
+                original, distancia = duplicatas[numero]
+                f.write(f"  {nomes.get(numero, numero)} -> {nomes.get(original, original)} (distância {distancia})\n")
+            if falhas:
+                f.write("\nSem reaproveitamento (original sem transcrição válida):\n")
+                for numero, destino in sorted(falhas.items()):
+                    original, distancia = duplicatas[numero]
+                    f.write(f"  {nomes.get(numero, numero)} -> {nomes.get(original, original)} "
+                            f"(distância {distancia}; {destino})\n")
+        print(f"🔁 {len(reaproveitadas)} imagens repetidas reaproveitadas, {len(falhas)} sem reaproveitamento; "
+              f"tempo poupado estimado: {poupado / 60:.1f} min (relatório em {caminho_relatorio})")
+    
+    def processar_imagens_restantes(self, imagens, pasta_saida, duplicatas=None, max_tentativas=3):
+        """Processa as imagens que ainda não têm transcrição válida no diário de checkpoint
+
+        Todas as imagens sem 'ok' no diário entram na fila, inclusive as que
+        falharam antes da última processada. Cada resultado é classificado (ok,
+        vazia, ilegivel, area_transferencia_antiga, erro) e as falhas voltam
+        para a fila com espera crescente, até max_tentativas vezes nesta execução.
+        Imagens em duplicatas (número -> (número da original, distância)) usam a
+        transcrição da original em vez de irem ao OCR ou ao Copilot.
+        """
+        duplicatas = duplicatas or {}
+        diario = self.abrir_diario(pasta_saida)
+        imagens_por_numero = {img['numero']: img for img in imagens}
+        fila = FilaTrabalho(imagens_por_numero, diario, max_tentativas, relogio=self.driver.agora)
+        print(f"\n🚀 CONTINUANDO PROCESSAMENTO: {fila.ja_concluidas} de {len(imagens)} imagens já transcritas")
         print("=" * 60)
         
-        # Filtrar apenas imagens não processadas
-        imagens_restantes = [img for img in imagens if img['numero'] > ultimo_numero_processado]
-        
-        if not imagens_restantes:
+        if not fila:
             print("✅ Todas as imagens já foram processadas!")
             return []
         
-        print(f"📋 Processando {len(imagens_restantes)} imagens restantes")
+        print(f"📋 Processando {len(fila)} imagens restantes")
         
-        todas_questoes = []
+        questoes_por_numero = {}
+        reaproveitadas = []
+        falhas_reaproveitamento = set()
         
         # Contador regressivo antes de começar
         print("⏰ Iniciando em 5 segundos... Posicione o mouse!")
         for i in range(5, 0, -1):
             print(f"  {i}...")
-            time.sleep(1)
-        
-        for imagem_info in imagens_restantes:
-            questao = self.processar_imagem_copilot(imagem_info, pasta_saida)
-            if questao:
-                todas_questoes.append(questao)
-            
-            # Pequena pausa entre processamentos
-            time.sleep(2)
-        
-        return todas_questoes
+            self.driver.dormir(1)
+        
+        while True:
+            proxima = fila.proxima()
+            if proxima is None:
+                break
+            numero, espera = proxima
+            if espera > 0:
+                print(f"\n⏳ Aguardando {espera:.0f} s para tentar de novo a imagem {numero}...")
+                self.driver.dormir(espera)
+            imagem_info = imagens_por_numero[numero]
+            
+            questao = None
+            if numero in duplicatas:
+                questao = self.reaproveitar_transcricao(imagem_info, duplicatas[numero][0], pasta_saida)
+                if questao is None:
+                    falhas_reaproveitamento.add(numero)
+            if questao is not None:
+                origem = 'repetida'
+            else:
+                inicio = self.driver.agora()
+                questao = self.processar_imagem_ocr(imagem_info, pasta_saida)
+                if questao is None:
+                    questao = self.processar_imagem_copilot(imagem_info, pasta_saida)
+                    origem = 'copilot'
+                    
+                    # Pequena pausa entre processamentos
+                    self.driver.dormir(2)
+                else:
+                    origem = 'ocr'
+                self.tempos_imagens[numero] = (origem, self.driver.agora() - inicio)
+            
+            status = diario.registros[numero]['status'] if numero in diario.registros else 'erro'
+            espera = fila.concluir(numero, status)
+            if status == STATUS_OK:
+                self.origens[origem] += 1
+                questoes_por_numero[numero] = questao
+                if origem == 'repetida':
+                    reaproveitadas.append(numero)
+            elif espera is not None:
+                print(f"  🔁 Imagem {numero} volta para a fila em {espera:.0f} s "
+                      f"(tentativa {fila.tentativas[numero]} de {max_tentativas})")
+            else:
+                print(f"  ⛔ Imagem {numero} sem transcrição após {max_tentativas} tentativas")
+        
+        print(f"\n🔎 Imagens transcritas pelo OCR local: {self.origens['ocr']} | pelo Copilot: {self.origens['copilot']} "
+              f"| reaproveitadas de imagens repetidas: {self.origens['repetida']}")
+        resumo = fila.resumo()
+        print("📊 Resultado da fila: " + " | ".join(f"{status}: {total}" for status, total in sorted(resumo.items())))
+        if fila.desistidas:
+            print(f"⛔ {len(fila.desistidas)} imagens continuam sem transcrição e serão refeitas na próxima execução: "
+                  f"{sorted(fila.desistidas)}")
+        if duplicatas:
+            # Repetidas que não reaproveitaram a original: transcritas à parte ou ainda sem transcrição
+            falhas = {
+                numero: f"transcrita pelo {ROTULOS_ORIGEM[self.tempos_imagens[numero][0]]}" if numero in questoes_por_numero
+                else "sem transcrição"
+                for numero in falhas_reaproveitamento - set(reaproveitadas)
+            }
+            self.salvar_relatorio_duplicatas(duplicatas, reaproveitadas, falhas, imagens, pasta_saida)
+        return [questoes_por_numero[numero] for numero in sorted(questoes_por_numero)]
     
-    def converter_para_formato_django(self, questoes):
-        """Converte as questões para o formato Django fixtures"""
-        fixture_data = []
-        
-        # Contadores para PKs
-        question_pk = 1
-        alternative_pk = 1
-        correct_source_pk = 1
+    def iterar_formato_django(self, questoes, registro=None):
+        """Gera, questão a questão, os objetos do fixture Django
         
-        current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        Os pks e as datas vêm do registro de chaves, estáveis entre execuções;
+        sem registro, os pks são atribuídos em sequência a partir de 1.
+        """
+        if registro is None:
+            registro = RegistroChaves()
+            registro.iniciar_saida()
         
         for questao in questoes:
-            # Adicionar objeto Question
-            fixture_data.append({
-                "model": "yourapp.Question",
-                "pk": question_pk,
-                "fields": {
-                    "submitted_by": 1,
-                    "reviewed_by": 2,
-                    "text": questao['enunciado'],
-                    "level": "HCIA",
-                    "has_answer": True,
-                    "has_multiple_answers": False,
-                    "track": "Cloud",
-                    "weight": "1.00",
-                    "approved_at": current_time,
-                    "last_update": current_time
-                }
-            })
-            
-            # Adicionar objetos Alternative
-            for letra, texto in questao['itens'].items():
-                is_correct = (letra == questao['item_correto'])
-                
-                fixture_data.append({
-                    "model": "yourapp.Alternative",
-                    "pk": alternative_pk,
-                    "fields": {
-                        "question": question_pk,
-                        "text": texto,
-                        "is_correct": is_correct
-                    }
-                })
-                
-                # Se for a alternativa correta, adicionar CorrectAnswersSources
-                if is_correct:
-                    fixture_data.append({
-                        "model": "yourapp.CorrectAnswersSources",
-                        "pk": correct_source_pk,
-                        "fields": {
-                            "alternative": alternative_pk,
-                            "source": "https://support.huaweicloud.com/hcs-introduction/index.html"
-                        }
-                    })
-                    correct_source_pk += 1
-                
-                alternative_pk += 1
-            
-            question_pk += 1
-        
-        return fixture_data
+            campos = {
+                "submitted_by": 1,
+                "reviewed_by": 2,
+                "text": questao['enunciado'],
+                "level": "HCIA",
+                "has_answer": True,
+                "has_multiple_answers": False,
+                "track": "Cloud",
+                "weight": "1.00"
+            }
+            alternativas = [
+                (letra, texto, letra == questao['item_correto'])
+                for letra, texto in questao['itens'].items()
+            ]
+            # A alternativa correta recebe uma CorrectAnswersSources
+            fontes = {
+                letra: "https://support.huaweicloud.com/hcs-introduction/index.html"
+                for letra, _, is_correct in alternativas if is_correct
+            }
+            yield from registro.objetos_questao(campos, alternativas, fontes)
     
-    def salvar_json_django_fixture(self, fixture_data, pasta_saida):
-        """Salva as questões no formato Django fixture"""
+    def converter_para_formato_django(self, questoes, registro=None):
+        """Converte as questões para o formato Django fixtures (lista em memória)"""
+        return list(self.iterar_formato_django(questoes, registro))
+    
+    def salvar_json_django_fixture(self, fixture_data, pasta_saida, compacto=False):
+        """Salva as questões no formato Django fixture, objeto a objeto
+        
+        fixture_data pode ser um gerador (iterar_formato_django): nada é mantido
+        em memória. Com compacto=True cada objeto ocupa uma linha, sem indentação.
+        Retorna o caminho do fixture e as estatísticas calculadas durante a gravação.
+        """
         os.makedirs(pasta_saida, exist_ok=True)
         
         caminho_json = os.path.join(pasta_saida, "questions_fixture.json")
         
-        with open(caminho_json, 'w', encoding='utf-8') as f:
-            json.dump(fixture_data, f, ensure_ascii=False, indent=2)
+        escritor = salvar_fixture(caminho_json, fixture_data, compacto)
         
         print(f"📄 Arquivo Django fixture salvo em: {caminho_json}")
-        print(f"📊 Total de objetos salvos: {len(fixture_data)}")
+        print(f"📊 Total de objetos salvos: {escritor.total_objetos}")
         
         # Estatísticas
-        questions_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Question')
-        alternatives_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Alternative')
-        sources_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.CorrectAnswersSources')
-        
         print(f"📈 Estatísticas:")
-        print(f"   - Questions: {questions_count}")
-        print(f"   - Alternatives: {alternatives_count}")
-        print(f"   - CorrectAnswersSources: {sources_count}")
+        print(f"   - Questions: {escritor.estatisticas.total_questoes}")
+        print(f"   - Alternatives: {escritor.estatisticas.total_alternativas}")
+        print(f"   - CorrectAnswersSources: {escritor.estatisticas.total_fontes}")
         
-        return caminho_json
+        return caminho_json, escritor.estatisticas
     
-    def gerar_relatorio_processamento(self, fixture_data, pasta_saida):
-        """Gera um relatório detalhado do processamento"""
+    def gerar_relatorio_processamento(self, estatisticas, pasta_saida):
+        """Gera um relatório detalhado do processamento (TXT e JSON) a partir das estatísticas do fixture"""
         caminho_relatorio = os.path.join(pasta_saida, "RELATORIO_PROCESSAMENTO.txt")
         
-        questions_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Question')
-        alternatives_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Alternative')
-        sources_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.CorrectAnswersSources')
-        
         with open(caminho_relatorio, 'w', encoding='utf-8') as f:
             f.write("RELATÓRIO DE PROCESSAMENTO DE QUESTÕES (FORMATO DJANGO)\n")
             f.write("=" * 60 + "\n\n")
             
-            f.write(f"Total de questões processadas: {questions_count}\n")
-            f.write(f"Total de alternativas: {alternatives_count}\n")
-            f.write(f"Total de fontes de resposta correta: {sources_count}\n")
-            f.write(f"Total de objetos no fixture: {len(fixture_data)}\n\n")
+            f.write(f"Total de questões processadas: {estatisticas.total_questoes}\n")
+            f.write(f"Total de alternativas: {estatisticas.total_alternativas}\n")
+            f.write(f"Total de fontes de resposta correta: {estatisticas.total_fontes}\n")
+            f.write(f"Total de objetos no fixture: {estatisticas.total_objetos}\n")
+            estatisticas.escrever_histogramas(f)
+            f.write("\n")
             
             f.write("ESTRUTURA DO FIXTURE:\n")
             f.write("-" * 30 + "\n")
             
-            for i in range(1, questions_count + 1):
-                question_alternatives = [alt for alt in fixture_data 
-                                       if alt['model'] == 'yourapp.Alternative' and alt['fields']['question'] == i]
-                correct_alternative = [alt for alt in question_alternatives if alt['fields']['is_correct']]
-                
-                f.write(f"\nQuestão {i}:\n")
-                f.write(f"  Alternativas: {len(question_alternatives)}\n")
-                f.write(f"  Correta: {'Sim' if correct_alternative else 'Não'}\n")
-                if correct_alternative:
-                    f.write(f"  ID da alternativa correta: {correct_alternative[0]['pk']}\n")
+            for questao_id, questao in estatisticas.questoes.items():
+                f.write(f"\nQuestão {questao_id}:\n")
+                f.write(f"  Alternativas: {questao['alternativas']}\n")
+                f.write(f"  Correta: {'Sim' if questao['corretas'] else 'Não'}\n")
+                if questao['corretas']:
+                    f.write(f"  ID da alternativa correta: {questao['alternativa_correta']}\n")
         
-        print(f"📊 Relatório de processamento salvo em: {caminho_relatorio}")
+        caminho_json = estatisticas.salvar_json(os.path.join(pasta_saida, "RELATORIO_PROCESSAMENTO.json"))
+        print(f"📊 Relatório de processamento salvo em: {caminho_relatorio} (e {os.path.basename(caminho_json)})")
     
     def processar_documento(self, arquivo_docx, pasta_saida="questoes_processadas"):
         """Processa o documento completo usando Copilot com sistema de checkpoint"""
@@ -612,10 +685,7 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
         if not self.verificar_dependencias():
             return
         
-        # 1. Verificar checkpoint
-        ultimo_numero, numeros_processados = self.verificar_checkpoint(pasta_saida)
-        
-        # 2. Extrair imagens do DOCX
+        # 1. Extrair imagens do DOCX (antes do checkpoint, que depende de quais imagens mudaram)
         pasta_imagens = os.path.join(pasta_saida, "imagens_extraidas")
         imagens = self.extrair_imagens_docx(arquivo_docx, pasta_imagens)
         
@@ -623,18 +693,26 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
             print("❌ Nenhuma imagem encontrada no documento")
             return
         
+        # 2. Verificar checkpoint, descartando as transcrições de imagens regravadas
+        self.invalidar_imagens_alteradas(pasta_saida, imagens)
+        numeros_processados = self.verificar_checkpoint(pasta_saida)
+        
+        # Imagens repetidas reaproveitam a transcrição da primeira ocorrência
+        duplicatas = self.detectar_imagens_duplicadas(imagens)
+        
         # 3. Carregar questões já processadas
-        if ultimo_numero > 0:
+        if numeros_processados:
             print(f"📥 Carregando questões já processadas...")
             questoes_existentes = self.carregar_questoes_existentes(pasta_saida, numeros_processados)
         else:
             questoes_existentes = []
         
         # 4. Processar imagens restantes
-        novas_questoes = self.processar_imagens_restantes(imagens, pasta_saida, ultimo_numero)
+        novas_questoes = self.processar_imagens_restantes(imagens, pasta_saida, duplicatas)
+        self.fechar_diario()
         
-        # 5. Combinar questões existentes com novas
-        todas_questoes = questoes_existentes + novas_questoes
+        # 5. Combinar questões existentes com novas, na ordem do documento (lacunas refeitas entram no meio)
+        todas_questoes = sorted(questoes_existentes + novas_questoes, key=lambda questao: questao['numero'])
         
         if not todas_questoes:
             print("❌ Nenhuma questão foi processada")
@@ -642,13 +720,16 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
         
         # 6. Converter para formato Django fixture
         print(f"\n🔄 CONVERTENDO PARA FORMATO DJANGO FIXTURE...")
-        fixture_data = self.converter_para_formato_django(todas_questoes)
+        registro = registro_da_pasta(pasta_saida, "questions_fixture.json")
+        fixture_data = self.iterar_formato_django(todas_questoes, registro)
         
         # 7. Salvar resultados
         print(f"\n💾 SALVANDO RESULTADOS...")
         
-        caminho_json = self.salvar_json_django_fixture(fixture_data, pasta_saida)
-        self.gerar_relatorio_processamento(fixture_data, pasta_saida)
+        caminho_json, estatisticas = self.salvar_json_django_fixture(fixture_data, pasta_saida)
+        registro.salvar()
+        print(f"🔑 {registro.alteradas} questões novas ou alteradas desde a última execução")
+        self.gerar_relatorio_processamento(estatisticas, pasta_saida)
         
         # 8. Relatório final
         print(f"\n✅ PROCESSAMENTO CONCLUÍDO!")
@@ -661,7 +742,8 @@ Seja DIRETO e copie APENAS a transcrição fiel do texto da imagem. Não interpr
 
 def main():
     """Função principal"""
-    extrator = ExtratorTextoComCopilot()
+    ocr = OCRLocal()
+    extrator = ExtratorTextoComCopilot(ocr=ocr if ocr.disponivel() else None)
     
     # Configurações
     arquivo_docx = "ICT Computing - Questions Database.docx"
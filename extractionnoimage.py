@@ -4,15 +4,14 @@
 import os
 import re
 import json
-import time
-import pyautogui
-import pyperclip
-from datetime import datetime
 from docx import Document
 import xml.etree.ElementTree as ET
+from drivers_interface import DriverPyAutoGUI
+from escritor_fixture import salvar_fixture
+from registro_chaves import RegistroChaves, registro_da_pasta
 
 class ExtratorQuestoesDOCX:
-    def __init__(self):
+    def __init__(self, driver=None):
         self.coordenadas = {
             'campo_prompt': (3218, 559),
             'enviar_mensagem': (3790, 717),
@@ -22,6 +21,9 @@ class ExtratorQuestoesDOCX:
             'confirmar_exclusao': (3358, 625),
             'ver_mais_resposta': (3500, 895)
         }
+        # Backend que opera a janela do Copilot (DriverSimulado para rodar sem área de trabalho)
+        self.driver = driver or DriverPyAutoGUI()
+        self.driver.usar_coordenadas(self.coordenadas)
         
         # Prompt para organizar as questões - MAIS ESPECÍFICO
         self.prompt_organizacao = """ORGANIZE E SEPARE as seguintes questões de múltipla escolha. 
@@ -70,15 +72,12 @@ NÃO inclua o enunciado ou alternativas na resposta."""
     def verificar_dependencias(self):
         """Verifica se todas as dependências estão disponíveis"""
         try:
-            import pyautogui
-            import pyperclip
             from docx import Document
-            print("✅ Todas as dependências encontradas")
-            return True
         except ImportError as e:
             print(f"❌ Dependências não encontradas: {e}")
-            print("Instale com: pip install pyautogui pyperclip python-docx")
+            print("Instale com: pip install python-docx")
             return False
+        return self.driver.verificar()
     
     def extrair_texto_docx(self, arquivo_docx):
         """Extrai todo o texto do documento DOCX"""
@@ -127,43 +126,10 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         
         return partes
 
-    def clicar_coordenada(self, coordenada, descricao=""):
-        """Clica em uma coordenada específica"""
-        print(f"  🖱️ Clicando em {descricao}: {coordenada}")
-        x, y = coordenada
-        pyautogui.moveTo(x, y, duration=0.5)
-        time.sleep(0.5)
-        pyautogui.click()
-        time.sleep(1)
-    
-    def colar_texto(self, texto, descricao=""):
-        """Copia e cola texto"""
-        print(f"  📋 Colando {descricao} ({len(texto)} caracteres)")
-        pyperclip.copy(texto)
-        time.sleep(0.5)
-        pyautogui.hotkey('ctrl', 'v')
-        time.sleep(1)
-    
     def limpar_chat(self):
         """Limpa o chat do Copilot"""
         try:
-            self.clicar_coordenada(
-                self.coordenadas['icone_chat'], 
-                "Ícone do chat"
-            )
-            time.sleep(1)
-            
-            self.clicar_coordenada(
-                self.coordenadas['excluir_chat'], 
-                "Excluir chat"
-            )
-            time.sleep(1)
-            
-            self.clicar_coordenada(
-                self.coordenadas['confirmar_exclusao'], 
-                "Confirmar exclusão"
-            )
-            time.sleep(2)
+            self.driver.limpar_chat()
         except Exception as e:
             print(f"  ⚠️ Erro ao limpar chat: {e}")
     
@@ -171,11 +137,11 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         """Clica no botão 'Ver mais' para carregar a resposta completa"""
         print("  🔍 Clicando em 'Ver mais' para carregar resposta completa...")
         try:
-            self.clicar_coordenada(
-                self.coordenadas['ver_mais_resposta'], 
-                "Ver mais resposta"
+            self.driver.clicar(
+                'ver_mais_resposta', 
+                "Ver mais resposta",
+                espera=4
             )
-            time.sleep(3)
             return True
         except Exception as e:
             print(f"  ⚠️ Erro ao clicar em 'Ver mais': {e}")
@@ -187,36 +153,32 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         
         try:
             # 1. Clicar no campo de prompt
-            self.clicar_coordenada(
-                self.coordenadas['campo_prompt'], 
+            self.driver.clicar(
+                'campo_prompt', 
                 "Campo de prompt"
             )
             
             # 2. Colar o texto
-            self.colar_texto(texto, descricao)
+            self.driver.colar(texto, descricao)
             
             # 3. Enviar mensagem
-            self.clicar_coordenada(
-                self.coordenadas['enviar_mensagem'], 
+            self.driver.clicar(
+                'enviar_mensagem', 
                 "Enviar mensagem"
             )
             
-            print("  ⏳ Aguardando resposta do Copilot (35 segundos)...")
-            time.sleep(35)
+            # Aguardar a resposta começar e parar de mudar na tela (até 180 s; 35 s fixos sem captura)
+            print("  ⏳ Aguardando resposta do Copilot (até 180 segundos)...")
+            self.driver.aguardar_resposta(timeout=180, fallback=35)
             
             # 4. Clicar em "Ver mais" para carregar resposta completa
             self.ver_mais_resposta()
             
-            # 5. Copiar resposta
-            self.clicar_coordenada(
-                self.coordenadas['copiar_resposta'], 
-                "Copiar resposta"
-            )
-            time.sleep(2)
-            
-            # 6. Obter texto da área de transferência
+            # 5. Copiar resposta: o texto é lido assim que a cópia chega e para de mudar
             try:
-                texto_resposta = pyperclip.paste()
+                texto_resposta = self.driver.copiar_resposta()
+                if texto_resposta is None:
+                    return ""
                 print(f"  ✅ Resposta copiada ({len(texto_resposta)} caracteres)")
                 
                 return texto_resposta
@@ -242,7 +204,7 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         print("⏰ Iniciando em 5 segundos... Posicione o mouse no campo do Copilot!")
         for i in range(5, 0, -1):
             print(f"  {i}...")
-            time.sleep(1)
+            self.driver.dormir(1)
         
         for i, parte in enumerate(partes_texto, 1):
             print(f"\n{'='*50}")
@@ -273,7 +235,7 @@ NÃO inclua o enunciado ou alternativas na resposta."""
             # Pausa entre partes
             if i < len(partes_texto):
                 print("  ⏳ Aguardando 10 segundos antes da próxima parte...")
-                time.sleep(10)
+                self.driver.dormir(10)
         
         print(f"\n✅ Total de questões organizadas: {len(todas_questoes_organizadas)}")
         return todas_questoes_organizadas
@@ -437,7 +399,7 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         print("⏰ Iniciando em 3 segundos...")
         for i in range(3, 0, -1):
             print(f"  {i}...")
-            time.sleep(1)
+            self.driver.dormir(1)
         
         for i, questao in enumerate(questões_sem_gabarito, 1):
             print(f"\n{'='*40}")
@@ -474,7 +436,7 @@ NÃO inclua o enunciado ou alternativas na resposta."""
             # Pausa entre questões
             if i < len(questões_sem_gabarito):
                 print("  ⏳ Aguardando 8 segundos antes da próxima questão...")
-                time.sleep(8)
+                self.driver.dormir(8)
         
         return todas_questoes
 
@@ -517,75 +479,50 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         
         print(f"💾 {len(todas_questoes)} questões salvas em {pasta_intermediaria}")
 
-    def converter_para_formato_django(self, questoes):
-        """Converte as questões para o formato Django fixtures - MELHORADO"""
-        fixture_data = []
-        
-        question_pk = 1
-        alternative_pk = 1
-        correct_source_pk = 1
+    def iterar_formato_django(self, questoes, registro=None):
+        """Gera, questão a questão, os objetos do fixture Django - MELHORADO
         
-        current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        Os pks e as datas vêm do registro de chaves, estáveis entre execuções;
+        sem registro, os pks são atribuídos em sequência a partir de 1.
+        """
+        if registro is None:
+            registro = RegistroChaves()
+            registro.iniciar_saida()
         
         for questao in questoes:
             # Pular questões inválidas
             if not self.validar_questao_para_fixture(questao):
                 print(f"  ⚠️ Pulando questão {questao['numero']} - inválida para fixture")
                 continue
-                
-            # Adicionar objeto Question
-            fixture_data.append({
-                "model": "yourapp.Question",
-                "pk": question_pk,
-                "fields": {
-                    "submitted_by": 1,
-                    "reviewed_by": 2,
-                    "text": questao['enunciado'],
-                    "level": "HCIA",
-                    "has_answer": questao['tem_gabarito'],
-                    "has_multiple_answers": False,
-                    "track": "Computing",
-                    "weight": "1.00",
-                    "approved_at": current_time if questao['tem_gabarito'] else None,
-                    "last_update": current_time
-                }
-            })
-            
-            # Adicionar objetos Alternative
-            for letra, texto in sorted(questao['itens'].items()):
-                is_correct = (letra == questao['item_correto'])
-                
-                fixture_data.append({
-                    "model": "yourapp.Alternative",
-                    "pk": alternative_pk,
-                    "fields": {
-                        "question": question_pk,
-                        "text": texto,
-                        "is_correct": is_correct
-                    }
-                })
-                
-                # Se for a alternativa correta, adicionar CorrectAnswersSources
-                if is_correct and questao['tem_gabarito']:
-                    source_text = "Documento oficial"
-                    if "Resposta fornecida pelo Copilot" in questao.get('explicacao', ''):
-                        source_text = "Resposta fornecida pelo Copilot (não oficial)"
-                    
-                    fixture_data.append({
-                        "model": "yourapp.CorrectAnswersSources",
-                        "pk": correct_source_pk,
-                        "fields": {
-                            "alternative": alternative_pk,
-                            "source": source_text
-                        }
-                    })
-                    correct_source_pk += 1
-                
-                alternative_pk += 1
             
-            question_pk += 1
-        
-        return fixture_data
+            campos = {
+                "submitted_by": 1,
+                "reviewed_by": 2,
+                "text": questao['enunciado'],
+                "level": "HCIA",
+                "has_answer": questao['tem_gabarito'],
+                "has_multiple_answers": False,
+                "track": "Computing",
+                "weight": "1.00"
+            }
+            alternativas = [
+                (letra, texto, letra == questao['item_correto'])
+                for letra, texto in sorted(questao['itens'].items())
+            ]
+            
+            # A alternativa correta recebe uma CorrectAnswersSources
+            fontes = {}
+            if questao['tem_gabarito']:
+                source_text = "Documento oficial"
+                if "Resposta fornecida pelo Copilot" in questao.get('explicacao', ''):
+                    source_text = "Resposta fornecida pelo Copilot (não oficial)"
+                fontes = {letra: source_text for letra, _, is_correct in alternativas if is_correct}
+            
+            yield from registro.objetos_questao(campos, alternativas, fontes)
+    
+    def converter_para_formato_django(self, questoes, registro=None):
+        """Converte as questões para o formato Django fixtures (lista em memória)"""
+        return list(self.iterar_formato_django(questoes, registro))
 
     def validar_questao_para_fixture(self, questao):
         """Validação mais rigorosa para inclusão no fixture"""
@@ -605,37 +542,42 @@ NÃO inclua o enunciado ou alternativas na resposta."""
             
         return True
     
-    def salvar_json_django_fixture(self, fixture_data, pasta_saida):
-        """Salva as questões no formato Django fixture"""
+    def salvar_json_django_fixture(self, fixture_data, pasta_saida, compacto=False):
+        """Salva as questões no formato Django fixture, objeto a objeto
+        
+        fixture_data pode ser um gerador (iterar_formato_django): nada é mantido
+        em memória. Com compacto=True cada objeto ocupa uma linha, sem indentação.
+        Retorna o caminho do fixture e as estatísticas calculadas durante a gravação.
+        """
         os.makedirs(pasta_saida, exist_ok=True)
         
         caminho_json = os.path.join(pasta_saida, "questions_fixture.json")
         
-        with open(caminho_json, 'w', encoding='utf-8') as f:
-            json.dump(fixture_data, f, ensure_ascii=False, indent=2)
+        escritor = salvar_fixture(caminho_json, fixture_data, compacto)
         
         print(f"📄 Arquivo Django fixture salvo em: {caminho_json}")
-        print(f"📊 Total de objetos salvos: {len(fixture_data)}")
+        print(f"📊 Total de objetos salvos: {escritor.total_objetos}")
         
         # Estatísticas
-        questions_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Question')
-        alternatives_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.Alternative')
-        sources_count = sum(1 for item in fixture_data if item['model'] == 'yourapp.CorrectAnswersSources')
-        
         print(f"📈 Estatísticas:")
-        print(f"   - Questions: {questions_count}")
-        print(f"   - Alternatives: {alternatives_count}")
-        print(f"   - CorrectAnswersSources: {sources_count}")
+        print(f"   - Questions: {escritor.estatisticas.total_questoes}")
+        print(f"   - Alternatives: {escritor.estatisticas.total_alternativas}")
+        print(f"   - CorrectAnswersSources: {escritor.estatisticas.total_fontes}")
         
-        return caminho_json
+        return caminho_json, escritor.estatisticas
     
-    def gerar_relatorio_processamento(self, todas_questoes, fixture_data, pasta_saida):
-        """Gera um relatório detalhado do processamento"""
+    def gerar_relatorio_processamento(self, todas_questoes, estatisticas, pasta_saida):
+        """Gera um relatório detalhado do processamento (TXT e JSON)
+        
+        As questões extraídas são percorridas uma única vez; os números do
+        fixture vêm das estatísticas calculadas durante a gravação.
+        """
         caminho_relatorio = os.path.join(pasta_saida, "RELATORIO_PROCESSAMENTO.txt")
         
+        validas = [self.validar_questao_para_fixture(q) for q in todas_questoes]
         questões_com_gabarito = sum(1 for q in todas_questoes if q['tem_gabarito'])
-        questões_sem_gabarito = sum(1 for q in todas_questoes if not q['tem_gabarito'])
-        questões_validas_fixture = sum(1 for q in todas_questoes if self.validar_questao_para_fixture(q))
+        questões_sem_gabarito = len(todas_questoes) - questões_com_gabarito
+        questões_validas_fixture = sum(validas)
         
         with open(caminho_relatorio, 'w', encoding='utf-8') as f:
             f.write("RELATÓRIO DE PROCESSAMENTO DE QUESTÕES (TEXTO DOCX)\n")
@@ -645,12 +587,14 @@ NÃO inclua o enunciado ou alternativas na resposta."""
             f.write(f"Questões com gabarito no documento: {questões_com_gabarito}\n")
             f.write(f"Questões sem gabarito (processadas pelo Copilot): {questões_sem_gabarito}\n")
             f.write(f"Questões válidas para fixture: {questões_validas_fixture}\n")
-            f.write(f"Total de objetos no fixture: {len(fixture_data)}\n\n")
+            f.write(f"Total de objetos no fixture: {estatisticas.total_objetos}\n")
+            estatisticas.escrever_histogramas(f)
+            f.write("\n")
             
             f.write("DETALHES DAS QUESTÕES:\n")
             f.write("-" * 30 + "\n")
             
-            for questao in todas_questoes:
+            for questao, valida in zip(todas_questoes, validas):
                 f.write(f"\nQuestão {questao['numero']}:\n")
                 f.write(f"  Enunciado: {len(questao['enunciado'])} caracteres\n")
                 f.write(f"  Alternativas: {len(questao['itens'])}\n")
@@ -659,9 +603,15 @@ NÃO inclua o enunciado ou alternativas na resposta."""
                     f.write(f"  Item correto: {questao['item_correto']}\n")
                 if questao.get('explicacao'):
                     f.write(f"  Explicação: {len(questao['explicacao'])} caracteres\n")
-                f.write(f"  Válida para fixture: {'Sim' if self.validar_questao_para_fixture(questao) else 'Não'}\n")
-        
-        print(f"📊 Relatório de processamento salvo em: {caminho_relatorio}")
+                f.write(f"  Válida para fixture: {'Sim' if valida else 'Não'}\n")
+        
+        caminho_json = estatisticas.salvar_json(
+            os.path.join(pasta_saida, "RELATORIO_PROCESSAMENTO.json"),
+            questoes_identificadas=len(todas_questoes),
+            com_gabarito_documento=questões_com_gabarito,
+            validas_para_fixture=questões_validas_fixture
+        )
+        print(f"📊 Relatório de processamento salvo em: {caminho_relatorio} (e {os.path.basename(caminho_json)})")
     
     def processar_documento(self, arquivo_docx, pasta_saida="questoes_processadas_docx"):
         """Processa o documento DOCX usando abordagem em duas fases - MELHORADO"""
@@ -703,17 +653,20 @@ NÃO inclua o enunciado ou alternativas na resposta."""
         
         # 5. Converter para formato Django
         print(f"\n🔄 CONVERTENDO PARA FORMATO DJANGO FIXTURE...")
-        fixture_data = self.converter_para_formato_django(todas_questoes_com_gabarito)
+        registro = registro_da_pasta(pasta_saida, "questions_fixture.json")
+        fixture_data = self.iterar_formato_django(todas_questoes_com_gabarito, registro)
         
         # 6. Salvar resultados
         print(f"\n💾 SALVANDO RESULTADOS...")
-        caminho_json = self.salvar_json_django_fixture(fixture_data, pasta_saida)
-        self.gerar_relatorio_processamento(todas_questoes_com_gabarito, fixture_data, pasta_saida)
+        caminho_json, estatisticas = self.salvar_json_django_fixture(fixture_data, pasta_saida)
+        registro.salvar()
+        print(f"🔑 {registro.alteradas} questões novas ou alteradas desde a última execução")
+        self.gerar_relatorio_processamento(todas_questoes_com_gabarito, estatisticas, pasta_saida)
         
         # 7. Relatório final
         print(f"\n✅ PROCESSAMENTO CONCLUÍDO!")
         print(f"📄 Total de questões extraídas: {len(todas_questoes_com_gabarito)}")
-        print(f"📄 Questões válidas no fixture: {sum(1 for q in todas_questoes_com_gabarito if self.validar_questao_para_fixture(q))}")
+        print(f"📄 Questões válidas no fixture: {estatisticas.total_questoes}")
         print(f"📁 Pasta de saída: {pasta_saida}")
         print(f"📝 Arquivo principal: {os.path.basename(caminho_json)}")
 
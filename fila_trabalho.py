@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+
+STATUS_OK = 'ok'
+# Resultados que não produziram uma questão e voltam para a fila
+FALHAS = {
+    'vazia': "resposta vazia",
+    'ilegivel': "resposta sem enunciado ou alternativas",
+    'area_transferencia_antiga': "a área de transferência não recebeu uma resposta confirmada",
+    'erro': "erro na automação",
+    'imagem_alterada': "a imagem mudou depois da transcrição",
+}
+# Textos devolvidos pelos métodos de cópia quando nada foi copiado
+TEXTOS_SEM_RESPOSTA = {"Texto não pôde ser copiado"}
+
+
+def classificar_resultado(texto, questao):
+    """Status de uma transcrição: 'ok' ou uma das chaves de FALHAS
+
+    texto None indica que a área de transferência não mudou depois da cópia
+    ou que a cópia não se confirmou (ver DriverInterface.copiar_resposta).
+    """
+    if texto is None:
+        return 'area_transferencia_antiga'
+    if not texto.strip() or texto.strip() in TEXTOS_SEM_RESPOSTA:
+        return 'vazia'
+    if not questao or not questao.get('enunciado') or len(questao.get('itens', {})) < 2:
+        return 'ilegivel'
+    return STATUS_OK
+
+
+class FilaTrabalho:
+    """Fila das imagens a transcrever, montada a partir do diário de checkpoint
+
+    Entram na fila todas as imagens cujo último registro no diário não é 'ok',
+    em qualquer posição (não só depois da maior já processada), então uma
+    falha antiga não é pulada. Uma imagem que falha volta para a fila depois
+    de espera_base * fator_espera ** (tentativas - 1) segundos, enquanto as
+    outras seguem, até max_tentativas tentativas nesta execução; as que
+    esgotam as tentativas ficam em desistidas e serão tentadas de novo na
+    próxima execução, já que o diário continua sem 'ok' para elas.
+    """
+
+    def __init__(self, numeros, diario, max_tentativas=3, espera_base=30.0, fator_espera=2.0, relogio=None):
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.fator_espera = fator_espera
+        self.relogio = relogio
+        self.tentativas = {}
+        self.resultados = {}
+        self.desistidas = []
+        self.ja_concluidas = 0
+        self.heap = []
+        for numero in sorted(numeros):
+            registro = diario.registros.get(numero)
+            if registro is not None and registro['status'] == STATUS_OK:
+                self.ja_concluidas += 1
+                continue
+            heapq.heappush(self.heap, (0.0, numero))
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _agora(self):
+        return self.relogio() if self.relogio else 0.0
+
+    def proxima(self):
+        """(número, segundos até poder processá-la) da próxima imagem, ou None com a fila vazia"""
+        if not self.heap:
+            return None
+        pronta_em, numero = heapq.heappop(self.heap)
+        return numero, max(0.0, pronta_em - self._agora())
+
+    def concluir(self, numero, status):
+        """Registra o resultado de uma tentativa; falhas voltam para a fila com espera crescente"""
+        self.tentativas[numero] = self.tentativas.get(numero, 0) + 1
+        self.resultados[numero] = status
+        if status == STATUS_OK:
+            return
+        if self.tentativas[numero] >= self.max_tentativas:
+            self.desistidas.append(numero)
+            return
+        espera = self.espera_base * self.fator_espera ** (self.tentativas[numero] - 1)
+        heapq.heappush(self.heap, (self._agora() + espera, numero))
+        return espera
+
+    def resumo(self):
+        """Quantidade de imagens por status final nesta execução"""
+        contagem = {}
+        for status in self.resultados.values():
+            contagem[status] = contagem.get(status, 0) + 1
+        return contagem
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+TAMANHO_BLOCO = 64 * 1024
+ESPACOS = ' \t\r\n'
+
+
+def _iterar_fixture(caminho_arquivo, tamanho_bloco, com_posicoes):
+    decodificador = json.JSONDecoder()
+
+    # newline='' mantém o \r\n: o texto decodificado corresponde byte a byte ao arquivo,
+    # e as posições calculadas sobre ele servem para seek() no arquivo binário
+    with open(caminho_arquivo, 'r', encoding='utf-8', newline='') as f:
+        buffer = ''
+        posicao = 0
+        fim_arquivo = False
+        dentro_do_array = False
+        # Deslocamento em bytes do início do buffer e de um marcador dentro dele,
+        # avançado incrementalmente para que o cálculo das posições seja linear
+        bytes_inicio_buffer = 0
+        marcador = 0
+        bytes_marcador = 0
+
+        def bytes_ate(indice):
+            nonlocal marcador, bytes_marcador
+            bytes_marcador += len(buffer[marcador:indice].encode('utf-8'))
+            marcador = indice
+            return bytes_inicio_buffer + bytes_marcador
+
+        def descartar_consumido():
+            nonlocal buffer, posicao, bytes_inicio_buffer, marcador, bytes_marcador
+            if com_posicoes:
+                bytes_inicio_buffer = bytes_ate(posicao)
+                marcador = 0
+                bytes_marcador = 0
+            buffer = buffer[posicao:]
+            posicao = 0
+
+        def ler_bloco():
+            nonlocal buffer, fim_arquivo
+            bloco = f.read(tamanho_bloco)
+            if not bloco:
+                fim_arquivo = True
+            descartar_consumido()
+            buffer += bloco
+
+        while True:
+            # Pular espaços e separadores entre os objetos
+            while True:
+                while posicao < len(buffer) and buffer[posicao] in ESPACOS:
+                    posicao += 1
+                if posicao < len(buffer) or fim_arquivo:
+                    break
+                ler_bloco()
+
+            if posicao >= len(buffer):
+                raise ValueError(f"Fim inesperado do arquivo em {caminho_arquivo}")
+
+            caractere = buffer[posicao]
+
+            if not dentro_do_array:
+                if caractere != '[':
+                    raise ValueError(f"O fixture deve começar com '[': {caminho_arquivo}")
+                dentro_do_array = True
+                posicao += 1
+                continue
+
+            if caractere == ']':
+                return
+            if caractere == ',':
+                posicao += 1
+                continue
+
+            try:
+                objeto, fim = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+                # Objeto incompleto: ler mais um bloco e tentar novamente
+                ler_bloco()
+                continue
+
+            if fim == len(buffer) and not fim_arquivo:
+                # Um número no fim do bloco pode estar truncado
+                ler_bloco()
+                continue
+
+            if com_posicoes:
+                inicio_bytes = bytes_ate(posicao)
+                yield inicio_bytes, bytes_ate(fim), objeto
+            else:
+                yield objeto
+            posicao = fim
+
+            # Descartar o trecho já consumido para manter o buffer pequeno
+            if posicao > tamanho_bloco:
+                descartar_consumido()
+
+
+def iterar_objetos_fixture(caminho_arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê incrementalmente o array de um fixture Django, devolvendo um objeto por vez
+
+    Apenas o bloco atual e o objeto em decodificação ficam em memória, de modo
+    que fixtures de centenas de MB são percorridos com memória limitada.
+    """
+    return _iterar_fixture(caminho_arquivo, tamanho_bloco, com_posicoes=False)
+
+
+def iterar_objetos_com_posicoes(caminho_arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """Como iterar_objetos_fixture, mas devolve (byte inicial, byte final, objeto)"""
+    return _iterar_fixture(caminho_arquivo, tamanho_bloco, com_posicoes=True)
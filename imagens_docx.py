@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import posixpath
+import shutil
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+
+NS_RELACOES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PACOTE = "http://schemas.openxmlformats.org/package/2006/relationships"
+# Atributos que apontam para uma imagem: a:blip r:embed (DrawingML) e v:imagedata r:id (VML)
+ATRIBUTOS_IMAGEM = (f"{{{NS_RELACOES}}}embed", f"{{{NS_RELACOES}}}id")
+NOME_MANIFESTO = "MANIFESTO_IMAGENS.json"
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def relacoes_imagens(docx_zip):
+    """rId -> caminho da imagem no zip, das relações de word/document.xml"""
+    try:
+        dados = docx_zip.read("word/_rels/document.xml.rels")
+    except KeyError:
+        return {}
+    relacoes = {}
+    for relacao in ET.fromstring(dados).iter(f"{{{NS_PACOTE}}}Relationship"):
+        if not relacao.get("Type", "").endswith("/image") or relacao.get("TargetMode") == "External":
+            continue
+        alvo = relacao.get("Target", "")
+        caminho = alvo.lstrip("/") if alvo.startswith("/") else posixpath.normpath(posixpath.join("word", alvo))
+        relacoes[relacao.get("Id")] = caminho
+    return relacoes
+
+
+def imagens_em_ordem(docx_zip):
+    """Caminhos das imagens no zip na ordem em que aparecem em word/document.xml
+
+    O XML é lido em fluxo (iterparse), liberando cada elemento depois de
+    visto. Uma imagem usada mais de uma vez entra só na primeira posição; as
+    imagens de word/media/ que o documento não referencia vão para o fim, na
+    ordem do zip, para nenhuma ser perdida.
+    """
+    relacoes = relacoes_imagens(docx_zip)
+    ordem, vistas = [], set()
+    if relacoes:
+        with docx_zip.open("word/document.xml") as documento:
+            for _, elemento in ET.iterparse(documento, events=("end",)):
+                for atributo in ATRIBUTOS_IMAGEM:
+                    caminho = relacoes.get(elemento.get(atributo))
+                    if caminho is not None and caminho not in vistas:
+                        vistas.add(caminho)
+                        ordem.append(caminho)
+                elemento.clear()
+    existentes = set(docx_zip.namelist())
+    ordem = [caminho for caminho in ordem if caminho in existentes]
+    ordem += [
+        nome for nome in docx_zip.namelist()
+        if nome.startswith("word/media/") and posixpath.basename(nome) and nome not in vistas
+    ]
+    return ordem
+
+
+def crc_arquivo(caminho):
+    crc = 0
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b""):
+            crc = zlib.crc32(bloco, crc)
+    return crc
+
+
+class ExtratorImagensDocx:
+    """Extrai as imagens de um DOCX em ordem de documento, em fluxo e só quando mudaram
+
+    A imagem N é a N-ésima imagem referenciada em word/document.xml (rId das
+    relações), de modo que a numeração acompanha as questões do documento.
+    Cada imagem é copiada do zip para o disco em blocos, por um arquivo
+    temporário, sem ser lida inteira em memória. O manifesto da pasta guarda
+    tamanho, CRC-32 (o mesmo do zip) e mtime de cada arquivo gravado: se o
+    arquivo existente ainda tem esse tamanho e mtime e o CRC do manifesto é o
+    da entrada do zip, a imagem é pulada sem ler nada. Um arquivo existente sem
+    manifesto com o mesmo tamanho tem o CRC conferido lendo o arquivo.
+
+    Toda imagem regravada sem que o manifesto comprove o mesmo conteúdo (mesma
+    origem e CRC) sai com 'alterada' True e o número em alteradas, inclusive
+    quando sobrescreve um arquivo sem registro no manifesto, como os deixados
+    pelo extrator antigo: as transcrições feitas para aquele número podem ser
+    de outra imagem.
+    """
+
+    def __init__(self, pasta_destino):
+        self.pasta_destino = pasta_destino
+        self.caminho_manifesto = os.path.join(pasta_destino, NOME_MANIFESTO)
+        self.manifesto = self.carregar_manifesto()
+        self.gravadas = 0
+        self.puladas = 0
+        self.bytes_gravados = 0
+        self.alteradas = []
+
+    def carregar_manifesto(self):
+        if not os.path.exists(self.caminho_manifesto):
+            return {}
+        try:
+            with open(self.caminho_manifesto, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def salvar_manifesto(self):
+        caminho_temporario = self.caminho_manifesto + ".tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, ensure_ascii=False, indent=2)
+        os.replace(caminho_temporario, self.caminho_manifesto)
+
+    def identica(self, caminho, nome, info):
+        """True se o arquivo já gravado é a entrada info do zip"""
+        try:
+            estado = os.stat(caminho)
+        except FileNotFoundError:
+            return False
+        if estado.st_size != info.file_size:
+            return False
+        registro = self.manifesto.get(nome)
+        if registro and registro['tamanho'] == estado.st_size and registro['mtime_ns'] == estado.st_mtime_ns:
+            return registro['crc'] == info.CRC
+        return crc_arquivo(caminho) == info.CRC
+
+    def gravar(self, docx_zip, info, caminho):
+        caminho_temporario = caminho + ".tmp"
+        with docx_zip.open(info) as origem, open(caminho_temporario, 'wb') as destino:
+            shutil.copyfileobj(origem, destino, TAMANHO_BLOCO)
+        os.replace(caminho_temporario, caminho)
+        self.gravadas += 1
+        self.bytes_gravados += info.file_size
+
+    def extrair(self, arquivo_docx):
+        """Lista de {'caminho', 'nome', 'numero', 'origem', 'alterada'} das imagens, na ordem do documento"""
+        os.makedirs(self.pasta_destino, exist_ok=True)
+        imagens = []
+        with zipfile.ZipFile(arquivo_docx, 'r') as docx_zip:
+            for numero, origem in enumerate(imagens_em_ordem(docx_zip), 1):
+                info = docx_zip.getinfo(origem)
+                extensao = os.path.splitext(origem)[1] or '.png'
+                nome = f'questao_{numero:03d}{extensao}'
+                caminho = os.path.join(self.pasta_destino, nome)
+                alterada = False
+                try:
+                    if self.identica(caminho, nome, info):
+                        self.puladas += 1
+                    else:
+                        anterior = self.manifesto.get(nome)
+                        alterada = not anterior or anterior['origem'] != origem or anterior['crc'] != info.CRC
+                        self.gravar(docx_zip, info, caminho)
+                        if alterada:
+                            self.alteradas.append(numero)
+                    estado = os.stat(caminho)
+                    self.manifesto[nome] = {
+                        'origem': origem, 'tamanho': info.file_size, 'crc': info.CRC,
+                        'mtime_ns': estado.st_mtime_ns
+                    }
+                except Exception as e:
+                    print(f"  ⚠️ Erro na imagem {numero}: {e}")
+                    continue
+                imagens.append({
+                    'caminho': caminho, 'nome': nome, 'numero': numero, 'origem': origem, 'alterada': alterada
+                })
+        self.salvar_manifesto()
+        return imagens
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+LETRAS_ALTERNATIVAS = ['A', 'B', 'C', 'D', 'E']
+
+
+class FixtureNaoAgrupado(ValueError):
+    """O fixture não mantém cada questão junto de suas alternativas e fontes"""
+
+
+class LeitorFixture:
+    """Leitor de fixtures Django que indexa questões, alternativas e fontes em uma única passada"""
+
+    def __init__(self, fixture_data=None):
+        self.questoes = {}
+        self.alternativas = {}
+        self.alternativas_por_questao = {}
+        self.questao_por_alternativa = {}
+        self.fontes = []
+        self.total_objetos = 0
+
+        if fixture_data is not None:
+            self.indexar(fixture_data)
+
+    def indexar(self, fixture_data):
+        """Percorre o fixture uma única vez montando os índices questão→alternativas e alternativa→questão"""
+        for item in fixture_data:
+            self.adicionar_objeto(item)
+        return self
+
+    def adicionar_objeto(self, item):
+        """Adiciona um objeto do fixture aos índices"""
+        modelo = item['model']
+        self.total_objetos += 1
+
+        if modelo == 'yourapp.Question':
+            self.questoes[item['pk']] = item['fields']
+
+        elif modelo == 'yourapp.Alternative':
+            alternativa_id = item['pk']
+            questao_id = item['fields']['question']
+            self.alternativas[alternativa_id] = item['fields']
+            self.questao_por_alternativa[alternativa_id] = questao_id
+            self.alternativas_por_questao.setdefault(questao_id, []).append(alternativa_id)
+
+        elif modelo == 'yourapp.CorrectAnswersSources':
+            self.fontes.append((item['fields']['alternative'], item['fields']['source']))
+
+    def letras_da_questao(self, questao_id):
+        """Mapeia as alternativas de uma questão para letras seguindo a ordem dos PKs"""
+        ids_ordenados = sorted(self.alternativas_por_questao.get(questao_id, []))
+        return {
+            alt_id: LETRAS_ALTERNATIVAS[i] if i < len(LETRAS_ALTERNATIVAS) else 'A'
+            for i, alt_id in enumerate(ids_ordenados)
+        }
+
+    def montar_questao(self, questao_id):
+        """Monta o registro completo de uma questão a partir dos índices"""
+        campos = self.questoes[questao_id]
+        questao = {
+            'id': questao_id,
+            'enunciado': campos['text'],
+            'alternativas': {},
+            'item_correto': None,
+            'fonte': None,
+            'has_answer': campos['has_answer'],
+            'level': campos.get('level'),
+            'track': campos.get('track'),
+            'approved_at': campos.get('approved_at')
+        }
+
+        letras = self.letras_da_questao(questao_id)
+        # Mantém a ordem original do fixture para que a última alternativa correta prevaleça
+        for alternativa_id in self.alternativas_por_questao.get(questao_id, []):
+            campos_alt = self.alternativas[alternativa_id]
+            letra = letras[alternativa_id]
+            questao['alternativas'][letra] = {
+                'texto': campos_alt['text'],
+                'is_correct': campos_alt['is_correct']
+            }
+            if campos_alt['is_correct']:
+                questao['item_correto'] = letra
+
+        return questao
+
+    def extrair_questoes(self):
+        """Retorna todas as questões indexadas, com as fontes já associadas"""
+        questoes = {questao_id: self.montar_questao(questao_id) for questao_id in self.questoes}
+
+        # Associar fontes em O(1) pelo índice alternativa→questão
+        for alternativa_id, fonte in self.fontes:
+            questao_id = self.questao_por_alternativa.get(alternativa_id)
+            if questao_id in questoes:
+                questoes[questao_id]['fonte'] = fonte
+
+        return list(questoes.values())
+
+
+def iterar_questoes_agrupadas(objetos):
+    """Gera as questões de um fixture agrupado assim que cada uma termina
+
+    Cada Question deve vir seguida de suas Alternatives e CorrectAnswersSources,
+    como fazem os conversores deste projeto; só o grupo atual fica em memória.
+    As questões saem como em LeitorFixture.extrair_questoes. Um objeto fora do
+    grupo da sua questão (ou uma Question repetida) gera FixtureNaoAgrupado.
+    """
+    grupo = None
+    vistas = set()
+    for item in objetos:
+        modelo = item['model']
+        if modelo == 'yourapp.Question':
+            if item['pk'] in vistas:
+                raise FixtureNaoAgrupado(f"Question {item['pk']} aparece mais de uma vez")
+            vistas.add(item['pk'])
+            if grupo is not None:
+                yield from grupo.extrair_questoes()
+            grupo = LeitorFixture()
+        elif modelo == 'yourapp.Alternative':
+            if grupo is None or item['fields']['question'] not in grupo.questoes:
+                raise FixtureNaoAgrupado(f"Alternative {item['pk']} fora do grupo da sua questão")
+        elif modelo == 'yourapp.CorrectAnswersSources':
+            if grupo is None or item['fields']['alternative'] not in grupo.questao_por_alternativa:
+                raise FixtureNaoAgrupado(f"CorrectAnswersSources {item['pk']} fora do grupo da sua questão")
+        else:
+            continue
+        grupo.adicionar_objeto(item)
+
+    if grupo is not None:
+        yield from grupo.extrair_questoes()
+
+
+def explicacao_da_fonte(fonte):
+    """Usa a fonte como explicação quando ela indica uma resposta do Copilot"""
+    return fonte if fonte and "Copilot" in fonte else ''
+
+
+def questao_para_estudo(questao):
+    """Converte um registro extraído do fixture para o formato exibido pelo StudyApp"""
+    fonte = questao['fonte'] or ''
+    return {
+        'id': questao['id'],
+        'enunciado': questao['enunciado'],
+        'alternativas': questao['alternativas'],
+        'item_correto': questao['item_correto'],
+        'explicacao': explicacao_da_fonte(fonte),
+        'fonte': fonte,
+        'has_answer': questao['has_answer'],
+        'level': questao['level'],
+        'track': questao['track']
+    }
+
+
+def extrair_questoes_do_fixture(fixture_data):
+    """Atalho para indexar um fixture e extrair suas questões"""
+    return LeitorFixture(fixture_data).extrair_questoes()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import pickle
+
+VERSAO_MANIFESTO = 1
+NOME_MANIFESTO = "MANIFESTO_UNIFICACAO.json"
+NOME_ESTADO = ".estado_unificacao.pkl"
+
+
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """SHA-256 do conteúdo de um arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def hash_questao(questao):
+    """SHA-256 do registro extraído de uma questão (enunciado, alternativas, gabarito e fonte)"""
+    return hashlib.sha256(
+        json.dumps(questao, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def assinatura_arquivo(caminho):
+    """Tamanho e data de modificação, usados para detectar alterações sem ler o arquivo"""
+    estado = os.stat(caminho)
+    return {'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+
+
+class ManifestoUnificacao:
+    """Manifesto de uma pasta de saída da unificação
+
+    Registra, para cada fixture de origem, o tamanho, a data de modificação,
+    o hash do conteúdo e o hash de cada questão, além da assinatura dos
+    arquivos gerados. O estado do unificador (índice de duplicatas, origens e
+    precedências das questões mantidas e decisões de mesclagem)
+    é guardado ao lado, em NOME_ESTADO, para que uma nova execução aplique
+    apenas as questões novas.
+    """
+
+    def __init__(self, pasta_saida):
+        self.pasta_saida = pasta_saida
+        self.caminho = os.path.join(pasta_saida, NOME_MANIFESTO)
+        self.caminho_estado = os.path.join(pasta_saida, NOME_ESTADO)
+        self.dados = None
+
+    def carregar(self):
+        """Lê o manifesto; retorna False se ele não existe ou é de outra versão"""
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if dados.get('versao') != VERSAO_MANIFESTO:
+            return False
+        self.dados = dados
+        return True
+
+    def salvar(self, parametros, fontes, saidas):
+        """Grava o manifesto com as fontes processadas e a assinatura atual das saídas"""
+        self.dados = {
+            'versao': VERSAO_MANIFESTO,
+            'parametros': parametros,
+            'fontes': fontes,
+            'saidas': {nome: assinatura_arquivo(os.path.join(self.pasta_saida, nome)) for nome in saidas}
+        }
+        caminho_temporario = self.caminho + ".tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.dados, f, ensure_ascii=False, indent=2)
+        os.replace(caminho_temporario, self.caminho)
+
+    def carregar_estado(self):
+        """Estado do unificador da última execução, ou None"""
+        try:
+            with open(self.caminho_estado, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def salvar_estado(self, estado):
+        caminho_temporario = self.caminho_estado + ".tmp"
+        with open(caminho_temporario, 'wb') as f:
+            pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(caminho_temporario, self.caminho_estado)
+
+    def saidas_intactas(self):
+        """Verifica se os arquivos gerados não foram apagados nem alterados desde a última execução"""
+        for nome, assinatura in self.dados['saidas'].items():
+            caminho = os.path.join(self.pasta_saida, nome)
+            if not os.path.exists(caminho) or assinatura_arquivo(caminho) != assinatura:
+                return False
+        return True
+
+    def comparar_fontes(self, caminhos):
+        """Classifica os fixtures de origem em relação à última execução
+
+        Retorna (fontes, alterados): fontes é a lista de registros atualizados
+        (os inalterados reaproveitam o registro anterior) e alterados os índices
+        dos fixtures cujo conteúdo mudou. Retorna None se a lista ou a ordem dos
+        fixtures mudou, o que exige reprocessar tudo.
+        """
+        anteriores = self.dados['fontes']
+        if [os.path.abspath(c) for c in caminhos] != [f['caminho'] for f in anteriores]:
+            return None
+
+        fontes, alterados = [], []
+        for indice, (caminho, anterior) in enumerate(zip(caminhos, anteriores)):
+            assinatura = assinatura_arquivo(caminho)
+            if assinatura == {'tamanho': anterior['tamanho'], 'mtime_ns': anterior['mtime_ns']}:
+                fontes.append(anterior)
+                continue
+
+            # Data ou tamanho mudaram: só o hash do conteúdo confirma a alteração
+            sha256 = hash_arquivo(caminho)
+            fontes.append(dict(anterior, **assinatura, sha256=sha256))
+            if sha256 != anterior['sha256']:
+                alterados.append(indice)
+        return fontes, alterados
+
+
+def registro_fonte(caminho, hashes_questoes):
+    """Registro de um fixture de origem para o manifesto"""
+    return dict(
+        caminho=os.path.abspath(caminho),
+        sha256=hash_arquivo(caminho),
+        questoes=hashes_questoes,
+        **assinatura_arquivo(caminho)
+    )
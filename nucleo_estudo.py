@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from cache_traducao import CacheTraducao
+from leitor_fixture import LETRAS_ALTERNATIVAS
+from tradutores import TradutorGoogle
+
+
+class SessaoEstudo:
+    """Estado e regras do StudyApp, sem dependência do Tk
+
+    Guarda a fonte de questões, a posição atual e o idioma, e produz os textos
+    que a interface exibe (tela_questao, texto_resposta, tela_traduzida). A
+    interface apenas copia esses textos para os widgets, de modo que a
+    navegação e a tradução podem ser executadas e medidas sem display.
+    """
+
+    def __init__(self, questoes=None, tradutor=None, cache_traducao=None, traducoes_previas=None):
+        self.questoes = questoes if questoes is not None else []
+        self.indice = 0
+        self.idioma = "english"  # ou "portuguese"
+        self.carregamento_concluido = False
+        self.tradutor = tradutor  # backend de tradução (ver tradutores.py); Google por padrão
+        self.cache_traducao = cache_traducao
+        self.traducoes_previas = traducoes_previas or {}  # fixture pré-traduzido, por id
+
+    # Tradução
+
+    def obter_tradutor(self):
+        """Cria o backend de tradução padrão apenas quando a tradução é usada pela primeira vez"""
+        if self.tradutor is None:
+            self.tradutor = TradutorGoogle()
+        return self.tradutor
+
+    def traduzir_textos(self, textos, alvo='pt'):
+        """Traduz uma lista de textos em uma única chamada ao backend
+
+        Apenas os textos ausentes do cache persistente são enviados ao tradutor.
+        """
+        if self.cache_traducao is None:
+            self.cache_traducao = CacheTraducao()
+
+        def traduzir_online(originais):
+            return self.obter_tradutor().traduzir_lote(originais, alvo)
+
+        return self.cache_traducao.traduzir_lote(textos, alvo, traduzir_online)
+
+    # Navegação
+
+    def questao_atual(self):
+        """Registro da questão na posição atual, ou None se não há questões"""
+        if not self.questoes:
+            return None
+        return self.questoes[self.indice]
+
+    def proxima(self):
+        """Avança uma questão; retorna False se já está na última"""
+        if self.indice < len(self.questoes) - 1:
+            self.indice += 1
+            return True
+        return False
+
+    def anterior(self):
+        """Volta uma questão; retorna False se já está na primeira"""
+        if self.indice > 0:
+            self.indice -= 1
+            return True
+        return False
+
+    def filtrar(self, level=None, track=None):
+        """Aplica os filtros de level e track da fonte de questões e volta ao início"""
+        self.questoes.filtrar(level, track)
+        self.indice = 0
+
+    def ir_para_id(self, questao_id):
+        """Vai para a questão com o id informado; retorna False se ela não está no filtro atual"""
+        indice = self.questoes.indice_por_id(questao_id)
+        if indice is None:
+            return False
+        self.indice = indice
+        return True
+
+    def pre_carregar(self):
+        """Pré-carrega as questões vizinhas, quando a fonte suporta"""
+        if hasattr(self.questoes, 'pre_carregar'):
+            self.questoes.pre_carregar(self.indice)
+
+    def alternar_idioma(self):
+        """Alterna entre inglês e português e retorna o novo idioma"""
+        self.idioma = "portuguese" if self.idioma == "english" else "english"
+        return self.idioma
+
+    # Textos exibidos
+
+    def texto_info(self, questao=None):
+        """Posição, level e track da questão atual"""
+        questao = questao or self.questao_atual()
+        total = str(len(self.questoes)) if self.carregamento_concluido else f"{len(self.questoes)}+"
+        return f"Questão {self.indice + 1}/{total} | {questao['level']} | {questao['track']}"
+
+    def tela_questao(self):
+        """Textos da questão atual no idioma original: info, enunciado e as cinco alternativas"""
+        questao = self.questao_atual()
+        return {
+            'info': self.texto_info(questao),
+            'enunciado': questao['enunciado'],
+            'alternativas': [
+                questao['alternativas'][letra]['texto'] if letra in questao['alternativas'] else ""
+                for letra in LETRAS_ALTERNATIVAS
+            ]
+        }
+
+    @staticmethod
+    def formatar_resposta(questao, explicacao):
+        """Texto da área de resposta: gabarito, explicação e fonte"""
+        resposta_texto = f"RESPOSTA CORRETA: {questao['item_correto']}\n\n"
+
+        if explicacao:
+            resposta_texto += f"EXPLICAÇÃO:\n{explicacao}\n\n"
+
+        if questao['fonte']:
+            resposta_texto += f"FONTE: {questao['fonte']}"
+
+        return resposta_texto
+
+    def texto_resposta(self):
+        """Resposta correta e explicação da questão atual"""
+        questao = self.questao_atual()
+        if not questao['has_answer']:
+            return "Esta questão não possui gabarito definido."
+        return self.formatar_resposta(questao, questao['explicacao'])
+
+    def tela_traduzida(self):
+        """Textos da questão atual em português
+
+        Usa o fixture pré-traduzido quando disponível; caso contrário, enunciado,
+        alternativas e explicação vão ao tradutor em um único lote. 'resposta' é
+        None quando não há explicação a traduzir.
+        """
+        questao = self.questao_atual()
+        letras = [letra for letra in LETRAS_ALTERNATIVAS if letra in questao['alternativas']]
+        segmentos = [questao['enunciado']] + [questao['alternativas'][letra]['texto'] for letra in letras]
+        if questao['explicacao']:
+            segmentos.append(questao['explicacao'])
+
+        previa = self.traducoes_previas.get(questao['id'])
+        if previa:
+            # Fixture pré-traduzido; as explicações já estão em português
+            traduzidos = [previa['enunciado']] + [
+                previa['alternativas'].get(letra, questao['alternativas'][letra]['texto'])
+                for letra in letras
+            ]
+            if questao['explicacao']:
+                traduzidos.append(questao['explicacao'])
+        else:
+            # Traduções já feitas vêm do cache, sem acesso à rede
+            traduzidos = self.traduzir_textos(segmentos)
+
+        alternativas = dict(zip(letras, traduzidos[1:1 + len(letras)]))
+        return {
+            'enunciado': traduzidos[0],
+            'alternativas': [alternativas.get(letra, "") for letra in LETRAS_ALTERNATIVAS],
+            'resposta': self.formatar_resposta(questao, traduzidos[-1]) if questao['explicacao'] else None
+        }
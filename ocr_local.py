@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import re
+
+# Confiança média mínima (0-100, por palavra, do Tesseract) para aceitar a transcrição local
+LIMIAR_CONFIANCA_PADRAO = 75
+# Imagens mais estreitas que isto são ampliadas antes do OCR (o Tesseract prefere texto com ~30 px de altura)
+LARGURA_MINIMA = 2000
+
+# Elementos da página do simulado que não fazem parte da questão
+RUIDO = re.compile(
+    r'^(single|multiple)[- ]answer question|^true[/ -]false question|^question \d+\s*/\s*\d+|use arrow keys'
+    r'|^previous\b|^next\b|feedback on answer|^congratulations|^sorry\b|my score',
+    re.IGNORECASE
+)
+# "A. texto" ou "A) texto", com o botão de opção às vezes lido como "O", "0" ou um símbolo
+ALTERNATIVA = re.compile(r'^(?:[oO0]\s+|[^\w\s]+\s*)?([A-E])[.)]\s+(.+)$')
+RESPOSTA = re.compile(r'\bAnswer\s*[:：]\s*([A-E](?:\s*[,、]?\s*[A-E])*)\b')
+EXPLICACAO = re.compile(r'^Answer Explanations?\s*[:：]?\s*(.*)$', re.IGNORECASE)
+
+
+def limiar_otsu(histograma):
+    """Limiar de binarização de Otsu para um histograma de 256 tons de cinza"""
+    total = sum(histograma)
+    soma_total = sum(i * n for i, n in enumerate(histograma))
+    soma_fundo, peso_fundo = 0, 0
+    melhor, limiar = -1, 127
+    for i, n in enumerate(histograma):
+        peso_fundo += n
+        if peso_fundo == 0:
+            continue
+        peso_frente = total - peso_fundo
+        if peso_frente == 0:
+            break
+        soma_fundo += i * n
+        media_fundo = soma_fundo / peso_fundo
+        media_frente = (soma_total - soma_fundo) / peso_frente
+        variancia = peso_fundo * peso_frente * (media_fundo - media_frente) ** 2
+        if variancia > melhor:
+            melhor, limiar = variancia, i
+    return limiar
+
+
+def formatar_transcricao(linhas):
+    """Monta, a partir das linhas lidas de uma imagem de questão, o texto no formato pedido ao Copilot
+
+    Retorna None se não encontrar enunciado, ao menos duas alternativas e a
+    resposta entre elas, o que manda a imagem para o Copilot.
+    """
+    texto_completo = "\n".join(linhas)
+    resposta = RESPOSTA.search(texto_completo)
+    enunciado, itens, explicacao = [], {}, None
+    letra_atual = None
+
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha:
+            continue
+        if explicacao is not None:
+            explicacao.append(linha)
+            continue
+        encontrado = EXPLICACAO.match(linha)
+        if encontrado:
+            explicacao = [encontrado.group(1)] if encontrado.group(1) else []
+            continue
+        if RUIDO.search(linha):
+            letra_atual = None
+            continue
+        encontrado = ALTERNATIVA.match(linha)
+        if encontrado and encontrado.group(1) not in itens:
+            letra_atual = encontrado.group(1)
+            itens[letra_atual] = encontrado.group(2).strip()
+        elif letra_atual is not None:
+            itens[letra_atual] += " " + linha
+        elif not itens:
+            enunciado.append(linha)
+
+    corretas = re.findall(r'[A-E]', resposta.group(1)) if resposta else []
+    if not enunciado or len(itens) < 2 or not corretas or any(letra not in itens for letra in corretas):
+        return None
+
+    explicacao = "\n".join(explicacao or [])
+    if explicacao.strip().lower() == "nothing":
+        explicacao = ""
+    partes = [f"ENUNCIADO: {' '.join(enunciado)}", "", "ITENS:"]
+    partes += [f"{letra}) {itens[letra]}" for letra in sorted(itens)]
+    partes += ["", f"ITEM CORRETO: {', '.join(corretas)}", "", f"EXPLICAÇÃO: {explicacao}"]
+    return "\n".join(partes)
+
+
+class OCRLocal:
+    """Transcreve as imagens de questões com o Tesseract (pytesseract) depois de um pré-processamento no Pillow
+
+    A imagem vai para tons de cinza, é ampliada se for pequena, tem o contraste
+    esticado e é binarizada pelo limiar de Otsu. transcrever() devolve o texto
+    já no formato ENUNCIADO/ITENS/ITEM CORRETO/EXPLICAÇÃO lido por
+    extrair_informacoes_resposta, junto com a confiança média das palavras;
+    a transcrição só é aceita se a confiança passar do limiar e o texto tiver
+    enunciado, alternativas e resposta. Pillow e pytesseract são importados
+    apenas no primeiro uso.
+    """
+
+    def __init__(self, idioma='eng+por', limiar_confianca=LIMIAR_CONFIANCA_PADRAO):
+        self.idioma = idioma
+        self.limiar_confianca = limiar_confianca
+
+    def disponivel(self):
+        """True se Pillow, pytesseract e o executável do Tesseract estão instalados"""
+        try:
+            import pytesseract
+            from PIL import Image
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception as e:
+            print(f"⚠️ OCR local indisponível ({e}); todas as imagens irão para o Copilot")
+            print("Instale com: pip install pillow pytesseract (e o pacote tesseract-ocr do sistema)")
+            return False
+
+    def preprocessar(self, caminho_imagem):
+        from PIL import Image, ImageOps
+        imagem = ImageOps.grayscale(Image.open(caminho_imagem))
+        if imagem.width < LARGURA_MINIMA:
+            fator = LARGURA_MINIMA / imagem.width
+            imagem = imagem.resize((LARGURA_MINIMA, round(imagem.height * fator)), Image.LANCZOS)
+        imagem = ImageOps.autocontrast(imagem)
+        limiar = limiar_otsu(imagem.histogram())
+        return imagem.point(lambda tom: 255 if tom > limiar else 0)
+
+    def reconhecer(self, caminho_imagem):
+        """Linhas de texto da imagem e a confiança média das palavras (0-100)"""
+        import pytesseract
+        dados = pytesseract.image_to_data(
+            self.preprocessar(caminho_imagem), lang=self.idioma, config='--psm 4',
+            output_type=pytesseract.Output.DICT
+        )
+        linhas, confiancas = {}, []
+        for i, palavra in enumerate(dados['text']):
+            confianca = float(dados['conf'][i])
+            if not palavra.strip() or confianca < 0:
+                continue
+            chave = (dados['block_num'][i], dados['par_num'][i], dados['line_num'][i])
+            linhas.setdefault(chave, []).append(palavra)
+            confiancas.append((confianca, len(palavra)))
+        total_caracteres = sum(tamanho for _, tamanho in confiancas)
+        confianca_media = (
+            sum(confianca * tamanho for confianca, tamanho in confiancas) / total_caracteres
+            if total_caracteres else 0.0
+        )
+        return [" ".join(palavras) for palavras in linhas.values()], confianca_media
+
+    def transcrever(self, caminho_imagem):
+        """{'texto', 'confianca', 'aceito', 'motivo'}; aceito=False indica que a imagem deve ir para o Copilot"""
+        try:
+            linhas, confianca = self.reconhecer(caminho_imagem)
+        except Exception as e:
+            return {'texto': None, 'confianca': 0.0, 'aceito': False, 'motivo': f"erro no OCR: {e}"}
+        texto = formatar_transcricao(linhas)
+        if texto is None:
+            motivo = "enunciado, alternativas ou resposta não reconhecidos"
+        elif confianca < self.limiar_confianca:
+            motivo = f"confiança {confianca:.0f} abaixo de {self.limiar_confianca}"
+        else:
+            motivo = ""
+        return {'texto': texto, 'confianca': confianca, 'aceito': not motivo, 'motivo': motivo}
+
+
+def main():
+    """Mostra a transcrição local de imagens de questões: python ocr_local.py questao_001.png [...] [--limiar 75]"""
+    parser = argparse.ArgumentParser(description="Transcreve imagens de questões com OCR local")
+    parser.add_argument("imagens", nargs="+")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_CONFIANCA_PADRAO,
+                        help="confiança mínima para aceitar a transcrição")
+    parser.add_argument("--idioma", default='eng+por')
+    args = parser.parse_args()
+
+    ocr = OCRLocal(args.idioma, args.limiar)
+    if not ocr.disponivel():
+        return
+    aceitas = 0
+    for caminho in args.imagens:
+        if not os.path.exists(caminho):
+            print(f"❌ Arquivo não encontrado: {caminho}")
+            continue
+        resultado = ocr.transcrever(caminho)
+        aceitas += resultado['aceito']
+        marcador = "✅" if resultado['aceito'] else "↪️ Copilot:"
+        print(f"\n{marcador} {os.path.basename(caminho)} (confiança {resultado['confianca']:.0f}) {resultado['motivo']}")
+        if resultado['texto']:
+            print(resultado['texto'])
+    print(f"\n📊 {aceitas}/{len(args.imagens)} imagens transcritas localmente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fixture_streaming import iterar_objetos_fixture
+from leitor_fixture import LeitorFixture
+from tradutores import TradutorGoogle, TradutorLocal
+
+CAMINHO_FIXTURE_PADRAO = "/home/yago/ICT-QUESTIONS/questoes_unificadas/questions_fixture_unificado.json"
+MODELOS_TRADUZIDOS = ('yourapp.Question', 'yourapp.Alternative')
+
+
+def caminho_traduzido(caminho_fixture, alvo='pt'):
+    """Caminho do fixture traduzido, ao lado do original: questions_fixture_unificado.pt.json"""
+    base, extensao = os.path.splitext(caminho_fixture)
+    return f"{base}.{alvo}{extensao}"
+
+
+def caminho_hashes_origem(caminho_fixture_traduzido):
+    """Hashes dos textos originais de cada questão traduzida: questions_fixture_unificado.pt.origem.json"""
+    base, extensao = os.path.splitext(caminho_fixture_traduzido)
+    return f"{base}.origem{extensao}"
+
+
+class LimitadorTaxa:
+    """Limita as requisições ao tradutor a uma taxa máxima, compartilhada entre as threads"""
+
+    def __init__(self, requisicoes_por_segundo):
+        self.intervalo = 1.0 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0.0
+        self.proxima_liberacao = 0.0
+        self.trava = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até a próxima requisição ser permitida"""
+        with self.trava:
+            agora = time.monotonic()
+            liberacao = max(agora, self.proxima_liberacao)
+            self.proxima_liberacao = liberacao + self.intervalo
+        if liberacao > agora:
+            time.sleep(liberacao - agora)
+
+
+class PreTradutorFixture:
+    """Gera uma versão traduzida do fixture unificado, questão por questão
+
+    Cada questão (enunciado e alternativas) é traduzida em um único lote por
+    um pool limitado de threads. As traduções concluídas são anexadas a um
+    arquivo de progresso JSONL, de modo que uma execução interrompida retoma
+    apenas as questões que faltam. O fixture traduzido mantém os mesmos pks
+    e só é gravado quando todas as questões foram traduzidas, junto com o hash
+    dos textos originais de cada questão (caminho_hashes_origem), que permite
+    ao StudyApp descartar traduções de questões alteradas depois.
+    """
+
+    def __init__(self, tradutor, alvo='pt', trabalhadores=4, requisicoes_por_segundo=5.0, tentativas=3):
+        self.tradutor = tradutor
+        self.alvo = alvo
+        self.trabalhadores = trabalhadores
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+        self.tentativas = tentativas
+
+    @staticmethod
+    def agrupar_segmentos(caminho_fixture):
+        """Agrupa por questão os textos a traduzir: {questao_id: [(modelo, pk, texto), ...]}"""
+        segmentos = {}
+        for item in iterar_objetos_fixture(caminho_fixture):
+            if item['model'] == 'yourapp.Question':
+                segmentos.setdefault(item['pk'], []).insert(0, (item['model'], item['pk'], item['fields']['text']))
+            elif item['model'] == 'yourapp.Alternative':
+                segmentos.setdefault(item['fields']['question'], []).append(
+                    (item['model'], item['pk'], item['fields']['text'])
+                )
+        return segmentos
+
+    @staticmethod
+    def hash_segmentos(segmentos):
+        """Identifica os textos originais de uma questão, para não reaproveitar traduções antigas"""
+        return hashlib.sha256("\0".join(texto for _, _, texto in segmentos).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def carregar_progresso(caminho_progresso):
+        """Lê as traduções já concluídas; uma última linha truncada por interrupção é ignorada"""
+        concluidas = {}
+        if not os.path.exists(caminho_progresso):
+            return concluidas
+        with open(caminho_progresso, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                concluidas[registro['questao']] = registro
+        return concluidas
+
+    def traduzir_questao(self, segmentos):
+        """Traduz os segmentos de uma questão em um lote, com novas tentativas e espera crescente"""
+        textos = [texto for _, _, texto in segmentos]
+        for tentativa in range(1, self.tentativas + 1):
+            self.limitador.aguardar()
+            try:
+                traducoes = self.tradutor.traduzir_lote(textos, self.alvo)
+                return {f"{modelo}:{pk}": traducao for (modelo, pk, _), traducao in zip(segmentos, traducoes)}
+            except Exception:
+                if tentativa == self.tentativas:
+                    raise
+                time.sleep(2 ** tentativa)
+
+    def traduzir(self, caminho_fixture, caminho_saida=None, caminho_progresso=None):
+        """Traduz o fixture inteiro e grava a versão traduzida; retorna o caminho ou None se houve falhas"""
+        caminho_saida = caminho_saida or caminho_traduzido(caminho_fixture, self.alvo)
+        caminho_progresso = caminho_progresso or caminho_saida + ".progresso.jsonl"
+
+        print(f"🌐 Pré-tradução de {caminho_fixture} para '{self.alvo}'")
+        segmentos = self.agrupar_segmentos(caminho_fixture)
+        concluidas = self.carregar_progresso(caminho_progresso)
+        hashes = {qid: self.hash_segmentos(segs) for qid, segs in segmentos.items()}
+        pendentes = [
+            qid for qid in segmentos
+            if str(qid) not in concluidas or concluidas[str(qid)].get('hash') != hashes[qid]
+        ]
+        print(f"📊 Questões: {len(segmentos)} | já traduzidas: {len(segmentos) - len(pendentes)} | pendentes: {len(pendentes)}")
+
+        falhas = {}
+        inicio = time.perf_counter()
+        with open(caminho_progresso, 'a', encoding='utf-8') as progresso, \
+                ThreadPoolExecutor(max_workers=self.trabalhadores) as executor:
+            fila = iter(pendentes)
+            em_andamento = {}
+            feitas = 0
+
+            while True:
+                # Manter no máximo 2 tarefas por thread em andamento
+                while len(em_andamento) < 2 * self.trabalhadores:
+                    qid = next(fila, None)
+                    if qid is None:
+                        break
+                    em_andamento[executor.submit(self.traduzir_questao, segmentos[qid])] = qid
+                if not em_andamento:
+                    break
+
+                prontas, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in prontas:
+                    qid = em_andamento.pop(futuro)
+                    try:
+                        traducoes = futuro.result()
+                    except Exception as e:
+                        falhas[qid] = str(e)
+                        continue
+                    registro = {'questao': str(qid), 'hash': hashes[qid], 'traducoes': traducoes}
+                    concluidas[str(qid)] = registro
+                    progresso.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                    progresso.flush()
+                    feitas += 1
+                    if feitas % 50 == 0 or feitas == len(pendentes):
+                        print(f"   ✅ {feitas}/{len(pendentes)} questões ({time.perf_counter() - inicio:.1f}s)")
+
+        if falhas:
+            print(f"❌ {len(falhas)} questões falharam; execute novamente para retomar. Exemplo: {next(iter(falhas.values()))}")
+            return None
+
+        self.salvar_fixture_traduzido(caminho_fixture, caminho_saida, concluidas)
+        os.remove(caminho_progresso)
+        print(f"💾 Fixture traduzido salvo em: {caminho_saida} ({self.tradutor.requisicoes} requisições)")
+        return caminho_saida
+
+    def salvar_fixture_traduzido(self, caminho_fixture, caminho_saida, traducoes_por_questao):
+        """Regrava o fixture original substituindo os textos traduzidos (mesmos pks e campos)"""
+        traducoes = {}
+        for registro in traducoes_por_questao.values():
+            traducoes.update(registro['traducoes'])
+
+        fixture_traduzido = []
+        for item in iterar_objetos_fixture(caminho_fixture):
+            if item['model'] in MODELOS_TRADUZIDOS:
+                chave = f"{item['model']}:{item['pk']}"
+                if chave in traducoes:
+                    item['fields']['text'] = traducoes[chave]
+            fixture_traduzido.append(item)
+
+        caminho_temporario = caminho_saida + ".tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(fixture_traduzido, f, ensure_ascii=False, indent=2)
+        os.replace(caminho_temporario, caminho_saida)
+
+        caminho_hashes = caminho_hashes_origem(caminho_saida)
+        with open(caminho_hashes + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({registro['questao']: registro['hash'] for registro in traducoes_por_questao.values()}, f)
+        os.replace(caminho_hashes + ".tmp", caminho_hashes)
+
+
+def carregar_hashes_origem(caminho_fixture_traduzido):
+    """{questao_id (str): hash dos textos originais} gravado com o fixture traduzido; None se não houver"""
+    caminho_hashes = caminho_hashes_origem(caminho_fixture_traduzido)
+    if not os.path.exists(caminho_hashes):
+        return None
+    try:
+        with open(caminho_hashes, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def carregar_traducoes_fixture(caminho_fixture_traduzido, caminho_fixture=None):
+    """Textos de um fixture pré-traduzido por id de questão, para o StudyApp
+
+    Retorna {questao_id: {'enunciado': texto, 'alternativas': {letra: texto}}}.
+    Com caminho_fixture (o fixture original), entram só as questões cujos
+    textos originais ainda têm o hash gravado na pré-tradução; as alteradas
+    depois ficam de fora e são traduzidas na hora. Um fixture traduzido sem
+    hashes (de uma versão anterior) só é usado se for mais novo que o original.
+    """
+    if caminho_fixture is not None:
+        hashes_traduzidos = carregar_hashes_origem(caminho_fixture_traduzido)
+        if hashes_traduzidos is None:
+            if os.path.getmtime(caminho_fixture_traduzido) < os.path.getmtime(caminho_fixture):
+                return {}
+        else:
+            hashes_atuais = {
+                questao_id: PreTradutorFixture.hash_segmentos(segmentos)
+                for questao_id, segmentos in PreTradutorFixture.agrupar_segmentos(caminho_fixture).items()
+            }
+
+    leitor = LeitorFixture()
+    for item in iterar_objetos_fixture(caminho_fixture_traduzido):
+        leitor.adicionar_objeto(item)
+    traducoes = {
+        questao['id']: {
+            'enunciado': questao['enunciado'],
+            'alternativas': {letra: alt['texto'] for letra, alt in questao['alternativas'].items()}
+        }
+        for questao in leitor.extrair_questoes()
+    }
+    if caminho_fixture is None or hashes_traduzidos is None:
+        return traducoes
+    return {
+        questao_id: textos for questao_id, textos in traducoes.items()
+        if questao_id in hashes_atuais and hashes_traduzidos.get(str(questao_id)) == hashes_atuais[questao_id]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma versão pré-traduzida do fixture unificado")
+    parser.add_argument("fixture", nargs="?", default=CAMINHO_FIXTURE_PADRAO)
+    parser.add_argument("--saida", help="fixture traduzido (padrão: <fixture>.<alvo>.json)")
+    parser.add_argument("--alvo", default="pt")
+    parser.add_argument("--trabalhadores", type=int, default=4)
+    parser.add_argument("--requisicoes-por-segundo", type=float, default=5.0)
+    parser.add_argument("--backend", choices=["google", "local"], default="google",
+                        help="'local' não acessa a rede (para testes)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fixture):
+        print(f"❌ Arquivo não encontrado: {args.fixture}")
+        return
+
+    tradutor = TradutorGoogle() if args.backend == "google" else TradutorLocal(latencia_requisicao=0.05)
+    PreTradutorFixture(
+        tradutor, alvo=args.alvo, trabalhadores=args.trabalhadores,
+        requisicoes_por_segundo=args.requisicoes_por_segundo
+    ).traduzir(args.fixture, args.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from deduplicacao_lsh import normalizar_texto
+from fixture_streaming import iterar_objetos_fixture
+from leitor_fixture import LeitorFixture
+
+VERSAO_REGISTRO = 1
+NOME_REGISTRO = "REGISTRO_CHAVES.json"
+FORMATO_DATA = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def identidade_questao(enunciado):
+    """Identidade estável de uma questão: hash do enunciado normalizado (sem numeração, acentos e pontuação)"""
+    return hashlib.sha256(normalizar_texto(enunciado).encode('utf-8')).hexdigest()[:20]
+
+
+def identidade_alternativas(textos):
+    """Hash dos textos das alternativas, normalizados e ordenados, que desempata questões de mesmo enunciado"""
+    normalizados = sorted(normalizar_texto(texto) for texto in textos)
+    return hashlib.sha256(json.dumps(normalizados, ensure_ascii=False).encode('utf-8')).hexdigest()[:20]
+
+
+def hash_conteudo(campos_questao, alternativas, fontes):
+    """Hash do conteúdo gravado no fixture, sem pks e datas
+
+    alternativas é uma lista de (letra, texto, is_correct) e fontes uma lista
+    de (letra, source); uma mudança em qualquer um deles atualiza last_update.
+    """
+    conteudo = [
+        campos_questao['text'], campos_questao['has_answer'], campos_questao.get('level'), campos_questao.get('track'),
+        sorted(alternativas), sorted(fontes)
+    ]
+    return hashlib.sha256(json.dumps(conteudo, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class RegistroChaves:
+    """Registro persistente dos pks e datas atribuídos a cada questão de um fixture
+
+    Cada questão é identificada pelo enunciado normalizado; questões com o mesmo
+    enunciado recebem "#2", "#3"... e são desempatadas pelo conteúdo, não pela
+    ordem em que aparecem (ver chave_questao). O pk da questão, de cada
+    alternativa (por letra) e de cada fonte de resposta é atribuído na primeira
+    vez em que aparece e reaproveitado nas execuções seguintes, mesmo que
+    outras questões entrem ou saiam do fixture; pks de questões removidas não
+    são reutilizados. approved_at e last_update só mudam quando o conteúdo da
+    questão muda, de modo que saídas consecutivas podem ser comparadas e
+    carregadas no banco apenas pelas linhas alteradas.
+    """
+
+    def __init__(self, caminho=None, agora=None):
+        self.caminho = caminho
+        self.agora = agora or datetime.now().strftime(FORMATO_DATA)
+        self.questoes = {}
+        self.proximos = {'questao': 1, 'alternativa': 1, 'fonte': 1}
+        self.em_uso = []
+        self.usadas = set()
+        self.chaves_por_identidade = None
+        self.alteradas = 0
+
+    def carregar(self):
+        """Lê o registro gravado; retorna False se ele não existe ou é de outra versão"""
+        if not self.caminho:
+            return False
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if dados.get('versao') != VERSAO_REGISTRO:
+            return False
+        self.questoes = dados['questoes']
+        self.proximos = dados['proximos']
+        self.em_uso = dados['em_uso']
+        return True
+
+    def carregar_ou_importar(self, caminho_fixture):
+        """Lê o registro ou, na primeira execução, adota os pks e datas do fixture já gravado"""
+        if self.carregar():
+            return True
+        if caminho_fixture and os.path.exists(caminho_fixture):
+            self.importar_fixture(iterar_objetos_fixture(caminho_fixture))
+            return True
+        return False
+
+    def importar_fixture(self, fixture_data):
+        """Registra os pks e datas de um fixture existente, para que a primeira saída com o registro não mude nada"""
+        leitor = LeitorFixture()
+        fontes_por_questao = {}
+        for item in fixture_data:
+            leitor.adicionar_objeto(item)
+            if item['model'] == 'yourapp.CorrectAnswersSources':
+                self.proximos['fonte'] = max(self.proximos['fonte'], item['pk'] + 1)
+                fontes_por_questao.setdefault(item['fields']['alternative'], []).append(
+                    (item['pk'], item['fields']['source'])
+                )
+
+        self.iniciar_saida()
+        for questao_id in sorted(leitor.questoes):
+            campos = leitor.questoes[questao_id]
+            letras = leitor.letras_da_questao(questao_id)
+            alternativas, fontes, textos, textos_fontes = {}, {}, [], []
+            for alternativa_id, letra in letras.items():
+                campos_alt = leitor.alternativas[alternativa_id]
+                alternativas[letra] = alternativa_id
+                textos.append((letra, campos_alt['text'], campos_alt['is_correct']))
+                for fonte_id, fonte in fontes_por_questao.get(alternativa_id, []):
+                    fontes[letra] = fonte_id
+                    textos_fontes.append((letra, fonte))
+
+            conteudo = hash_conteudo(campos, textos, textos_fontes)
+            assinatura = identidade_alternativas(texto for _, texto, _ in textos)
+            self.questoes[self.chave_questao(campos['text'], conteudo, assinatura)] = {
+                'pk': questao_id,
+                'conteudo': conteudo,
+                'assinatura': assinatura,
+                'approved_at': campos.get('approved_at'),
+                'last_update': campos.get('last_update'),
+                'alternativas': alternativas,
+                'fontes': fontes
+            }
+            self.proximos['questao'] = max(self.proximos['questao'], questao_id + 1)
+            if alternativas:
+                self.proximos['alternativa'] = max(self.proximos['alternativa'], max(alternativas.values()) + 1)
+
+    def iniciar_saida(self, continuar=False):
+        """Começa a atribuir chaves para uma nova saída
+
+        Com continuar=True as questões da última saída continuam em uso (a nova
+        saída é anexada a ela), e um enunciado repetido recebe outra chave.
+        """
+        anteriores = self.em_uso if continuar else []
+        self.em_uso = []
+        self.usadas = set()
+        self.alteradas = 0
+        for chave in anteriores:
+            self.marcar_em_uso(chave)
+
+    def marcar_em_uso(self, chave):
+        self.usadas.add(chave)
+        self.em_uso.append(chave)
+
+    def chaves_da_identidade(self, base):
+        """Chaves registradas para um enunciado (base, base#2, ...)"""
+        if self.chaves_por_identidade is None:
+            self.chaves_por_identidade = {}
+            for chave in self.questoes:
+                self.chaves_por_identidade.setdefault(chave.split('#', 1)[0], []).append(chave)
+        return self.chaves_por_identidade.setdefault(base, [])
+
+    def chave_questao(self, enunciado, conteudo=None, assinatura=None):
+        """Chave de uma questão da saída atual
+
+        Entre as chaves do mesmo enunciado ainda livres nesta saída vale a de
+        mesmo conteúdo, depois a de mesmas alternativas (assinatura); uma questão
+        alterada só herda a chave quando ela é a única registrada para o
+        enunciado. Assim a ordem das questões no fixture não troca os pks entre
+        questões de mesmo enunciado. Sem correspondência, a questão recebe uma
+        chave nova.
+        """
+        base = identidade_questao(enunciado)
+        chaves = self.chaves_da_identidade(base)
+        livres = sorted(chave for chave in chaves if chave not in self.usadas)
+        chave = next((c for c in livres if self.questoes[c]['conteudo'] == conteudo), None)
+        if chave is None and assinatura:
+            chave = next((c for c in livres if self.questoes[c].get('assinatura') == assinatura), None)
+        if chave is None and len(chaves) == 1 and livres:
+            chave = livres[0]
+        if chave is None:
+            chave, ocorrencia = base, 1
+            while chave in chaves:
+                ocorrencia += 1
+                chave = f"{base}#{ocorrencia}"
+            chaves.append(chave)
+        self.marcar_em_uso(chave)
+        return chave
+
+    def proximo_pk(self, tipo):
+        pk = self.proximos[tipo]
+        self.proximos[tipo] = pk + 1
+        return pk
+
+    def registrar_questao(self, enunciado, conteudo, aprovada, approved_at=None, assinatura=None):
+        """Atribui pk e datas a uma questão da saída atual
+
+        Retorna (chave, pk, approved_at, last_update). Uma questão sem alteração
+        mantém as datas registradas; uma nova ou alterada recebe self.agora em
+        last_update. approved_at vem do argumento, da aprovação registrada ou,
+        na primeira aprovação, de self.agora; é None se a questão não está aprovada.
+        """
+        chave = self.chave_questao(enunciado, conteudo, assinatura)
+        entrada = self.questoes.get(chave)
+        if entrada is None:
+            entrada = self.questoes[chave] = {
+                'pk': self.proximo_pk('questao'), 'conteudo': None, 'approved_at': None, 'last_update': None,
+                'alternativas': {}, 'fontes': {}
+            }
+        entrada['assinatura'] = assinatura
+
+        if entrada['conteudo'] != conteudo:
+            entrada['conteudo'] = conteudo
+            entrada['last_update'] = self.agora
+            self.alteradas += 1
+        if aprovada:
+            entrada['approved_at'] = approved_at or entrada['approved_at'] or self.agora
+        else:
+            entrada['approved_at'] = None
+        return chave, entrada['pk'], entrada['approved_at'], entrada['last_update']
+
+    def pk_alternativa(self, chave, letra):
+        alternativas = self.questoes[chave]['alternativas']
+        if letra not in alternativas:
+            alternativas[letra] = self.proximo_pk('alternativa')
+        return alternativas[letra]
+
+    def pk_fonte(self, chave, letra):
+        fontes = self.questoes[chave]['fontes']
+        if letra not in fontes:
+            fontes[letra] = self.proximo_pk('fonte')
+        return fontes[letra]
+
+    def objetos_questao(self, campos, alternativas, fontes, approved_at=None):
+        """Objetos do fixture de uma questão: Question, e cada Alternative seguida da sua CorrectAnswersSources
+
+        campos são os campos de Question sem as datas, alternativas uma lista de
+        (letra, texto, is_correct) e fontes um dicionário letra → source.
+        """
+        conteudo = hash_conteudo(campos, alternativas, list(fontes.items()))
+        chave, question_pk, approved_at, last_update = self.registrar_questao(
+            campos['text'], conteudo, campos['has_answer'], approved_at,
+            identidade_alternativas(texto for _, texto, _ in alternativas)
+        )
+        objetos = [{
+            "model": "yourapp.Question",
+            "pk": question_pk,
+            "fields": dict(campos, approved_at=approved_at, last_update=last_update)
+        }]
+        for letra, texto, is_correct in alternativas:
+            alternative_pk = self.pk_alternativa(chave, letra)
+            objetos.append({
+                "model": "yourapp.Alternative",
+                "pk": alternative_pk,
+                "fields": {
+                    "question": question_pk,
+                    "text": texto,
+                    "is_correct": is_correct
+                }
+            })
+            if letra in fontes:
+                objetos.append({
+                    "model": "yourapp.CorrectAnswersSources",
+                    "pk": self.pk_fonte(chave, letra),
+                    "fields": {
+                        "alternative": alternative_pk,
+                        "source": fontes[letra]
+                    }
+                })
+        return objetos
+
+    def salvar(self):
+        """Grava o registro (arquivo temporário + rename, para não deixar um registro truncado)"""
+        if not self.caminho:
+            return
+        dados = {
+            'versao': VERSAO_REGISTRO,
+            'proximos': self.proximos,
+            'em_uso': self.em_uso,
+            'questoes': self.questoes
+        }
+        caminho_temporario = self.caminho + ".tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(caminho_temporario, self.caminho)
+
+
+def registro_da_pasta(pasta_saida, nome_fixture, continuar=False):
+    """Registro de chaves de uma pasta de saída, pronto para uma nova saída
+
+    Na primeira execução (sem NOME_REGISTRO) adota os pks e datas do fixture
+    já gravado na pasta, para que a troca para o registro não altere nada.
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    registro = RegistroChaves(os.path.join(pasta_saida, NOME_REGISTRO))
+    registro.carregar_ou_importar(os.path.join(pasta_saida, nome_fixture))
+    registro.iniciar_saida(continuar)
+    return registro
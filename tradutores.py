@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+# Linha usada para juntar os segmentos de uma questão em uma única requisição
+SEPARADOR_SEGMENTOS = "\n\n§§§\n\n"
+LIMITE_CARACTERES_GOOGLE = 4500
+
+
+class TradutorBase:
+    """Interface dos backends de tradução: recebem uma lista de textos e devolvem a lista traduzida
+
+    requisicoes conta as idas e voltas ao serviço de tradução, para benchmarks.
+    """
+
+    def __init__(self):
+        self.requisicoes = 0
+
+    def traduzir_lote(self, textos, alvo):
+        raise NotImplementedError
+
+    def traduzir(self, texto, alvo):
+        """Traduz um único texto"""
+        return self.traduzir_lote([texto], alvo)[0]
+
+
+class TradutorGoogle(TradutorBase):
+    """Backend do Google Tradutor (deep_translator), importado apenas no primeiro uso
+
+    Os segmentos são agrupados em requisições de até LIMITE_CARACTERES_GOOGLE
+    caracteres, separados por SEPARADOR_SEGMENTOS. Se o serviço alterar o
+    separador e a divisão não bater, o grupo é traduzido segmento a segmento.
+    """
+
+    def __init__(self, origem='auto'):
+        super().__init__()
+        self.origem = origem
+        self._tradutores = {}
+
+    def _tradutor(self, alvo):
+        if alvo not in self._tradutores:
+            from deep_translator import GoogleTranslator
+            self._tradutores[alvo] = GoogleTranslator(source=self.origem, target=alvo)
+        return self._tradutores[alvo]
+
+    def _agrupar(self, textos):
+        grupos, grupo, tamanho = [], [], 0
+        for texto in textos:
+            acrescimo = len(texto) + len(SEPARADOR_SEGMENTOS)
+            if grupo and tamanho + acrescimo > LIMITE_CARACTERES_GOOGLE:
+                grupos.append(grupo)
+                grupo, tamanho = [], 0
+            grupo.append(texto)
+            tamanho += acrescimo
+        if grupo:
+            grupos.append(grupo)
+        return grupos
+
+    def traduzir_lote(self, textos, alvo):
+        tradutor = self._tradutor(alvo)
+        traducoes = []
+
+        for grupo in self._agrupar(textos):
+            self.requisicoes += 1
+            resposta = tradutor.translate(SEPARADOR_SEGMENTOS.join(grupo))
+            partes = [parte.strip() for parte in (resposta or '').split(SEPARADOR_SEGMENTOS.strip())]
+
+            if len(partes) != len(grupo):
+                # Separador não preservado: traduzir um segmento por requisição
+                partes = []
+                for texto in grupo:
+                    self.requisicoes += 1
+                    partes.append(tradutor.translate(texto))
+            traducoes.extend(partes)
+
+        return traducoes
+
+
+class TradutorLocal(TradutorBase):
+    """Backend local determinístico que simula a latência de um serviço de tradução
+
+    Não acessa a rede: cada chamada a traduzir_lote custa latencia_requisicao
+    segundos mais latencia_por_caractere por caractere enviado, e a "tradução"
+    é o texto original com o prefixo do idioma de destino.
+    """
+
+    def __init__(self, latencia_requisicao=0.0, latencia_por_caractere=0.0):
+        super().__init__()
+        self.latencia_requisicao = latencia_requisicao
+        self.latencia_por_caractere = latencia_por_caractere
+
+    def traduzir_lote(self, textos, alvo):
+        self.requisicoes += 1
+        time.sleep(self.latencia_requisicao + self.latencia_por_caractere * sum(len(t) for t in textos))
+        return [f"[{alvo}] {texto}" for texto in textos]
@@ -1,13 +1,49 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import itertools
 import json
 import os
-from datetime import datetime
+import sys
+from collections import Counter
+from banco_binario import salvar_banco_binario
+from banco_sqlite import salvar_banco_sqlite
+from deduplicacao_lsh import IndiceDuplicatas
+from escritor_fixture import anexar_ao_fixture, salvar_fixture
+from estatisticas_fixture import EstatisticasFixture
+from fixture_streaming import iterar_objetos_fixture
+from leitor_fixture import (
+    FixtureNaoAgrupado, LeitorFixture, explicacao_da_fonte, iterar_questoes_agrupadas, questao_para_estudo
+)
+from manifesto_unificacao import ManifestoUnificacao, hash_questao, registro_fonte
+from registro_chaves import RegistroChaves, registro_da_pasta
+from validador_fixture import validar_arquivo
+
+
+def precedencia_padrao(questao, indice_arquivo):
+    """Precedência de uma cópia de questão: gabarito com fonte oficial > resposta do Copilot > sem fonte > sem gabarito
+    
+    Entre cópias de mesma precedência vence a que foi lida primeiro.
+    """
+    fonte = questao.get('fonte') or ''
+    if not questao['has_answer']:
+        return 0
+    if not fonte:
+        return 1
+    if explicacao_da_fonte(fonte):
+        return 2
+    return 3
+
 
 class UnificadorQuestoes:
-    def __init__(self):
+    def __init__(self, limiar_enunciado=0.85, limiar_alternativas=0.5, precedencia=precedencia_padrao):
         self.questoes_unificadas = []
+        # Limiares de similaridade (Jaccard) para considerar duas questões duplicadas
+        self.limiar_enunciado = limiar_enunciado
+        self.limiar_alternativas = limiar_alternativas
+        # precedencia(questao, indice_arquivo) decide qual cópia de uma duplicata é mantida (maior vence)
+        self.precedencia = precedencia
+        self.iniciar_unificacao()
         
     def carregar_json(self, caminho_arquivo):
         """Carrega um arquivo JSON"""
@@ -18,299 +54,541 @@ class UnificadorQuestoes:
             print(f"❌ Erro ao carregar {caminho_arquivo}: {e}")
             return None
     
+    def carregar_json_streaming(self, caminho_arquivo):
+        """Gera as questões lendo o fixture objeto a objeto, sem carregá-lo inteiro
+        
+        Cada questão sai assim que seu grupo (Question, Alternatives e
+        CorrectAnswersSources) termina. Erros de leitura adiante no arquivo e
+        FixtureNaoAgrupado surgem ao percorrer o gerador.
+        """
+        objetos = iterar_objetos_fixture(caminho_arquivo)
+        try:
+            primeiro = next(objetos, None)
+        except Exception as e:
+            print(f"❌ Erro ao carregar {caminho_arquivo}: {e}")
+            return None
+        
+        if primeiro is None:
+            return None
+        return iterar_questoes_agrupadas(itertools.chain([primeiro], objetos))
+    
+    def carregar_questoes(self, caminho_arquivo, streaming=True):
+        """Carrega um fixture e extrai suas questões (gerador em streaming ou lista em memória)"""
+        if streaming:
+            return self.carregar_json_streaming(caminho_arquivo)
+        
+        fixture_data = self.carregar_json(caminho_arquivo)
+        if not fixture_data:
+            return None
+        return self.extrair_questoes_do_fixture(fixture_data)
+    
     def extrair_questoes_do_fixture(self, fixture_data):
         """Extrai questões individuais do formato Django fixture"""
-        questoes = {}
-        
-        # Primeiro, coletar todas as questões
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Question':
-                questao_id = item['pk']
-                questoes[questao_id] = {
-                    'id': questao_id,
-                    'enunciado': item['fields']['text'],
-                    'alternativas': {},
-                    'item_correto': None,
-                    'fonte': None,
-                    'has_answer': item['fields']['has_answer'],
-                    'approved_at': item['fields']['approved_at']
-                }
-        
-        # Depois, coletar alternativas
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative':
-                questao_id = item['fields']['question']
-                alternativa_id = item['pk']
-                letra = self.obter_letra_alternativa(alternativa_id, fixture_data)
-                
-                if questao_id in questoes:
-                    questoes[questao_id]['alternativas'][letra] = {
-                        'texto': item['fields']['text'],
-                        'is_correct': item['fields']['is_correct']
-                    }
-                    
-                    # Se for a correta, marcar como item correto
-                    if item['fields']['is_correct']:
-                        questoes[questao_id]['item_correto'] = letra
-        
-        # Coletar fontes das respostas
-        for item in fixture_data:
-            if item['model'] == 'yourapp.CorrectAnswersSources':
-                alternativa_id = item['fields']['alternative']
-                # Encontrar a questão correspondente
-                for questao in questoes.values():
-                    if alternativa_id in [alt_id for alt_id in self.obter_ids_alternativas(questao['id'], fixture_data)]:
-                        questao['fonte'] = item['fields']['source']
-                        break
-        
-        return list(questoes.values())
+        return LeitorFixture(fixture_data).extrair_questoes()
     
-    def obter_letra_alternativa(self, alternativa_id, fixture_data):
-        """Obtém a letra da alternativa baseado na ordem"""
-        # Encontrar todas as alternativas da mesma questão
-        questao_id = None
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative' and item['pk'] == alternativa_id:
-                questao_id = item['fields']['question']
-                break
-        
-        if not questao_id:
-            return 'A'
-        
-        # Coletar todas as alternativas da questão e ordenar por PK
-        alternativas_questao = []
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative' and item['fields']['question'] == questao_id:
-                alternativas_questao.append((item['pk'], item['fields']['text']))
-        
-        alternativas_questao.sort(key=lambda x: x[0])
-        
-        # Mapear para letras
-        letras = ['A', 'B', 'C', 'D', 'E']
-        for i, (alt_id, texto) in enumerate(alternativas_questao):
-            if alt_id == alternativa_id:
-                return letras[i] if i < len(letras) else 'A'
-        
-        return 'A'
+    def listar_fixtures(self, entradas, pasta_saida=None):
+        """Expande fixtures e pastas (buscando *.json recursivamente) em uma lista de caminhos
+        
+        Arquivos dentro da pasta de saída são ignorados. A ordem dos arquivos é a
+        ordem de leitura, que desempata cópias de mesma precedência.
+        """
+        if isinstance(entradas, str):
+            entradas = [entradas]
+        ignorar = os.path.abspath(pasta_saida) + os.sep if pasta_saida else None
+        
+        caminhos = []
+        for entrada in entradas:
+            if not os.path.isdir(entrada):
+                caminhos.append(entrada)
+                continue
+            for raiz, pastas, arquivos in os.walk(entrada):
+                pastas.sort()
+                for arquivo in sorted(arquivos):
+                    caminho = os.path.join(raiz, arquivo)
+                    if arquivo.endswith('.json') and not (ignorar and os.path.abspath(caminho).startswith(ignorar)):
+                        caminhos.append(caminho)
+        return caminhos
     
-    def obter_ids_alternativas(self, questao_id, fixture_data):
-        """Obtém todos os IDs de alternativas de uma questão"""
-        ids = []
-        for item in fixture_data:
-            if item['model'] == 'yourapp.Alternative' and item['fields']['question'] == questao_id:
-                ids.append(item['pk'])
-        return sorted(ids)
+    def iniciar_unificacao(self):
+        """Reinicia o índice de duplicatas compartilhado entre todos os arquivos"""
+        self.indice_duplicatas = IndiceDuplicatas(self.limiar_enunciado, self.limiar_alternativas)
+        self.questoes_unificadas = []
+        self.precedencias = []
+        self.origens = []
+        self.hashes_mantidas = []
+        self.hashes_por_arquivo = []
+        self.decisoes_mescla = []
+        self.estatisticas_arquivos = []
+        self.comparacoes_duplicatas = 0
     
-    def unificar_questoes(self, questoes1, questoes2):
-        """Unifica duas listas de questões, evitando duplicatas"""
-        todas_questoes = []
-        enunciados_vistos = set()
-        
-        # Adicionar questões do primeiro arquivo
-        for questao in questoes1:
-            enunciado_hash = self.hash_enunciado(questao['enunciado'])
-            if enunciado_hash not in enunciados_vistos:
-                todas_questoes.append(questao)
-                enunciados_vistos.add(enunciado_hash)
-        
-        # Adicionar questões do segundo arquivo (apenas se não forem duplicatas)
-        for questao in questoes2:
-            enunciado_hash = self.hash_enunciado(questao['enunciado'])
-            if enunciado_hash not in enunciados_vistos:
-                todas_questoes.append(questao)
-                enunciados_vistos.add(enunciado_hash)
-        
-        return todas_questoes
+    def adicionar_questao(self, questao, indice_arquivo, hash_atual=None):
+        """Adiciona uma questão ao banco unificado, resolvendo duplicatas pela precedência
+        
+        Retorna 'nova', 'descartada' ou 'substituida' (a questão tomou o lugar de
+        uma cópia de menor precedência). Com a mesma precedência vale a cópia do
+        arquivo anterior na lista, como na leitura em ordem; a questão de um
+        arquivo anterior só chega depois em uma unificação incremental.
+        """
+        hash_atual = hash_atual or hash_questao(questao)
+        prioridade = self.precedencia(questao, indice_arquivo)
+        
+        posicao, similaridade = self.indice_duplicatas.procurar_ou_adicionar(questao)
+        if similaridade is None:
+            self.questoes_unificadas.append(questao)
+            self.precedencias.append(prioridade)
+            self.origens.append(indice_arquivo)
+            self.hashes_mantidas.append(hash_atual)
+            return 'nova'
+        
+        anterior = self.questoes_unificadas[posicao]
+        anterior_info = {'id': anterior['id'], 'arquivo': self.origens[posicao],
+                         'enunciado': anterior['enunciado'][:100], 'hash': self.hashes_mantidas[posicao]}
+        atual_info = {'id': questao['id'], 'arquivo': indice_arquivo,
+                      'enunciado': questao['enunciado'][:100], 'hash': hash_atual}
+        
+        substituida = prioridade > self.precedencias[posicao] or (
+            prioridade == self.precedencias[posicao] and indice_arquivo < self.origens[posicao]
+        )
+        if substituida:
+            self.questoes_unificadas[posicao] = questao
+            self.precedencias[posicao] = prioridade
+            self.origens[posicao] = indice_arquivo
+            self.hashes_mantidas[posicao] = hash_atual
+            mantida, descartada = atual_info, anterior_info
+        else:
+            mantida, descartada = anterior_info, atual_info
+        
+        self.decisoes_mescla.append({
+            'mantida': mantida,
+            'descartada': descartada,
+            'similaridade': similaridade,
+            'substituida': substituida
+        })
+        self.comparacoes_duplicatas = self.indice_duplicatas.comparacoes
+        return 'substituida' if substituida else 'descartada'
     
-    def hash_enunciado(self, enunciado):
-        """Cria um hash simplificado do enunciado para detectar duplicatas"""
-        # Remover espaços extras e converter para minúsculas
-        texto_limpo = ' '.join(enunciado.strip().lower().split())
-        # Manter apenas os primeiros 100 caracteres para o hash
-        return texto_limpo[:100]
+    def adicionar_questoes(self, questoes, arquivo):
+        """Adiciona ao banco unificado as questões de um arquivo, resolvendo duplicatas pela precedência
+        
+        questoes pode ser o gerador de carregar_json_streaming. Só as questões
+        mantidas ficam em memória: das descartadas restam o id e o início do
+        enunciado nas decisões de mesclagem, para o relatório.
+        """
+        indice_arquivo = len(self.estatisticas_arquivos) + 1
+        estatisticas = {'arquivo': arquivo, 'questoes': 0, 'com_gabarito': 0}
+        hashes = []
+        
+        for questao in questoes:
+            estatisticas['questoes'] += 1
+            estatisticas['com_gabarito'] += 1 if questao['has_answer'] else 0
+            hashes.append(hash_questao(questao))
+            self.adicionar_questao(questao, indice_arquivo, hashes[-1])
+        
+        self.estatisticas_arquivos.append(estatisticas)
+        self.hashes_por_arquivo.append(hashes)
+        self.comparacoes_duplicatas = self.indice_duplicatas.comparacoes
+        return estatisticas
     
-    def converter_para_formato_django(self, todas_questoes):
-        """Converte as questões unificadas para o formato Django fixture"""
-        fixture_data = []
+    def unificar_questoes(self, *listas_questoes):
+        """Unifica listas de questões de qualquer número de arquivos, evitando duplicatas e quase duplicatas
         
-        question_pk = 1
-        alternative_pk = 1
-        correct_source_pk = 1
+        As decisões de mesclagem ficam em self.decisoes_mescla para o relatório.
+        """
+        self.iniciar_unificacao()
+        for numero, questoes in enumerate(listas_questoes, 1):
+            self.adicionar_questoes(questoes, f"lista {numero}")
+        return self.questoes_unificadas
+    
+    def iterar_formato_django(self, todas_questoes, registro=None):
+        """Gera, questão a questão, os objetos do fixture Django das questões unificadas
         
-        current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        Os pks e as datas vêm do registro de chaves, estáveis entre execuções;
+        sem registro, os pks são atribuídos em sequência a partir de 1.
+        """
+        if registro is None:
+            registro = RegistroChaves()
+            registro.iniciar_saida()
         
         for questao in todas_questoes:
-            # Adicionar objeto Question
-            fixture_data.append({
-                "model": "yourapp.Question",
-                "pk": question_pk,
-                "fields": {
-                    "submitted_by": 1,
-                    "reviewed_by": 2,
-                    "text": questao['enunciado'],
-                    "level": "HCIA",
-                    "has_answer": questao['has_answer'],
-                    "has_multiple_answers": False,
-                    "track": "Computing",
-                    "weight": "1.00",
-                    "approved_at": questao.get('approved_at', current_time) if questao['has_answer'] else None,
-                    "last_update": current_time
-                }
-            })
+            campos = {
+                "submitted_by": 1,
+                "reviewed_by": 2,
+                "text": questao['enunciado'],
+                "level": "HCIA",
+                "has_answer": questao['has_answer'],
+                "has_multiple_answers": False,
+                "track": "Computing",
+                "weight": "1.00"
+            }
+            alternativas = [
+                (letra, alt_info['texto'], letra == questao['item_correto'])
+                for letra, alt_info in sorted(questao['alternativas'].items())
+            ]
             
-            # Adicionar objetos Alternative
-            for letra, alt_info in sorted(questao['alternativas'].items()):
-                is_correct = (letra == questao['item_correto'])
-                
-                fixture_data.append({
-                    "model": "yourapp.Alternative",
-                    "pk": alternative_pk,
-                    "fields": {
-                        "question": question_pk,
-                        "text": alt_info['texto'],
-                        "is_correct": is_correct
-                    }
-                })
-                
-                # Se for a alternativa correta, adicionar CorrectAnswersSources
-                if is_correct and questao['has_answer'] and questao.get('fonte'):
-                    fixture_data.append({
-                        "model": "yourapp.CorrectAnswersSources",
-                        "pk": correct_source_pk,
-                        "fields": {
-                            "alternative": alternative_pk,
-                            "source": questao['fonte']
-                        }
-                    })
-                    correct_source_pk += 1
-                
-                alternative_pk += 1
+            # A alternativa correta recebe uma CorrectAnswersSources quando a questão tem fonte
+            fontes = {}
+            if questao['has_answer'] and questao.get('fonte'):
+                fontes = {letra: questao['fonte'] for letra, _, is_correct in alternativas if is_correct}
             
-            question_pk += 1
-        
-        return fixture_data
+            yield from registro.objetos_questao(campos, alternativas, fontes, approved_at=questao.get('approved_at'))
+    
+    def converter_para_formato_django(self, todas_questoes, registro=None):
+        """Converte as questões unificadas para o formato Django fixture (lista em memória)"""
+        return list(self.iterar_formato_django(todas_questoes, registro))
     
-    def gerar_relatorio_unificacao(self, questoes1, questoes2, questoes_unificadas, pasta_saida):
-        """Gera um relatório detalhado da unificação"""
+    def salvar_banco_binario(self, fixture_data, pasta_saida):
+        """Salva o fixture unificado no formato binário compacto (questions_bank.bin)"""
+        questoes = LeitorFixture(fixture_data).extrair_questoes()
+        caminho_banco = os.path.join(pasta_saida, "questions_bank.bin")
+        return salvar_banco_binario([questao_para_estudo(q) for q in questoes], caminho_banco)
+    
+    def gerar_relatorio_unificacao(self, estatisticas, pasta_saida):
+        """Gera um relatório detalhado da unificação (TXT e JSON) a partir das estatísticas do fixture unificado"""
         caminho_relatorio = os.path.join(pasta_saida, "RELATORIO_UNIFICACAO.txt")
+        total_lidas = sum(e['questoes'] for e in self.estatisticas_arquivos)
+        total_unificadas = estatisticas.total_questoes
         
         with open(caminho_relatorio, 'w', encoding='utf-8') as f:
             f.write("RELATÓRIO DE UNIFICAÇÃO DE QUESTÕES\n")
             f.write("=" * 50 + "\n\n")
             
-            f.write(f"Questões do primeiro arquivo (imagens): {len(questoes1)}\n")
-            f.write(f"Questões do segundo arquivo (DOCX): {len(questoes2)}\n")
-            f.write(f"Questões unificadas (sem duplicatas): {len(questoes_unificadas)}\n")
-            f.write(f"Duplicatas removidas: {len(questoes1) + len(questoes2) - len(questoes_unificadas)}\n\n")
+            for numero, estatisticas_arquivo in enumerate(self.estatisticas_arquivos, 1):
+                f.write(f"Questões do arquivo {numero} ({estatisticas_arquivo['arquivo']}): {estatisticas_arquivo['questoes']}\n")
+            f.write(f"Questões unificadas (sem duplicatas): {total_unificadas}\n")
+            f.write(f"Duplicatas removidas: {total_lidas - total_unificadas}\n\n")
             
             f.write("ESTATÍSTICAS DETALHADAS:\n")
             f.write("-" * 30 + "\n")
             
-            # Estatísticas do primeiro arquivo
-            f.write("\nPRIMEIRO ARQUIVO (IMAGENS):\n")
-            questoes_com_gabarito = sum(1 for q in questoes1 if q['has_answer'])
-            f.write(f"  - Com gabarito: {questoes_com_gabarito}\n")
-            f.write(f"  - Sem gabarito: {len(questoes1) - questoes_com_gabarito}\n")
-            
-            # Estatísticas do segundo arquivo
-            f.write("\nSEGUNDO ARQUIVO (DOCX):\n")
-            questoes_com_gabarito = sum(1 for q in questoes2 if q['has_answer'])
-            f.write(f"  - Com gabarito: {questoes_com_gabarito}\n")
-            f.write(f"  - Sem gabarito: {len(questoes2) - questoes_com_gabarito}\n")
+            # Estatísticas de cada arquivo de origem
+            for numero, estatisticas_arquivo in enumerate(self.estatisticas_arquivos, 1):
+                f.write(f"\nARQUIVO {numero}:\n")
+                f.write(f"  - Com gabarito: {estatisticas_arquivo['com_gabarito']}\n")
+                f.write(f"  - Sem gabarito: {estatisticas_arquivo['questoes'] - estatisticas_arquivo['com_gabarito']}\n")
             
             # Estatísticas do arquivo unificado
             f.write("\nARQUIVO UNIFICADO:\n")
-            questoes_com_gabarito = sum(1 for q in questoes_unificadas if q['has_answer'])
+            questoes_com_gabarito = estatisticas.com_gabarito()
             f.write(f"  - Com gabarito: {questoes_com_gabarito}\n")
-            f.write(f"  - Sem gabarito: {len(questoes_unificadas) - questoes_com_gabarito}\n")
+            f.write(f"  - Sem gabarito: {total_unificadas - questoes_com_gabarito}\n")
             
             f.write("\nDISTRIBUIÇÃO DAS FONTES:\n")
-            fontes = {}
-            for questao in questoes_unificadas:
-                fonte = questao.get('fonte', 'Não especificada')
-                fontes[fonte] = fontes.get(fonte, 0) + 1
+            for fonte, count in estatisticas.distribuicao_fontes().items():
+                f.write(f"  - {fonte or 'Não especificada'}: {count} questões\n")
             
-            for fonte, count in fontes.items():
-                f.write(f"  - {fonte}: {count} questões\n")
+            estatisticas.escrever_histogramas(f)
+            self.escrever_decisoes_mescla(f)
+        
+        exatas = sum(1 for d in self.decisoes_mescla if d['similaridade'] >= 1.0)
+        estatisticas.salvar_json(
+            os.path.join(pasta_saida, "RELATORIO_UNIFICACAO.json"),
+            arquivos=self.estatisticas_arquivos,
+            duplicatas_removidas=total_lidas - total_unificadas,
+            mesclagem={
+                'limiar_enunciado': self.limiar_enunciado,
+                'limiar_alternativas': self.limiar_alternativas,
+                'duplicatas_exatas': exatas,
+                'quase_duplicatas': len(self.decisoes_mescla) - exatas,
+                'pares_comparados': self.comparacoes_duplicatas,
+                'substituidas': sum(1 for d in self.decisoes_mescla if d['substituida'])
+            }
+        )
         
-        print(f"📊 Relatório de unificação salvo em: {caminho_relatorio}")
+        print(f"📊 Relatório de unificação salvo em: {caminho_relatorio} (e RELATORIO_UNIFICACAO.json)")
+    
+    def escrever_decisoes_mescla(self, f):
+        """Escreve no relatório as duplicatas encontradas e a questão mantida para cada uma"""
+        exatas = sum(1 for d in self.decisoes_mescla if d['similaridade'] >= 1.0)
+        
+        f.write("\nDECISÕES DE MESCLAGEM:\n")
+        f.write(f"  - Limiar de similaridade do enunciado: {self.limiar_enunciado}\n")
+        f.write(f"  - Limiar de similaridade das alternativas: {self.limiar_alternativas}\n")
+        f.write(f"  - Duplicatas exatas (após normalização): {exatas}\n")
+        f.write(f"  - Quase duplicatas: {len(self.decisoes_mescla) - exatas}\n")
+        f.write(f"  - Pares comparados: {self.comparacoes_duplicatas}\n")
+        f.write(f"  - Cópias substituídas por outra de maior precedência: "
+                f"{sum(1 for d in self.decisoes_mescla if d['substituida'])}\n")
+        
+        for decisao in self.decisoes_mescla:
+            if decisao['similaridade'] >= 1.0 and not decisao['substituida']:
+                continue
+            mantida, descartada = decisao['mantida'], decisao['descartada']
+            motivo = " (maior precedência)" if decisao['substituida'] else ""
+            f.write(f"\n  [{decisao['similaridade']:.2f}] descartada (arquivo {descartada['arquivo']}, id {descartada['id']}): "
+                    f"{descartada['enunciado']}\n")
+            f.write(f"         mantida{motivo} (arquivo {mantida['arquivo']}, id {mantida['id']}): {mantida['enunciado']}\n")
+    
+    def parametros_unificacao(self, gerar_sqlite, compacto=False):
+        """Parâmetros que, se mudarem, exigem reprocessar todos os fixtures"""
+        return {
+            'limiar_enunciado': self.limiar_enunciado,
+            'limiar_alternativas': self.limiar_alternativas,
+            'precedencia': f"{self.precedencia.__module__}.{self.precedencia.__qualname__}",
+            'gerar_sqlite': gerar_sqlite,
+            'compacto': compacto
+        }
     
-    def unificar_arquivos(self, arquivo_json1, arquivo_json2, pasta_saida="questoes_unificadas"):
-        """Unifica dois arquivos JSON em um único arquivo"""
+    def estado_unificacao(self):
+        """Estado necessário para aplicar, em outra execução, apenas as questões novas"""
+        return {
+            'indice_duplicatas': self.indice_duplicatas,
+            'precedencias': self.precedencias,
+            'origens': self.origens,
+            'hashes_mantidas': self.hashes_mantidas,
+            # Das questões mantidas basta o que o relatório e as decisões de mesclagem usam
+            'resumo_mantidas': [
+                {'id': q['id'], 'enunciado': q['enunciado'][:100], 'has_answer': q['has_answer'], 'fonte': q.get('fonte')}
+                for q in self.questoes_unificadas
+            ],
+            'decisoes_mescla': self.decisoes_mescla,
+            'estatisticas_arquivos': self.estatisticas_arquivos
+        }
+    
+    def restaurar_estado(self, estado):
+        self.indice_duplicatas = estado['indice_duplicatas']
+        self.precedencias = estado['precedencias']
+        self.origens = estado['origens']
+        self.hashes_mantidas = estado['hashes_mantidas']
+        self.questoes_unificadas = estado['resumo_mantidas']
+        self.decisoes_mescla = estado['decisoes_mescla']
+        self.estatisticas_arquivos = estado['estatisticas_arquivos']
+        self.comparacoes_duplicatas = self.indice_duplicatas.comparacoes
+    
+    def nomes_saidas(self, gerar_sqlite):
+        nomes = ["questions_fixture_unificado.json", "questions_bank.bin", "RELATORIO_UNIFICACAO.txt",
+                 "RELATORIO_UNIFICACAO.json"]
+        if gerar_sqlite:
+            nomes.append("questions_bank.sqlite3")
+        return nomes
+    
+    def unificar_incremental(self, caminhos, pasta_saida, streaming, gerar_sqlite, compacto=False):
+        """Aplica apenas o que mudou nos fixtures desde a última execução
+        
+        Sem alterações, nada é lido além do manifesto. Questões novas são
+        anexadas ao fixture unificado, sem alterar as já existentes. Retorna
+        False quando é preciso reprocessar tudo: sem manifesto, com parâmetros
+        ou lista de fixtures diferentes, saídas alteradas, ou quando uma questão
+        mantida foi removida, alterada ou substituída por precedência.
+        """
+        manifesto = ManifestoUnificacao(pasta_saida)
+        if not manifesto.carregar():
+            return False
+        if manifesto.dados['parametros'] != self.parametros_unificacao(gerar_sqlite, compacto) or not manifesto.saidas_intactas():
+            return False
+        comparacao = manifesto.comparar_fontes(caminhos)
+        if comparacao is None:
+            return False
+        fontes, alterados = comparacao
+        
+        if not alterados:
+            if fontes != manifesto.dados['fontes']:
+                manifesto.salvar(manifesto.dados['parametros'], fontes, self.nomes_saidas(gerar_sqlite))
+            print("✅ Nenhum fixture alterado desde a última unificação; nada a fazer")
+            return True
+        
+        estado = manifesto.carregar_estado()
+        if estado is None:
+            return False
+        self.restaurar_estado(estado)
+        mantidas = set(self.hashes_mantidas)
+        total_antes = len(self.questoes_unificadas)
+        
+        for indice in alterados:
+            caminho = caminhos[indice]
+            print(f"📁 Fixture alterado: {caminho}")
+            # Primeira passada só com os hashes; as questões novas são lidas de novo abaixo
+            questoes = self.carregar_questoes(caminho, streaming)
+            if questoes is None:
+                return False
+            hashes = []
+            com_gabarito = 0
+            try:
+                for questao in questoes:
+                    hashes.append(hash_questao(questao))
+                    com_gabarito += 1 if questao['has_answer'] else 0
+            except FixtureNaoAgrupado:
+                return False
+            except Exception as e:
+                print(f"❌ Erro ao carregar {caminho}: {e}")
+                return False
+            removidas = Counter(fontes[indice]['questoes']) - Counter(hashes)
+            if any(h in mantidas for h in removidas):
+                print("   ⚠️ Questões mantidas foram alteradas ou removidas; reprocessando todos os fixtures")
+                return False
+            
+            # Descartadas que sumiram da fonte deixam de constar nas decisões de mesclagem
+            self.decisoes_mescla = [d for d in self.decisoes_mescla if d['descartada']['hash'] not in removidas]
+            
+            adicionadas = Counter(hashes) - Counter(fontes[indice]['questoes'])
+            if streaming:
+                questoes = self.carregar_questoes(caminho, streaming)
+            for ordem, (questao, hash_atual) in enumerate(zip(questoes, hashes)):
+                if adicionadas[hash_atual] <= 0:
+                    continue
+                adicionadas[hash_atual] -= 1
+                resultado = self.adicionar_questao(questao, indice + 1, hash_atual)
+                if resultado == 'substituida':
+                    print("   ⚠️ Uma questão nova substitui uma já unificada; reprocessando todos os fixtures")
+                    return False
+                # Duplicata de uma questão mantida do mesmo arquivo que aparece depois dela:
+                # na leitura em ordem a nova teria chegado primeiro
+                mantida = self.decisoes_mescla[-1]['mantida'] if resultado == 'descartada' else None
+                if mantida and mantida['arquivo'] == indice + 1 and hashes.index(mantida['hash']) > ordem:
+                    print("   ⚠️ Uma questão nova precede uma duplicata já unificada; reprocessando todos os fixtures")
+                    return False
+            
+            self.estatisticas_arquivos[indice] = {
+                'arquivo': caminho,
+                'questoes': len(hashes),
+                'com_gabarito': com_gabarito
+            }
+            fontes[indice] = registro_fonte(caminho, hashes)
+        
+        novas = self.questoes_unificadas[total_antes:]
+        caminho_unificado = os.path.join(pasta_saida, "questions_fixture_unificado.json")
+        if novas:
+            registro = registro_da_pasta(pasta_saida, "questions_fixture_unificado.json", continuar=True)
+            anexar_ao_fixture(caminho_unificado, self.iterar_formato_django(novas, registro), compacto)
+            # Só depois da troca do fixture: se a anexação falhar, registro e manifesto continuam os da versão anterior
+            registro.salvar()
+            # As questões mantidas ficam como resumo, como as restauradas do estado
+            self.questoes_unificadas[total_antes:] = [
+                {'id': q['id'], 'enunciado': q['enunciado'][:100], 'has_answer': q['has_answer'], 'fonte': q.get('fonte')}
+                for q in novas
+            ]
+            print(f"💾 {len(novas)} questões novas anexadas a {caminho_unificado}")
+            
+            # Bancos derivados do fixture
+            self.salvar_banco_binario(iterar_objetos_fixture(caminho_unificado), pasta_saida)
+            if gerar_sqlite:
+                salvar_banco_sqlite(
+                    iterar_objetos_fixture(caminho_unificado), os.path.join(pasta_saida, "questions_bank.sqlite3")
+                )
+        else:
+            print("✅ Nenhuma questão nova após a deduplicação; fixture unificado mantido")
+        
+        estatisticas = EstatisticasFixture().adicionar_todos(iterar_objetos_fixture(caminho_unificado))
+        self.gerar_relatorio_unificacao(estatisticas, pasta_saida)
+        validar_arquivo(caminho_unificado).imprimir_resumo()
+        manifesto.salvar_estado(self.estado_unificacao())
+        manifesto.salvar(self.parametros_unificacao(gerar_sqlite, compacto), fontes, self.nomes_saidas(gerar_sqlite))
+        return True
+    
+    def unificar_arquivos(self, arquivos, pasta_saida="questoes_unificadas", streaming=True, gerar_sqlite=False,
+                          incremental=True, compacto=False):
+        """Unifica qualquer número de fixtures (lista de arquivos e/ou pastas) em um único arquivo
+        
+        Os arquivos são lidos um de cada vez e suas questões passam por um único
+        índice de duplicatas; apenas as questões mantidas permanecem em memória.
+        Com streaming=True os fixtures são lidos objeto a objeto; com streaming=False
+        cada arquivo é carregado inteiro com json.load. A saída é idêntica nos dois modos.
+        Com gerar_sqlite=True o banco unificado também é gravado em questions_bank.sqlite3.
+        Com incremental=True o manifesto da pasta de saída é consultado e apenas
+        os fixtures alterados são processados (ver unificar_incremental).
+        O fixture unificado é gravado objeto a objeto; com compacto=True cada
+        objeto ocupa uma linha, sem indentação.
+        """
         print("🔄 INICIANDO UNIFICAÇÃO DE ARQUIVOS JSON")
         print("=" * 50)
         
         # Criar pasta de saída
         os.makedirs(pasta_saida, exist_ok=True)
         
-        # Carregar primeiro arquivo
-        print(f"📁 Carregando {arquivo_json1}...")
-        fixture1 = self.carregar_json(arquivo_json1)
-        if not fixture1:
+        caminhos = self.listar_fixtures(arquivos, pasta_saida)
+        if not caminhos:
+            print("❌ Nenhum fixture encontrado")
             return
         
-        # Carregar segundo arquivo
-        print(f"📁 Carregando {arquivo_json2}...")
-        fixture2 = self.carregar_json(arquivo_json2)
-        if not fixture2:
+        if incremental and self.unificar_incremental(caminhos, pasta_saida, streaming, gerar_sqlite, compacto):
             return
         
-        # Extrair questões de ambos os arquivos
-        print("🔍 Extraindo questões do primeiro arquivo...")
-        questoes1 = self.extrair_questoes_do_fixture(fixture1)
-        print(f"   ✅ {len(questoes1)} questões extraídas")
+        # Carregar cada arquivo e unificar suas questões no índice compartilhado
+        self.iniciar_unificacao()
+        for caminho in caminhos:
+            print(f"📁 Carregando {caminho}...")
+            questoes = self.carregar_questoes(caminho, streaming)
+            if questoes is None:
+                return
+            antes = len(self.questoes_unificadas)
+            try:
+                estatisticas_arquivo = self.adicionar_questoes(questoes, caminho)
+            except FixtureNaoAgrupado as e:
+                print(f"   ⚠️ {caminho} não está agrupado por questão ({e}); relendo todos os fixtures em memória")
+                return self.unificar_arquivos(arquivos, pasta_saida, False, gerar_sqlite, False, compacto)
+            except Exception as e:
+                print(f"❌ Erro ao carregar {caminho}: {e}")
+                return
+            print(f"   ✅ {estatisticas_arquivo['questoes']} questões extraídas, {len(self.questoes_unificadas) - antes} novas")
         
-        print("🔍 Extraindo questões do segundo arquivo...")
-        questoes2 = self.extrair_questoes_do_fixture(fixture2)
-        print(f"   ✅ {len(questoes2)} questões extraídas")
-        
-        # Unificar questões
-        print("🔄 Unificando questões (removendo duplicatas)...")
-        questoes_unificadas = self.unificar_questoes(questoes1, questoes2)
-        print(f"   ✅ {len(questoes_unificadas)} questões após unificação")
+        questoes_unificadas = self.questoes_unificadas
+        print(f"🔄 {len(questoes_unificadas)} questões após unificação (duplicatas removidas)")
         
         # Converter para formato Django
         print("📝 Convertendo para formato Django fixture...")
-        fixture_unificado = self.converter_para_formato_django(questoes_unificadas)
+        registro = registro_da_pasta(pasta_saida, "questions_fixture_unificado.json")
         
-        # Salvar arquivo unificado
+        # Salvar arquivo unificado, objeto a objeto
         caminho_unificado = os.path.join(pasta_saida, "questions_fixture_unificado.json")
-        with open(caminho_unificado, 'w', encoding='utf-8') as f:
-            json.dump(fixture_unificado, f, ensure_ascii=False, indent=2)
+        escritor = salvar_fixture(
+            caminho_unificado, self.iterar_formato_django(questoes_unificadas, registro), compacto
+        )
+        registro.salvar()
         
         print(f"💾 Arquivo unificado salvo em: {caminho_unificado}")
+        print(f"🔑 {registro.alteradas} questões novas ou alteradas desde a última unificação")
+        
+        # Salvar banco binário compacto para leitura via mmap no StudyApp
+        caminho_banco = self.salvar_banco_binario(iterar_objetos_fixture(caminho_unificado), pasta_saida)
+        print(f"💾 Banco binário salvo em: {caminho_banco}")
+        
+        if gerar_sqlite:
+            caminho_sqlite = salvar_banco_sqlite(
+                iterar_objetos_fixture(caminho_unificado), os.path.join(pasta_saida, "questions_bank.sqlite3")
+            )
+            print(f"💾 Banco SQLite salvo em: {caminho_sqlite}")
         
         # Gerar relatório
-        self.gerar_relatorio_unificacao(questoes1, questoes2, questoes_unificadas, pasta_saida)
+        self.gerar_relatorio_unificacao(escritor.estatisticas, pasta_saida)
+        
+        # Integridade referencial do fixture gravado
+        validar_arquivo(caminho_unificado).imprimir_resumo()
+        
+        # Manifesto e estado para as próximas execuções incrementais
+        manifesto = ManifestoUnificacao(pasta_saida)
+        manifesto.salvar_estado(self.estado_unificacao())
+        manifesto.salvar(
+            self.parametros_unificacao(gerar_sqlite, compacto),
+            [registro_fonte(caminho, hashes) for caminho, hashes in zip(caminhos, self.hashes_por_arquivo)],
+            self.nomes_saidas(gerar_sqlite)
+        )
         
         # Estatísticas finais
         print(f"\n✅ UNIFICAÇÃO CONCLUÍDA!")
         print(f"📊 Estatísticas:")
-        print(f"   - Total de objetos: {len(fixture_unificado)}")
-        print(f"   - Questions: {sum(1 for item in fixture_unificado if item['model'] == 'yourapp.Question')}")
-        print(f"   - Alternatives: {sum(1 for item in fixture_unificado if item['model'] == 'yourapp.Alternative')}")
-        print(f"   - CorrectAnswersSources: {sum(1 for item in fixture_unificado if item['model'] == 'yourapp.CorrectAnswersSources')}")
+        print(f"   - Total de objetos: {escritor.total_objetos}")
+        print(f"   - Questions: {escritor.estatisticas.total_questoes}")
+        print(f"   - Alternatives: {escritor.estatisticas.total_alternativas}")
+        print(f"   - CorrectAnswersSources: {escritor.estatisticas.total_fontes}")
         print(f"📁 Pasta de saída: {pasta_saida}")
 
 def main():
-    """Função principal"""
+    """Função principal: python unificar_questoes.py [fixture ou pasta ...]"""
     unificador = UnificadorQuestoes()
     
-    # Configurar caminhos dos arquivos
-    arquivo_json1 = "/home/yago/Tutorbots/questoes_processadas_copilot/questions_fixture.json"  # Arquivo das imagens
-    arquivo_json2 = "/home/yago/Tutorbots/questoes_processadas_docx/questions_fixture.json"  # Arquivo do DOCX
+    # Configurar caminhos dos arquivos (padrão: fixture das imagens e fixture do DOCX)
+    arquivos = sys.argv[1:] or [
+        "/home/yago/Tutorbots/questoes_processadas_copilot/questions_fixture.json",  # Arquivo das imagens
+        "/home/yago/Tutorbots/questoes_processadas_docx/questions_fixture.json"  # Arquivo do DOCX
+    ]
     
     # Verificar se os arquivos existem
-    if not os.path.exists(arquivo_json1):
-        print(f"❌ Arquivo não encontrado: {arquivo_json1}")
-        return
-    
-    if not os.path.exists(arquivo_json2):
-        print(f"❌ Arquivo não encontrado: {arquivo_json2}")
-        return
+    for arquivo in arquivos:
+        if not os.path.exists(arquivo):
+            print(f"❌ Arquivo não encontrado: {arquivo}")
+            return
     
     # Executar unificação
-    unificador.unificar_arquivos(arquivo_json1, arquivo_json2)
+    unificador.unificar_arquivos(arquivos)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from escritor_fixture import salvar_fixture
+from fixture_streaming import iterar_objetos_fixture
+
+QUESTAO, ALTERNATIVA, FONTE = 'yourapp.Question', 'yourapp.Alternative', 'yourapp.CorrectAnswersSources'
+
+# Problemas que tornam o fixture inválido; os demais são avisos
+ERROS = {
+    'pk_duplicado': "pk repetido no mesmo modelo",
+    'alternativa_orfa': "Alternative aponta para uma Question inexistente",
+    'fonte_orfa': "CorrectAnswersSources aponta para uma Alternative inexistente",
+    'sem_alternativas': "Question sem alternativas",
+    'sem_alternativa_correta': "Question com gabarito sem alternativa correta",
+    'varias_corretas': "Question com mais de uma correta sem has_multiple_answers",
+}
+AVISOS = {
+    'sem_fonte': "Question com gabarito sem CorrectAnswersSources",
+    'fonte_vazia': "CorrectAnswersSources sem source",
+    'fonte_em_incorreta': "CorrectAnswersSources em uma alternativa incorreta",
+    'modelo_desconhecido': "objeto de outro modelo",
+}
+
+
+class ValidadorFixture:
+    """Verifica a integridade referencial de um fixture em uma única passada indexada
+
+    Cada objeto é indexado por adicionar() (a ordem dos objetos não importa:
+    filhos podem vir antes dos pais); concluir() cruza os índices e registra os
+    problemas. Uma alternativa cuja questão não existe é órfã, assim como uma
+    fonte cuja alternativa não existe ou é órfã. Para cada questão verifica se
+    há alternativas, se a quantidade de corretas é compatível com has_answer e
+    has_multiple_answers e se a resposta tem fonte. Tudo em tempo linear, com
+    apenas alguns inteiros por objeto em memória.
+
+    De um pk repetido no mesmo modelo só uma ocorrência vale: a primeira, ou,
+    para alternativas e fontes, a primeira que não é órfã. As demais ficam em
+    duplicados, com a posição no fixture, e são descartadas por compactar().
+    """
+
+    def __init__(self, max_exemplos=10):
+        self.max_exemplos = max_exemplos
+        # pk -> (has_answer, has_multiple_answers), na ordem do fixture
+        self.questoes = {}
+        # pk -> (pk da questão, is_correct)
+        self.alternativas = {}
+        # pk -> pk da alternativa
+        self.fontes = {}
+        self.problemas = Counter()
+        self.exemplos = {}
+        self.total_objetos = 0
+        self.orfaos = {ALTERNATIVA: set(), FONTE: set()}
+        # modelo -> pk -> [(posição no fixture, valor)] das ocorrências repetidas depois da primeira
+        self.duplicados = {}
+        # (modelo, pk) -> posição da ocorrência mantida, quando não é a primeira
+        self.escolhidas = {}
+
+    def registrar(self, problema, referencia):
+        self.problemas[problema] += 1
+        exemplos = self.exemplos.setdefault(problema, [])
+        if len(exemplos) < self.max_exemplos:
+            exemplos.append(referencia)
+
+    def adicionar(self, objeto):
+        posicao = self.total_objetos
+        self.total_objetos += 1
+        modelo, pk, campos = objeto['model'], objeto['pk'], objeto['fields']
+        if modelo == QUESTAO:
+            indice, valor = self.questoes, (campos.get('has_answer', False), campos.get('has_multiple_answers', False))
+        elif modelo == ALTERNATIVA:
+            indice, valor = self.alternativas, (campos.get('question'), campos.get('is_correct', False))
+        elif modelo == FONTE:
+            indice, valor = self.fontes, campos.get('alternative')
+            if not campos.get('source'):
+                self.registrar('fonte_vazia', pk)
+        else:
+            self.registrar('modelo_desconhecido', f"{modelo} {pk}")
+            return
+        if pk in indice:
+            self.registrar('pk_duplicado', f"{modelo} {pk}")
+            self.duplicados.setdefault(modelo, {}).setdefault(pk, []).append((posicao, valor))
+            return
+        indice[pk] = valor
+
+    def escolher_ocorrencias(self, modelo, indice, valida):
+        """Para cada pk repetido, mantém a primeira ocorrência válida (valida(valor)) se a primeira não for"""
+        for pk, repetidas in self.duplicados.get(modelo, {}).items():
+            if valida(indice[pk]):
+                continue
+            for posicao, valor in repetidas:
+                if valida(valor):
+                    indice[pk] = valor
+                    self.escolhidas[(modelo, pk)] = posicao
+                    break
+
+    def validar(self, objetos):
+        for objeto in objetos:
+            self.adicionar(objeto)
+        return self.concluir()
+
+    def concluir(self):
+        """Cruza os índices e registra os problemas de cada questão, alternativa e fonte"""
+        self.escolher_ocorrencias(ALTERNATIVA, self.alternativas, lambda valor: valor[0] in self.questoes)
+        alternativas_por_questao = Counter()
+        corretas_por_questao = Counter()
+        for pk, (questao_id, is_correct) in self.alternativas.items():
+            if questao_id not in self.questoes:
+                self.orfaos[ALTERNATIVA].add(pk)
+                self.registrar('alternativa_orfa', pk)
+                continue
+            alternativas_por_questao[questao_id] += 1
+            if is_correct:
+                corretas_por_questao[questao_id] += 1
+
+        self.escolher_ocorrencias(
+            FONTE, self.fontes,
+            lambda alternativa_id: alternativa_id in self.alternativas and alternativa_id not in self.orfaos[ALTERNATIVA]
+        )
+        questoes_com_fonte = set()
+        for pk, alternativa_id in self.fontes.items():
+            alternativa = self.alternativas.get(alternativa_id)
+            if alternativa is None or alternativa_id in self.orfaos[ALTERNATIVA]:
+                self.orfaos[FONTE].add(pk)
+                self.registrar('fonte_orfa', pk)
+                continue
+            questoes_com_fonte.add(alternativa[0])
+            if not alternativa[1]:
+                self.registrar('fonte_em_incorreta', pk)
+
+        for pk, (has_answer, has_multiple_answers) in self.questoes.items():
+            corretas = corretas_por_questao[pk]
+            if not alternativas_por_questao[pk]:
+                self.registrar('sem_alternativas', pk)
+            elif has_answer and not corretas:
+                self.registrar('sem_alternativa_correta', pk)
+            if corretas > 1 and not has_multiple_answers:
+                self.registrar('varias_corretas', pk)
+            if has_answer and pk not in questoes_com_fonte:
+                self.registrar('sem_fonte', pk)
+        return self
+
+    @property
+    def total_erros(self):
+        return sum(self.problemas[problema] for problema in ERROS)
+
+    @property
+    def valido(self):
+        return self.total_erros == 0
+
+    def imprimir_resumo(self):
+        print(f"🔎 Integridade do fixture: {len(self.questoes)} questões, {len(self.alternativas)} alternativas, "
+              f"{len(self.fontes)} fontes")
+        for descricoes, marcador in [(ERROS, "❌"), (AVISOS, "⚠️")]:
+            for problema, descricao in descricoes.items():
+                if self.problemas[problema]:
+                    exemplos = ', '.join(str(e) for e in self.exemplos[problema])
+                    print(f"   {marcador} {descricao}: {self.problemas[problema]} (ex.: {exemplos})")
+        if self.valido:
+            print("   ✅ Nenhum erro de integridade")
+
+    def mapas_renumeracao(self):
+        """pk antigo -> pk novo (1, 2, 3... na ordem do fixture) dos objetos não órfãos de cada modelo"""
+        mapas = {}
+        for modelo, indice in [(QUESTAO, self.questoes), (ALTERNATIVA, self.alternativas), (FONTE, self.fontes)]:
+            orfaos = self.orfaos.get(modelo, ())
+            mapas[modelo] = {pk: novo for novo, pk in enumerate((pk for pk in indice if pk not in orfaos), 1)}
+        return mapas
+
+    def mantida(self, posicao, modelo, pk, vistos):
+        """True se o objeto nesta posição é a ocorrência mantida do pk (vistos: pks repetidos já encontrados)"""
+        if pk not in self.duplicados.get(modelo, ()):
+            return True
+        chave = (modelo, pk)
+        if chave in self.escolhidas:
+            return posicao == self.escolhidas[chave]
+        if chave in vistos:
+            return False
+        vistos.add(chave)
+        return True
+
+    def compactar(self, objetos, renumerar=False):
+        """Gera os objetos sem os órfãos e os pks repetidos e, com renumerar=True, com pks sequenciais por modelo
+
+        objetos deve ser a mesma sequência validada (por exemplo, uma nova
+        leitura do arquivo); as chaves estrangeiras são remapeadas junto com os pks.
+        """
+        mapas = self.mapas_renumeracao() if renumerar else None
+        vistos = set()
+        for posicao, objeto in enumerate(objetos):
+            modelo = objeto['model']
+            if not self.mantida(posicao, modelo, objeto['pk'], vistos):
+                continue
+            if objeto['pk'] in self.orfaos.get(modelo, ()):
+                continue
+            if mapas is None or modelo not in mapas:
+                yield objeto
+                continue
+            campos = dict(objeto['fields'])
+            if modelo == ALTERNATIVA:
+                campos['question'] = mapas[QUESTAO][campos['question']]
+            elif modelo == FONTE:
+                campos['alternative'] = mapas[ALTERNATIVA][campos['alternative']]
+            yield {"model": modelo, "pk": mapas[modelo][objeto['pk']], "fields": campos}
+
+
+def validar_arquivo(caminho_fixture):
+    """Valida um fixture lendo-o objeto a objeto"""
+    return ValidadorFixture().validar(iterar_objetos_fixture(caminho_fixture))
+
+
+def main():
+    """python validador_fixture.py fixture.json [--compactar saida.json] [--renumerar]; sai com 1 se houver erros"""
+    parser = argparse.ArgumentParser(description="Valida a integridade referencial de um fixture Django")
+    parser.add_argument("fixture")
+    parser.add_argument("--compactar", metavar="SAIDA", help="grava uma cópia sem os objetos órfãos")
+    parser.add_argument("--renumerar", action="store_true", help="com --compactar, renumera os pks em sequência")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fixture):
+        print(f"❌ Arquivo não encontrado: {args.fixture}")
+        sys.exit(2)
+
+    inicio = time.perf_counter()
+    validador = validar_arquivo(args.fixture)
+    print(f"⏱️ {validador.total_objetos} objetos validados em {time.perf_counter() - inicio:.2f} s")
+    validador.imprimir_resumo()
+
+    if args.compactar:
+        escritor = salvar_fixture(
+            args.compactar, validador.compactar(iterar_objetos_fixture(args.fixture), args.renumerar)
+        )
+        print(f"💾 Fixture compactado salvo em: {args.compactar} "
+              f"({validador.total_objetos - escritor.total_objetos} objetos órfãos ou repetidos removidos)")
+
+    sys.exit(0 if validador.valido else 1)
+
+
+if __name__ == "__main__":
+    main()